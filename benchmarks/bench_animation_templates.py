@@ -0,0 +1,94 @@
+"""
+动画模板求值的微基准
+
+用法: python -m benchmarks.bench_animation_templates [--iterations N]
+
+对 data/resources/animations 中的每个模板, 比较旧实现 (每次求值新建 SimpleEval 并重新解析表达式)
+与加载时预编译的求值计划的单次调用耗时 (微秒)。旧实现不支持关键帧轨道, 含关键帧轨道的模板只测编译后的耗时。
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Union
+
+import json5
+from simpleeval import SimpleEval
+
+from nekro_live_studio.schemas.actions import AnimationData
+from nekro_live_studio.schemas.preformed_animation import (
+    ActionTemplate,
+    AnimationTemplate,
+    Expression,
+    RandomFloat,
+    RandomInt,
+)
+from nekro_live_studio.services.animation_compiler import compile_template
+
+ANIMATIONS_DIR = Path("./data/resources/animations")
+
+
+def _legacy_evaluate(
+    value: Union[float, str, Expression, RandomFloat, RandomInt],
+    context: Dict[str, Any],
+) -> Union[float, int, str]:
+    if isinstance(value, (float, int, str)):
+        return value
+    if isinstance(value, RandomFloat):
+        return random.uniform(*value.random_float)
+    if isinstance(value, RandomInt):
+        return random.randint(*value.random_int)
+    return SimpleEval(names=context).eval(value.expr)
+
+
+def _legacy_resolve(template: AnimationTemplate) -> List[AnimationData]:
+    context: Dict[str, Any] = {p.name: p.default for p in template.data.params}
+    for var_name, var_value in template.data.variables.items():
+        context[var_name] = _legacy_evaluate(var_value, context)
+    resolved = []
+    for action in template.data.actions:
+        assert isinstance(action, ActionTemplate)
+        from_value = _legacy_evaluate(action.from_value, context) if action.from_value is not None else None
+        resolved.append(
+            AnimationData(
+                parameter=action.parameter,
+                from_value=float(from_value) if from_value is not None else None,
+                target=float(_legacy_evaluate(action.to, context)),
+                duration=float(_legacy_evaluate(action.duration, context)),
+                delay=float(_legacy_evaluate(action.delay, context)),
+                easing=action.easing,
+                priority=3,
+            ),
+        )
+    return resolved
+
+
+def _measure_us(func: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="每个模板的调用次数")
+    args = parser.parse_args()
+
+    print(f"{'模板':<12}{'动作数':>6}{'旧实现 µs':>12}{'编译后 µs':>12}{'仅求值 µs':>12}")
+    for file_path in sorted(ANIMATIONS_DIR.glob("*.jsonc")):
+        with file_path.open("r", encoding="utf-8") as f:
+            template = AnimationTemplate.model_validate(json5.load(f))
+        compiled = compile_template(template)
+
+        legacy = "-"
+        if all(isinstance(action, ActionTemplate) for action in template.data.actions):
+            legacy = f"{_measure_us(lambda template=template: _legacy_resolve(template), args.iterations):.1f}"
+        resolved = _measure_us(lambda compiled=compiled: compiled.resolve(), args.iterations)
+        bind_only = _measure_us(lambda compiled=compiled: compiled.bind(), args.iterations)
+        print(f"{template.name:<12}{len(template.data.actions):>6}{legacy:>12}{resolved:>12.1f}{bind_only:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
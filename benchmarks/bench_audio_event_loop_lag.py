@@ -0,0 +1,111 @@
+"""
+音效连发时的事件循环延迟基准
+
+用法: SDL_AUDIODRIVER=dummy python -m benchmarks.bench_audio_event_loop_lag [--burst N] [--rounds N] [--speed X]
+
+一个每 TICK_INTERVAL 秒唤醒一次的任务记录实际唤醒时间与预期的偏差, 同时连续触发 N 个不同音效的播放。
+比较空闲、旧实现 (在事件循环线程中同步解码) 与解码线程池三种情况下的最大与 P99 延迟 (毫秒)。
+每轮开始前清空已解码音效缓存, 因此测的都是首次播放的解码开销; speed 不为 1 时包含变速处理。
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+from nekro_live_studio.schemas.actions import SoundPlayData
+from nekro_live_studio.services.audio_player import audio_player
+
+AUDIO_DIR = Path("./data/resources/audios")
+TICK_INTERVAL = 0.005
+
+
+async def _measure_lag(burst: Callable[[], Awaitable[None]]) -> List[float]:
+    """在执行 burst 期间采样事件循环延迟 (毫秒)"""
+    loop = asyncio.get_running_loop()
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        expected = loop.time() + TICK_INTERVAL
+        while not done.is_set():
+            await asyncio.sleep(TICK_INTERVAL)
+            now = loop.time()
+            lags.append(max(now - expected, 0.0) * 1000)
+            expected = now + TICK_INTERVAL
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK_INTERVAL * 2)
+    await burst()
+    await asyncio.sleep(TICK_INTERVAL * 2)
+    done.set()
+    await task
+    return lags
+
+
+def _idle_burst(files: List[SoundPlayData]) -> Callable[[], Awaitable[None]]:
+    async def burst():
+        await asyncio.sleep(TICK_INTERVAL * len(files))
+
+    return burst
+
+
+def _sync_burst(files: List[SoundPlayData]) -> Callable[[], Awaitable[None]]:
+    async def burst():
+        for sound_data in files:
+            # 旧实现: 解码与创建 Sound 都在事件循环线程中完成
+            file_path = AUDIO_DIR / sound_data.path
+            audio_player.decode_sound(file_path, sound_data.speed).play()
+            await asyncio.sleep(0)
+
+    return burst
+
+
+def _pool_burst(files: List[SoundPlayData]) -> Callable[[], Awaitable[None]]:
+    async def burst():
+        await asyncio.gather(*(audio_player.play(sound_data) for sound_data in files))
+
+    return burst
+
+
+def _summary(lags: List[float]) -> str:
+    if not lags:
+        return f"{'-':>10}{'-':>10}"
+    p99 = statistics.quantiles(lags, n=100, method="inclusive")[98] if len(lags) >= 2 else lags[0]
+    return f"{max(lags):>10.2f}{p99:>10.2f}"
+
+
+async def _run(burst_size: int, rounds: int, speed: float):
+    files = [SoundPlayData(path=path.name, speed=speed) for path in sorted(AUDIO_DIR.glob("*.wav"))[:burst_size]]
+    if not files:
+        print(f"{AUDIO_DIR} 中没有音效文件")
+        return
+    print(f"每轮连发 {len(files)} 个音效, 速度 {speed}, 共 {rounds} 轮")
+    print(f"{'方式':<10}{'耗时 ms':>10}{'最大 ms':>10}{'P99 ms':>10}")
+    for name, make_burst in (("空闲", _idle_burst), ("同步解码", _sync_burst), ("线程池", _pool_burst)):
+        lags: List[float] = []
+        elapsed = 0.0
+        for _ in range(rounds):
+            audio_player.clear_cache()
+            audio_player.stop_all()
+            start = time.perf_counter()
+            lags += await _measure_lag(make_burst(files))
+            elapsed += time.perf_counter() - start
+        print(f"{name:<10}{elapsed / rounds * 1000:>10.1f}{_summary(lags)}")
+    audio_player.stop_all()
+    audio_player.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=8, help="每轮连发的音效数量")
+    parser.add_argument("--rounds", type=int, default=5, help="重复轮数")
+    parser.add_argument("--speed", type=float, default=1.0, help="播放速度")
+    args = parser.parse_args()
+    asyncio.run(_run(args.burst, args.rounds, args.speed))
+
+
+if __name__ == "__main__":
+    main()
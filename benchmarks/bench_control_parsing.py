@@ -0,0 +1,112 @@
+"""
+/ws/animate_control 控制消息解析与分发的微基准
+
+用法: python -m benchmarks.bench_control_parsing [--messages N]
+
+对比旧实现 (json 解码 + 每条消息重建映射 + model_validate) 与
+预编译判别联合 TypeAdapter.validate_json 的吞吐量, 并测量单连接下
+handle_control_message 端到端 (校验 + 分发 + 入队 + 响应) 的 messages/s.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from nekro_live_studio.schemas.actions import (  # noqa: E402
+    Animation,
+    Expression,
+    Say,
+    SoundPlay,
+    control_message_adapter,
+)
+
+FRAMES: Dict[str, str] = {
+    "animation": json.dumps(
+        {
+            "type": "animation",
+            "data": {"parameter": "FaceAngleX", "target": 10, "duration": 0.5, "delay": 0.1, "easing": "in_out_sine"},
+        },
+    ),
+    "say": json.dumps({"type": "say", "data": {"text": "你好呀", "tts_text": "你好呀"}}),
+    "sound_play": json.dumps({"type": "sound_play", "data": {"path": "Laugh.wav", "volume": 0.8}}),
+    "unknown": json.dumps({"type": "dance", "data": {"style": "robot"}}),
+}
+
+
+def _legacy_parse(raw: str) -> Any:
+    data = json.loads(raw)
+    action_type = data.get("type")
+    scheduled_actions = {
+        "say": (Say, "说话动作已添加"),
+        "animation": (Animation, "动画动作已添加"),
+        "expression": (Expression, "表情动作已添加"),
+        "sound_play": (SoundPlay, "音效动作已添加"),
+    }
+    if action_type in scheduled_actions:
+        model, _ = scheduled_actions[action_type]
+        return model.model_validate(data)
+    return None
+
+
+def _adapter_parse(raw: str) -> Any:
+    try:
+        return control_message_adapter.validate_json(raw)
+    except ValueError:
+        return None
+
+
+def _measure(func: Callable[[str], Any], raw: str, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        func(raw)
+    return n / (time.perf_counter() - start)
+
+
+class _NullWebSocket:
+    """只做 JSON 序列化的伪 WebSocket, 模拟发送响应的开销"""
+
+    async def send_json(self, data: Any):
+        json.dumps(data)
+
+
+async def _measure_endpoint(frames: List[str], n: int) -> float:
+    from nekro_live_studio.api.websockets import handle_control_message
+    from nekro_live_studio.services.action_scheduler import action_scheduler
+    from nekro_live_studio.utils.logger import logger
+
+    # 未知类型会逐条输出警告日志, 测量时关闭日志输出以免日志 IO 主导结果
+    logger.remove()
+    websocket: Any = _NullWebSocket()
+    start = time.perf_counter()
+    for i in range(n):
+        await handle_control_message(websocket, frames[i % len(frames)])
+        if len(action_scheduler.action_queue) >= 256:
+            action_scheduler.action_queue.clear()
+    elapsed = time.perf_counter() - start
+    action_scheduler.action_queue.clear()
+    return n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000, help="每项测量的消息数量")
+    args = parser.parse_args()
+
+    print(f"{'消息类型':<12}{'旧实现 msg/s':>16}{'TypeAdapter msg/s':>20}")
+    for name, raw in FRAMES.items():
+        legacy = _measure(_legacy_parse, raw, args.messages)
+        adapter = _measure(_adapter_parse, raw, args.messages)
+        print(f"{name:<12}{legacy:>16,.0f}{adapter:>20,.0f}")
+
+    mixed = [FRAMES["animation"], FRAMES["sound_play"], FRAMES["animation"], FRAMES["unknown"]]
+    rate = asyncio.run(_measure_endpoint(mixed, args.messages))
+    print(f"单连接端到端 (校验 + 分发 + 入队 + 响应): {rate:,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
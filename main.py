@@ -4,6 +4,7 @@ import shutil
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Optional
 
 import uvicorn
 from fastapi import FastAPI
@@ -17,7 +18,13 @@ from nekro_live_studio.clients.music.netease_cloud.music import (
 from nekro_live_studio.clients.vtube_studio.plugin import plugin
 from nekro_live_studio.configs.config import config, save_config
 from nekro_live_studio.controllers.config_manager import config_manager
+from nekro_live_studio.services.audio_manager import audio_manager
+from nekro_live_studio.services.audio_mixer import audio_mixer
+from nekro_live_studio.services.audio_player import audio_player
 from nekro_live_studio.services.controller_manager import controller_manager
+from nekro_live_studio.services.ffmpeg import start_worker_pool
+from nekro_live_studio.services.parameter_index import parameter_index
+from nekro_live_studio.services.process_pool import process_pool
 from nekro_live_studio.services.tweener import tweener
 from nekro_live_studio.utils.logger import logger
 
@@ -26,6 +33,13 @@ from nekro_live_studio.utils.logger import logger
 async def lifespan(app: FastAPI):  # noqa: ARG001
     # Startup
     logger.info("应用启动中...")
+    # 写回配置文件, 首次运行时生成默认配置, 升级后补全新增的配置项
+    save_config()
+
+    # 进程内混音器需在音效预解码之前启动, 预解码据此选择解码格式
+    if config.AUDIO.MIXER_ENABLED and not audio_mixer.start(config.AUDIO.MIXER_BACKEND):
+        logger.warning("混音器启动失败, 语音与音效将回退到 ffplay 与 pygame 播放")
+    start_worker_pool(with_player=not audio_mixer.running)
 
     await netease_cloud_music_client.start()
     await bilibili_live_client.start()
@@ -41,6 +55,12 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
 
     await config_manager.load_config_for_current_model()
 
+    # 更新本地缓存的 VTS 参数索引, 供离线检查动画模板使用
+    try:
+        await parameter_index.refresh(plugin)
+    except Exception as e:
+        logger.warning(f"更新 VTS 参数索引失败: {e}")
+
     if plugin.client.authentication_token:
         config.PLUGIN.AUTHENTICATION_TOKEN = plugin.client.authentication_token
 
@@ -60,6 +80,16 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
     tweener.start()
     await controller_manager.start_all_idle()
 
+    # 后台预解码音效库, 不阻塞启动
+    preload_task: Optional[asyncio.Task] = None
+    if config.AUDIO.PRELOAD_ENABLED:
+        preload_task = asyncio.create_task(
+            audio_player.preload(
+                list(audio_manager.description_data.descriptions),
+                config.AUDIO.PRELOAD_BUDGET_MB * 1024 * 1024,
+            ),
+        )
+
     logger.info("应用启动完成")
     logger.info(
         f"字幕页面位于 http://{config.API.HOST}:{config.API.PORT}/static/frontend/index.html 请在浏览器或是OBS中使用浏览器源打开"
@@ -70,6 +100,9 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
     # Shutdown
     logger.info("应用关闭中...")
 
+    if preload_task and not preload_task.done():
+        preload_task.cancel()
+
     # 清理临时文件
     logger.info("清理临时文件中...")
     temp_dir = Path("data/temp")
@@ -90,6 +123,9 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
     await controller_manager.stop_all_idle()
     tweener.release_all()
     await tweener.stop()
+    audio_player.shutdown()
+    audio_mixer.stop()
+    await process_pool.stop()
     # 取消订阅事件
     try:
         await plugin.unsubscribe_event("ModelLoadedEvent")
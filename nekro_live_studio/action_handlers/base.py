@@ -9,10 +9,17 @@ class ActionHandler(ABC):
     """所有动作处理器的抽象基类 (策略接口)"""
 
     @abstractmethod
-    async def handle(self, action: Action, tts_start_event: Optional[asyncio.Event] = None):
+    async def handle(
+        self,
+        action: Action,
+        tts_start_event: Optional[asyncio.Event] = None,
+        started_event: Optional[asyncio.Event] = None,
+    ):
         """
         执行具体的动作逻辑。
         
         Args:
             action: 包含动作类型和数据的完整 Action 对象。
+            tts_start_event: 本批次中首个 TTS 音频开始播放时触发的全局事件。
+            started_event: 动作真正开始产生效果时由处理器触发, 供声明了 with 依赖的动作等待。
         """
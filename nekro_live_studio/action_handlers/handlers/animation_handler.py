@@ -3,21 +3,24 @@ from typing import Optional, cast
 
 from ...schemas.actions import Action, Animation
 from ...services.tweener import tweener
-from ...utils.easing import Easing
-from ...utils.logger import logger
+from ...utils.easing import resolve_easing
 from ..base import ActionHandler
 
 
 class AnimationHandler(ActionHandler):
     """处理 'animation' 动作的具体策略"""
 
-    async def handle(self, action: Action, tts_start_event: Optional[asyncio.Event] = None):  # noqa: ARG002
+    async def handle(
+        self,
+        action: Action,
+        tts_start_event: Optional[asyncio.Event] = None,  # noqa: ARG002
+        started_event: Optional[asyncio.Event] = None,
+    ):
         anim_action = cast(Animation, action)
-        easing_func_name = anim_action.data.easing
-        easing_func = getattr(Easing, easing_func_name, Easing.linear)
-        if not hasattr(Easing, easing_func_name):
-            logger.warning(f"缓动函数 '{easing_func_name}' 未找到. 回退到线性缓动.")
+        easing_func = resolve_easing(anim_action.data.easing)
 
+        if started_event:
+            started_event.set()
         await tweener.tween(
             param=anim_action.data.parameter,
             start=anim_action.data.from_value,
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Optional, cast
+
+from ...schemas.actions import Action, AnimationKeyframes
+from ...services.tweener import Keyframe, tweener
+from ...utils.easing import resolve_easing
+from ..base import ActionHandler
+
+
+class AnimationKeyframesHandler(ActionHandler):
+    """处理 'animation_keyframes' 动作的具体策略"""
+
+    async def handle(
+        self,
+        action: Action,
+        tts_start_event: Optional[asyncio.Event] = None,  # noqa: ARG002
+        started_event: Optional[asyncio.Event] = None,
+    ):
+        keyframes_action = cast(AnimationKeyframes, action)
+        keyframes = [
+            Keyframe(time=keyframe.time, value=keyframe.value, easing_func=resolve_easing(keyframe.easing))
+            for keyframe in keyframes_action.data.keyframes
+        ]
+
+        if started_event:
+            started_event.set()
+
+        await tweener.tween_keyframes(
+            param=keyframes_action.data.parameter,
+            keyframes=keyframes,
+            repeat=keyframes_action.data.repeat,
+            priority=max(keyframes_action.data.priority, 1),
+        )
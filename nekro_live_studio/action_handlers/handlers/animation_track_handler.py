@@ -0,0 +1,38 @@
+import asyncio
+from typing import Optional, cast
+
+from ...schemas.actions import Action, AnimationTrack
+from ...services.tweener import TweenSegment, tweener
+from ...utils.easing import resolve_easing
+from ..base import ActionHandler
+
+
+class AnimationTrackHandler(ActionHandler):
+    """处理 'animation_track' 动作的具体策略"""
+
+    async def handle(
+        self,
+        action: Action,
+        tts_start_event: Optional[asyncio.Event] = None,  # noqa: ARG002
+        started_event: Optional[asyncio.Event] = None,
+    ):
+        track_action = cast(AnimationTrack, action)
+        segments = [
+            TweenSegment(
+                offset=segment.offset,
+                end=segment.target,
+                duration=segment.duration,
+                easing_func=resolve_easing(segment.easing),
+                start=segment.from_value,
+            )
+            for segment in sorted(track_action.data.segments, key=lambda segment: segment.offset)
+        ]
+
+        if started_event:
+            started_event.set()
+
+        await tweener.tween_track(
+            param=track_action.data.parameter,
+            segments=segments,
+            priority=max(track_action.data.priority, 1),
+        )
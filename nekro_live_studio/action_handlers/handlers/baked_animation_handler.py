@@ -0,0 +1,34 @@
+import asyncio
+from typing import Optional, cast
+
+from ...schemas.actions import Action, PlayBakedAnimation
+from ...services.animation_baker import baked_animation_store
+from ...services.tweener import tweener
+from ...utils.logger import logger
+from ..base import ActionHandler
+
+
+class BakedAnimationHandler(ActionHandler):
+    """处理 'baked_animation' 动作的具体策略"""
+
+    async def handle(
+        self,
+        action: Action,
+        tts_start_event: Optional[asyncio.Event] = None,  # noqa: ARG002
+        started_event: Optional[asyncio.Event] = None,
+    ):
+        baked_action = cast(PlayBakedAnimation, action)
+        baked = baked_animation_store.get(baked_action.data.name)
+        if baked is None or baked_action.data.variant >= len(baked.variants):
+            # 入队后模板被修改或删除
+            logger.warning(f"烘焙动画 '{baked_action.data.name}' 已失效, 跳过播放")
+            return
+
+        if started_event:
+            started_event.set()
+
+        await tweener.play_baked(
+            baked.variants[baked_action.data.variant],
+            fps=baked.fps,
+            priority=max(baked_action.data.priority, 1),
+        )
@@ -6,6 +6,7 @@ from ...clients.tts.vits_simple_api.exceptions import VITSSimpleAPIError
 from ...clients.vtube_studio.plugin import plugin
 from ...schemas.actions import Action, Say
 from ...services.controller_manager import controller_manager
+from ...services.viseme import VisemeTimeline
 from ...services.websocket_manager import manager
 from ...utils.logger import logger
 from ..base import ActionHandler
@@ -18,6 +19,7 @@ class SayHandler(ActionHandler):
         self,
         action: Action,
         tts_start_event: asyncio.Event | None = None,
+        started_event: asyncio.Event | None = None,
     ):
         tts_lock = asyncio.Lock()
         say_action = cast(Say, action)
@@ -33,12 +35,20 @@ class SayHandler(ActionHandler):
                 mouth_sync_controller = controller_manager.get_controller_by_name(
                     "MouthSyncController",
                 )
-                loudness_queue: asyncio.Queue[float | None] = asyncio.Queue()
+                loudness_queue: asyncio.Queue[float | None] | None = None
+                viseme_timeline: VisemeTimeline | None = None
                 mouth_sync_task = None
                 if mouth_sync_controller:
-                    mouth_sync_task = asyncio.create_task(
-                        mouth_sync_controller.execute(loudness_queue),
-                    )
+                    if mouth_sync_controller.config.LOOKAHEAD_ENABLED:
+                        viseme_timeline = VisemeTimeline()
+                        mouth_sync_task = asyncio.create_task(
+                            mouth_sync_controller.execute_timeline(viseme_timeline),
+                        )
+                    else:
+                        loudness_queue = asyncio.Queue()
+                        mouth_sync_task = asyncio.create_task(
+                            mouth_sync_controller.execute(loudness_queue),
+                        )
 
                 start_event = asyncio.Event()
                 finished_event = asyncio.Event()
@@ -55,6 +65,7 @@ class SayHandler(ActionHandler):
                             finished_event=finished_event,
                             volume=say_action.data.volume,
                             loudness_queue=loudness_queue,
+                            viseme_timeline=viseme_timeline,
                         ),
                     )
 
@@ -81,6 +92,8 @@ class SayHandler(ActionHandler):
                     # 音频已开始, 如果是第一个, 则触发全局事件并暂停空闲动画
                     if is_first_tts_runner and tts_start_event:
                         tts_start_event.set()
+                    if started_event:
+                        started_event.set()
 
                     logger.debug("音频已开始播放, 开始显示字幕...")
                     await manager.broadcast_to_path(
@@ -97,6 +110,9 @@ class SayHandler(ActionHandler):
                     logger.error(f"TTS 服务调用失败: {e}", exc_info=True)
                     finished_event.set()  # 确保其他部分不会卡住
                 finally:
+                    if viseme_timeline:
+                        # 播放端未能运行 (如 TTS 调用失败) 时也要让前瞻嘴型同步退出
+                        viseme_timeline.close()
                     if mouth_sync_task:
                         await mouth_sync_task
         else:
@@ -105,3 +121,5 @@ class SayHandler(ActionHandler):
                 "/ws/subtitles",
                 say_action.model_dump_json(),
             )
+            if started_event:
+                started_event.set()
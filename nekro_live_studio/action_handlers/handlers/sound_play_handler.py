@@ -9,6 +9,13 @@ from ..base import ActionHandler
 class SoundPlayHandler(ActionHandler):
     """处理 'sound_play' 动作的具体策略"""
 
-    async def handle(self, action: Action, tts_start_event: Optional[asyncio.Event] = None):  # noqa: ARG002
+    async def handle(
+        self,
+        action: Action,
+        tts_start_event: Optional[asyncio.Event] = None,  # noqa: ARG002
+        started_event: Optional[asyncio.Event] = None,
+    ):
         sound_action = cast(SoundPlay, action)
-        audio_player.play(sound_action.data)
+        await audio_player.play(sound_action.data)
+        if started_event:
+            started_event.set()
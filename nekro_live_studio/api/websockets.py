@@ -1,20 +1,24 @@
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Dict
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from pydantic import ValidationError
 
 from ..clients.vtube_studio.plugin import plugin
 from ..schemas.actions import (
-    Animation,
+    Batch,
     Execute,
-    Expression,
     ListPreformAnimation,
     PlayPreformAnimation,
     ResponseMessage,
-    Say,
-    SoundPlay,
+    ScheduledAction,
+    control_message_adapter,
 )
-from ..services.action_scheduler import action_scheduler
+from ..services.action_scheduler import ActionQueueFullError, action_scheduler
 from ..services.animation_player import animation_player
 from ..services.audio_manager import audio_manager
+from ..services.audio_player import audio_player
+from ..services.process_pool import process_pool
 from ..services.websocket_manager import manager
 from ..utils.logger import logger
 
@@ -63,6 +67,219 @@ async def websocket_subtitles_endpoint(websocket: WebSocket):
         logger.debug(f"客户端 {client_host}:{client_port} 已从 /ws/subtitles 断开")
 
 
+# 可由 ActionScheduler 处理的动作类型及其成功提示
+SCHEDULED_ACTION_MESSAGES: Dict[str, str] = {
+    "say": "说话动作已添加",
+    "animation": "动画动作已添加",
+    "animation_track": "动画轨道动作已添加",
+    "animation_keyframes": "关键帧动画动作已添加",
+    "expression": "表情动作已添加",
+    "sound_play": "音效动作已添加",
+}
+
+# 判定为 "未知 action 类型" 的校验错误, 由判别联合在读取 type 字段时直接给出
+UNKNOWN_TYPE_ERRORS = {"union_tag_invalid", "union_tag_not_found"}
+
+
+async def _handle_scheduled_action(websocket: WebSocket, action: ScheduledAction):
+    logger.debug(f"收到 {action.type} action，已添加到队列")
+    completion_time = action_scheduler.add_action(action)
+
+    # 仅部分动作返回预计完成时间
+    response_data = {"estimated_completion_time": completion_time} if action.type != "say" else None
+    await websocket.send_json(
+        ResponseMessage(
+            status="success",
+            message=SCHEDULED_ACTION_MESSAGES[action.type],
+            data=response_data,
+        ).model_dump(),
+    )
+
+
+async def _handle_execute(websocket: WebSocket, action: Execute):
+    logger.debug(f"收到 Execute action: {action}")
+    # 将耗时任务放入后台执行，避免阻塞WebSocket循环
+    await websocket.send_json(
+        ResponseMessage(
+            status="success",
+            message="动作队列已开始执行",
+        ).model_dump(),
+    )
+    await action_scheduler.execute_queue(loop=action.data.loop)
+
+
+async def _handle_batch(websocket: WebSocket, batch: Batch):
+    logger.debug(f"收到 Batch action, 动作数量: {len(batch.data.actions)}")
+    completion_time = action_scheduler.add_actions(batch.data.actions)
+    await websocket.send_json(
+        ResponseMessage(
+            status="success",
+            message=f"已批量添加 {len(batch.data.actions)} 个动作"
+            + (", 动作队列已开始执行" if batch.data.execute else ""),
+            data={
+                "count": len(batch.data.actions),
+                "estimated_completion_time": completion_time,
+            },
+        ).model_dump(),
+    )
+    if batch.data.execute:
+        await action_scheduler.execute_queue(loop=batch.data.loop)
+
+
+async def _handle_list_preformed_animations(websocket: WebSocket, _: ListPreformAnimation):
+    logger.debug("收到 ListPreformAnimation action")
+    animations_list = animation_player.list_preformed_animations()
+    await websocket.send_json(
+        ResponseMessage(
+            status="success",
+            message="动画模板列表已获取",
+            data={
+                "type": "list_preformed_animations",
+                "animations": [anim.model_dump() for anim in animations_list],
+            },
+        ).model_dump(),
+    )
+
+
+async def _handle_play_preformed_animation(websocket: WebSocket, action: PlayPreformAnimation):
+    logger.debug(f"收到 PlayPreformAnimation action: {action.data.name}")
+    completion_time = await animation_player.add_preformed_animation(
+        name=action.data.name,
+        params=action.data.params,
+        delay=action.data.delay,
+    )
+    await websocket.send_json(
+        ResponseMessage(
+            status="success",
+            message="动画模板播放任务已启动",
+            data={"estimated_completion_time": completion_time},
+        ).model_dump(),
+    )
+
+
+async def _handle_get_expressions(websocket: WebSocket, _: Any):
+    try:
+        # 返回所有表情列表
+        expressions = await plugin.get_expressions()
+        await websocket.send_json(
+            ResponseMessage(
+                status="success",
+                message="表情列表已获取",
+                data={
+                    "type": "get_expressions",
+                    "expressions": expressions,
+                },
+            ).model_dump(),
+        )
+    except Exception as e:
+        logger.exception("获取表情列表时发生错误")
+        await websocket.send_json({"status": "error", "message": f"获取表情列表失败: {e!s}"})
+
+
+async def _handle_get_sounds(websocket: WebSocket, _: Any):
+    try:
+        logger.debug("收到 get_sounds action, 获取音效列表及其描述...")
+        sounds_with_descriptions = audio_manager.get_sounds_with_descriptions()
+
+        await websocket.send_json(
+            ResponseMessage(
+                status="success",
+                message="音效列表已获取",
+                data={
+                    "type": "get_sounds",
+                    "sounds": sounds_with_descriptions,
+                },
+            ).model_dump(),
+        )
+        logger.debug("音效列表及描述已成功发送。")
+    except Exception as e:
+        logger.error(f"获取音效列表时发生错误: {e}", exc_info=True)
+        await websocket.send_json({"status": "error", "message": f"获取音效列表失败: {e!s}"})
+
+
+async def _handle_get_scheduler_metrics(websocket: WebSocket, _: Any):
+    resolution_stats = animation_player.get_resolution_cache_stats()
+    await websocket.send_json(
+        ResponseMessage(
+            status="success",
+            message="调度器统计已获取",
+            data={
+                "type": "get_scheduler_metrics",
+                "queue_length": len(action_scheduler.action_queue),
+                "metrics": asdict(action_scheduler.get_metrics()),
+                "resolution_cache": {**asdict(resolution_stats), "hit_rate": resolution_stats.hit_rate},
+            },
+        ).model_dump(),
+    )
+
+
+async def _handle_get_audio_metrics(websocket: WebSocket, _: Any):
+    cache_stats = audio_player.get_cache_stats()
+    pool_stats = process_pool.stats()
+    await websocket.send_json(
+        ResponseMessage(
+            status="success",
+            message="音效缓存统计已获取",
+            data={
+                "type": "get_audio_metrics",
+                "cache": {**asdict(cache_stats), "hit_rate": cache_stats.hit_rate},
+                "playing": audio_player.get_playing_count(),
+                "worker_pool": {**asdict(pool_stats), "hit_rate": pool_stats.hit_rate},
+            },
+        ).model_dump(),
+    )
+
+
+async def _handle_invalid_message(websocket: WebSocket, raw_data: str, error: ValidationError):
+    """处理校验失败的消息, type 字段缺失或未知时走快速路径直接回复错误"""
+    first_error = error.errors(include_url=False, include_context=True, include_input=False)[0]
+    if first_error["type"] in UNKNOWN_TYPE_ERRORS and not first_error["loc"]:
+        action_type = first_error.get("ctx", {}).get("tag")
+        logger.warning(f"未知的 action 类型: {action_type}")
+        await websocket.send_json(
+            ResponseMessage(
+                status="error",
+                message=f"未知的 action 类型: {action_type}",
+            ).model_dump(),
+        )
+        return
+    logger.error(f"Action 数据校验失败, raw_data: {raw_data}\n{error}")
+
+
+# 按消息 type 分发的处理函数表, 在模块加载时构建一次
+MESSAGE_HANDLERS: Dict[str, Callable[[WebSocket, Any], Awaitable[None]]] = {
+    **dict.fromkeys(SCHEDULED_ACTION_MESSAGES, _handle_scheduled_action),
+    "execute": _handle_execute,
+    "batch": _handle_batch,
+    "list_preformed_animations": _handle_list_preformed_animations,
+    "play_preformed_animation": _handle_play_preformed_animation,
+    "get_expressions": _handle_get_expressions,
+    "get_sounds": _handle_get_sounds,
+    "get_scheduler_metrics": _handle_get_scheduler_metrics,
+    "get_audio_metrics": _handle_get_audio_metrics,
+}
+
+
+async def handle_control_message(websocket: WebSocket, raw_data: str):
+    """校验并分发一条控制消息"""
+    try:
+        message = control_message_adapter.validate_json(raw_data)
+    except ValidationError as e:
+        await _handle_invalid_message(websocket, raw_data, e)
+        return
+    try:
+        await MESSAGE_HANDLERS[message.type](websocket, message)
+    except ActionQueueFullError as e:
+        logger.warning(str(e))
+        await websocket.send_json(
+            ResponseMessage(
+                status="error",
+                message=str(e),
+                data={"queue_length": e.queue_length},
+            ).model_dump(),
+        )
+
+
 @router.websocket("/ws/animate_control")
 async def websocket_animate_control_endpoint(websocket: WebSocket):
     """
@@ -75,121 +292,8 @@ async def websocket_animate_control_endpoint(websocket: WebSocket):
     logger.info(f"客户端 {client_host}:{client_port} 已连接到 {path}")
     try:
         while True:
-            data = await websocket.receive_json()
-            action_type = data.get("type")
-
-            # 将可由 ActionScheduler 处理的动作类型分组
-            scheduled_actions = {
-                "say": (Say, "说话动作已添加"),
-                "animation": (Animation, "动画动作已添加"),
-                "expression": (Expression, "表情动作已添加"),
-                "sound_play": (SoundPlay, "音效动作已添加"),
-            }
-
-            try:
-                if action_type in scheduled_actions:
-                    model, success_message = scheduled_actions[action_type]
-                    action = model.model_validate(data)
-                    logger.debug(f"收到 {action.type} action，已添加到队列")
-
-                    completion_time = action_scheduler.add_action(action)
-
-                    # 仅部分动作返回预计完成时间
-                    response_data = {"estimated_completion_time": completion_time} if action_type != "say" else None
-                    await websocket.send_json(
-                        ResponseMessage(
-                            status="success",
-                            message=success_message,
-                            data=response_data,
-                        ).model_dump(),
-                    )
-
-                elif action_type == "execute":
-                    action = Execute.model_validate(data)
-                    logger.debug(f"收到 Execute action: {action}")
-                    # 将耗时任务放入后台执行，避免阻塞WebSocket循环
-                    await websocket.send_json(
-                        ResponseMessage(
-                            status="success",
-                            message="动作队列已开始执行",
-                        ).model_dump(),
-                    )
-                    await action_scheduler.execute_queue(loop=action.data.loop)
-                elif action_type == "list_preformed_animations":
-                    _ = ListPreformAnimation.model_validate(data)
-                    logger.debug("收到 ListPreformAnimation action")
-                    animations_list = animation_player.list_preformed_animations()
-                    await websocket.send_json(
-                        ResponseMessage(
-                            status="success",
-                            message="动画模板列表已获取",
-                            data={
-                                "type": "list_preformed_animations",
-                                "animations": [anim.model_dump() for anim in animations_list],
-                            },
-                        ).model_dump(),
-                    )
-                elif action_type == "play_preformed_animation":
-                    action = PlayPreformAnimation.model_validate(data)
-                    logger.debug(f"收到 PlayPreformAnimation action: {action.data.name}")
-                    completion_time = await animation_player.add_preformed_animation(
-                        name=action.data.name,
-                        params=action.data.params,
-                        delay=action.data.delay,
-                    )
-                    await websocket.send_json(
-                        ResponseMessage(
-                            status="success",
-                            message="动画模板播放任务已启动",
-                            data={"estimated_completion_time": completion_time},
-                        ).model_dump(),
-                    )
-                elif action_type == "get_expressions":
-                    try:
-                        # 返回所有表情列表
-                        expressions = await plugin.get_expressions()
-                        await websocket.send_json(
-                            ResponseMessage(
-                                status="success",
-                                message="表情列表已获取",
-                                data={
-                                    "type": "get_expressions",
-                                    "expressions": expressions,
-                                },
-                            ).model_dump(),
-                        )
-                    except Exception as e:
-                        logger.exception("获取表情列表时发生错误")
-                        await websocket.send_json({"status": "error", "message": f"获取表情列表失败: {e!s}"})
-                elif action_type == "get_sounds":
-                    try:
-                        logger.debug("收到 get_sounds action, 获取音效列表及其描述...")
-                        sounds_with_descriptions = audio_manager.get_sounds_with_descriptions()
-
-                        await websocket.send_json(
-                            ResponseMessage(
-                                status="success",
-                                message="音效列表已获取",
-                                data={
-                                    "type": "get_sounds",
-                                    "sounds": sounds_with_descriptions,
-                                },
-                            ).model_dump(),
-                        )
-                        logger.debug("音效列表及描述已成功发送。")
-                    except Exception as e:
-                        logger.error(f"获取音效列表时发生错误: {e}", exc_info=True)
-                        await websocket.send_json({"status": "error", "message": f"获取音效列表失败: {e!s}"})
-                else:
-                    logger.warning(f"未知的 action 类型: {action_type}")
-                    await websocket.send_json(
-                        ResponseMessage(
-                            status="error",
-                            message=f"未知的 action 类型: {action_type}",
-                        ).model_dump(),
-                    )
-            except ValidationError:
-                logger.exception(f"Action 数据校验失败, raw_data: {data}")
+            raw_data = await websocket.receive_text()
+            await handle_control_message(websocket, raw_data)
 
     except WebSocketDisconnect:
         await manager.disconnect(websocket, path)
@@ -0,0 +1,61 @@
+"""
+将动画模板烘焙为逐帧参数曲线
+
+用法: python -m nekro_live_studio.cli.bake_animations [模板名称 ...] [--variants N] [--fps FPS]
+
+烘焙结果保存在模板旁的 <文件名>.baked.npz 中, 服务运行时会自动加载。模板修改后烘焙文件失效,
+需要重新烘焙。不指定模板名称时烘焙目录中的全部模板。
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import json5
+from pydantic import ValidationError
+
+from ..schemas.preformed_animation import AnimationTemplate
+from ..services.animation_baker import BAKE_FPS, bake_template, baked_path, save_baked
+from ..services.animation_compiler import compile_template
+
+ANIMATIONS_DIR = Path("./data/resources/animations")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help="要烘焙的模板名称, 默认全部")
+    parser.add_argument("--variants", type=int, default=8, help="含随机值的模板烘焙的变体数量")
+    parser.add_argument("--fps", type=int, default=BAKE_FPS, help="采样帧率")
+    args = parser.parse_args()
+
+    wanted = set(args.names)
+    failed = False
+    for file_path in sorted(ANIMATIONS_DIR.glob("*.jsonc")):
+        content = file_path.read_bytes()
+        try:
+            template = AnimationTemplate.model_validate(json5.loads(content.decode("utf-8")))
+            if wanted and template.name not in wanted:
+                continue
+            baked = bake_template(compile_template(template), content, variants=args.variants, fps=args.fps)
+        except (ValidationError, ValueError) as e:
+            print(f"[失败] {file_path.name}: {e}", file=sys.stderr)
+            failed = True
+            continue
+
+        wanted.discard(template.name)
+        output = baked_path(file_path)
+        save_baked(output, baked)
+        frames = max(variant.frame_count for variant in baked.variants)
+        print(
+            f"[完成] {template.name}: {len(baked.variants)} 个变体, 最长 {frames} 帧, "
+            f"{output.stat().st_size / 1024:.1f} KiB -> {output.name}",
+        )
+
+    for name in sorted(wanted):
+        print(f"[失败] 未找到模板 '{name}'", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+检查动画模板
+
+用法: python -m nekro_live_studio.cli.lint_animations [--samples N] [--strict] [--max-duration 秒] [--max-rate 条/秒]
+
+加载并编译目录中的全部模板, 用默认参数试解析, 检查参数名称 (对照本地缓存的 VTS 参数索引,
+服务连接 VTS 后自动更新)、缓动描述与取值范围, 并估算每个模板的时长与开销:
+帧数为烘焙后的时间线帧数, 消息数为逐参数缓动时发送的注入请求数。含随机值的模板取多次采样中的最坏值。
+存在错误时退出码为 1, 指定 --strict 时警告也视为错误。
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import json5
+from pydantic import ValidationError
+
+from ..schemas.actions import Action, Animation, AnimationData, AnimationKeyframesData
+from ..schemas.preformed_animation import AnimationTemplate, KeyframeTrackTemplate
+from ..services.action_coalescer import coalesce_animations
+from ..services.animation_baker import (
+    BAKE_FPS,
+    bake_actions,
+    baked_path,
+    load_baked,
+    source_digest,
+)
+from ..services.animation_compiler import ResolvedActionData, compile_template
+from ..services.parameter_index import parameter_index
+from ..utils.easing import parse_easing
+from ..utils.logger import logger
+
+ANIMATIONS_DIR = Path("./data/resources/animations")
+
+
+@dataclass
+class TemplateReport:
+    file_name: str
+    name: str = ""
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    duration: float = 0.0
+    frames: int = 0
+    messages: int = 0
+
+
+def _tween_messages(action_data: ResolvedActionData) -> int:
+    """与 Tweener 一致: 每帧发送一次注入请求, 即时设置只发送一次"""
+    if isinstance(action_data, AnimationKeyframesData):
+        length = action_data.keyframes[-1].time * action_data.repeat
+    elif action_data.from_value is not None and action_data.from_value == action_data.target:
+        length = 0.0
+    else:
+        length = action_data.duration
+    return max(1, int(length * BAKE_FPS)) if length > 0 else 1
+
+
+def _action_end(action_data: ResolvedActionData) -> float:
+    if isinstance(action_data, AnimationKeyframesData):
+        return action_data.delay + action_data.keyframes[-1].time * action_data.repeat
+    return action_data.delay + action_data.duration
+
+
+def _check_static(template: AnimationTemplate, report: TemplateReport):
+    """不依赖求值结果的检查: 参数名称与缓动描述"""
+    check_parameters = bool(parameter_index.names())
+    for index, action in enumerate(template.data.actions):
+        location = f"第 {index + 1} 个动作"
+        if check_parameters and parameter_index.get(action.parameter) is None:
+            report.errors.append(f"{location}的参数 '{action.parameter}' 不在 VTS 参数索引中")
+        easings = (
+            [keyframe.easing for keyframe in action.keyframes]
+            if isinstance(action, KeyframeTrackTemplate)
+            else [action.easing]
+        )
+        for easing in easings:
+            try:
+                parse_easing(easing)
+            except ValueError as e:
+                report.errors.append(f"{location}的缓动 '{easing}' 无效: {e}")
+
+
+def _check_resolved(resolved: List[ResolvedActionData], report: TemplateReport, seen: Dict[str, None]):
+    """检查一次解析结果并累计开销的最坏值"""
+    for action_data in resolved:
+        info = parameter_index.get(action_data.parameter)
+        if info is None:
+            continue
+        values = (
+            [keyframe.value for keyframe in action_data.keyframes]
+            if isinstance(action_data, AnimationKeyframesData)
+            else [action_data.target]
+        )
+        for value in values:
+            if not info.min <= value <= info.max:
+                message = f"参数 '{info.name}' 的取值 {value:g} 超出范围 [{info.min:g}, {info.max:g}]"
+                if message not in seen:
+                    seen[message] = None
+                    report.warnings.append(message)
+
+    animations: List[Action] = [
+        Animation(type="animation", data=action_data) for action_data in resolved if isinstance(action_data, AnimationData)
+    ]
+    _, coalesce_report = coalesce_animations(animations)
+    if coalesce_report.dropped_actions:
+        message = f"{coalesce_report.dropped_actions} 个动画与同一参数上进行中的动画重叠, 运行时会被丢弃"
+        if message not in seen:
+            seen[message] = None
+            report.warnings.append(message)
+
+    report.duration = max(report.duration, max((_action_end(action_data) for action_data in resolved), default=0.0))
+    report.messages = max(report.messages, sum(_tween_messages(action_data) for action_data in resolved))
+    report.frames = max(report.frames, bake_actions(resolved).frame_count)
+
+
+def _check_baked(file_path: Path, content: bytes, report: TemplateReport):
+    path = baked_path(file_path)
+    if not path.exists():
+        return
+    try:
+        baked = load_baked(path)
+    except (OSError, ValueError, KeyError) as e:
+        report.errors.append(f"烘焙文件 {path.name} 无法读取: {e}")
+        return
+    if baked.source_digest != source_digest(content):
+        report.warnings.append(f"烘焙文件 {path.name} 已过期, 请重新烘焙")
+
+
+def lint_file(file_path: Path, samples: int) -> TemplateReport:
+    report = TemplateReport(file_name=file_path.name)
+    content = file_path.read_bytes()
+    try:
+        template = AnimationTemplate.model_validate(json5.loads(content.decode("utf-8")))
+        report.name = template.name
+        compiled = compile_template(template)
+    except (ValidationError, ValueError) as e:
+        report.errors.append(str(e))
+        return report
+
+    _check_static(template, report)
+    _check_baked(file_path, content, report)
+
+    missing = [param.name for param in template.data.params if param.default is None]
+    if missing:
+        report.warnings.append(f"参数 {', '.join(missing)} 没有默认值, 跳过试解析与开销估算")
+        return report
+
+    seen: Dict[str, None] = {}
+    for _ in range(1 if compiled.deterministic else samples):
+        try:
+            resolved = compiled.resolve()
+        except (ValueError, KeyError, TypeError, ZeroDivisionError) as e:
+            report.errors.append(f"使用默认参数解析失败: {e}")
+            return report
+        _check_resolved(resolved, report, seen)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=16, help="含随机值的模板的采样次数")
+    parser.add_argument("--max-duration", type=float, default=30.0, help="模板时长超过该值(秒)时警告")
+    parser.add_argument("--max-rate", type=float, default=480.0, help="平均每秒注入请求数超过该值时警告")
+    parser.add_argument("--strict", action="store_true", help="警告也视为错误")
+    args = parser.parse_args()
+
+    index = parameter_index.load()
+    source = "VTS 缓存" if index.source == "vts" else "默认参数列表"
+    print(f"参数索引: {source}, 共 {len(index.parameters)} 个参数")
+    if not index.parameters:
+        print("参数索引为空, 跳过参数名称与取值范围检查")
+    # 问题由报告统一输出, 不再重复打印运行时日志 (如缓动函数回退)
+    logger.remove()
+
+    reports = [lint_file(file_path, max(1, args.samples)) for file_path in sorted(ANIMATIONS_DIR.glob("*.jsonc"))]
+
+    names: Dict[str, str] = {}
+    for report in reports:
+        if not report.name:
+            continue
+        if report.name in names:
+            report.errors.append(f"名称 '{report.name}' 与 {names[report.name]} 重复")
+        else:
+            names[report.name] = report.file_name
+
+    error_count = warning_count = 0
+    print(f"{'模板':<16}{'时长(s)':>10}{'帧数':>8}{'消息数':>8}{'消息/s':>10}")
+    for report in reports:
+        rate = report.messages / report.duration if report.duration > 0 else 0.0
+        if report.duration > args.max_duration:
+            report.warnings.append(f"时长 {report.duration:.2f}s 超过 {args.max_duration:g}s")
+        if rate > args.max_rate:
+            report.warnings.append(f"平均每秒 {rate:.0f} 条注入请求, 超过 {args.max_rate:g}")
+
+        print(f"{report.name or report.file_name:<16}{report.duration:>10.2f}{report.frames:>8}{report.messages:>8}{rate:>10.0f}")
+        for error in report.errors:
+            print(f"    [错误] {error}")
+        for warning in report.warnings:
+            print(f"    [警告] {warning}")
+        error_count += len(report.errors)
+        warning_count += len(report.warnings)
+
+    print(f"共 {len(reports)} 个模板, {error_count} 个错误, {warning_count} 个警告")
+    if error_count or (args.strict and warning_count):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,10 @@ from typing import AsyncIterator, Literal, Optional
 import httpx
 
 from ....configs.config import config
+from ....services.audio_mixer import audio_mixer
+from ....services.audio_stream import play_audio_stream_with_mixer
 from ....services.ffmpeg import play_audio_stream_with_ffplay
+from ....services.viseme import VisemeTimeline
 from ....utils.logger import logger
 from .exceptions import VITSSimpleAPIError
 
@@ -26,6 +29,7 @@ class VITSSimpleAPIClient:
         finished_event: Optional[asyncio.Event] = None,
         volume: Optional[float] = None,
         loudness_queue: Optional[asyncio.Queue[Optional[float]]] = None,
+        viseme_timeline: Optional[VisemeTimeline] = None,
     ) -> bool:
         """
         从文本生成语音并流式播放
@@ -36,12 +40,15 @@ class VITSSimpleAPIClient:
 
         try:
             stream_generator = self._generate_speech_stream(text, lang, speaker_id)
-            return await play_audio_stream_with_ffplay(
+            # 混音器运行时在进程内播放, 与音效共享同一个输出与播放时钟
+            play = play_audio_stream_with_mixer if audio_mixer.running else play_audio_stream_with_ffplay
+            return await play(
                 stream_generator,
                 started_event=started_event,
                 finished_event=finished_event,
                 volume=volume,
                 loudness_queue=loudness_queue,
+                viseme_timeline=viseme_timeline,
             )
         except Exception as e:
             logger.error(f"语音生成或流式播放失败: {e}")
@@ -158,6 +158,27 @@ class SetParameterValueRequest(VTSRequest):
         )
 
 
+@dataclass
+class SetParameterValuesRequest(VTSRequest):
+    """在一次请求中为多个参数注入数据, 字段含义同 SetParameterValueRequest"""
+
+    def __init__(
+        self,
+        values: Dict[str, float],
+        weight: float = 1.0,
+        mode: str = "set",
+        face_found: bool = True,
+    ):
+        super().__init__(
+            message_type="InjectParameterDataRequest",
+            data={
+                "faceFound": face_found,
+                "mode": mode,
+                "parameterValues": [{"id": name, "value": value, "weight": weight} for name, value in values.items()],
+            },
+        )
+
+
 @dataclass
 class ParameterCreationRequest(VTSRequest):
     """创建新的自定义参数请求
@@ -24,6 +24,7 @@ from .models import (
     ParameterCreationRequest,
     ParameterValueRequest,
     SetParameterValueRequest,
+    SetParameterValuesRequest,
     StatisticsRequest,
     TriggerHotkeyRequest,
     VTSFolderInfoRequest,
@@ -195,6 +196,22 @@ class VTSPlugin:
         response = await self.client.send_request(request)
         return response.data  # 成功时为空
 
+    async def set_parameter_values(
+        self,
+        values: Dict[str, float],
+        weight: float = 1.0,
+        mode: str = "set",
+        face_found: bool = True,
+    ) -> Dict[str, Any]:
+        """在一次请求中为多个参数注入数据, 参数含义同 set_parameter_value。
+
+        Args:
+            values: 参数 ID -> 要设置的值。
+        """
+        request = SetParameterValuesRequest(values, weight=weight, mode=mode, face_found=face_found)
+        response = await self.client.send_request(request)
+        return response.data
+
     async def create_parameter(
         self,
         parameter_name: str,
@@ -10,7 +10,6 @@ class ConfigBase(BaseModel):
     def load_config(cls, file_path: Path):
         """加载配置文件"""
         if not file_path.exists():
-            file_path.parent.mkdir(parents=True, exist_ok=True)
             return cls()
         content: str = file_path.read_text(encoding="utf-8")
         if file_path.suffix == ".json":
@@ -21,6 +20,7 @@ class ConfigBase(BaseModel):
 
     def dump_config(self, file_path: Path) -> None:
         """保存配置文件"""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
         if file_path.suffix == ".json":
             file_path.write_text(self.model_dump_json(), encoding="utf-8")
         elif file_path.suffix in [".yaml", ".yml"]:
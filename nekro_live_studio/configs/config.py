@@ -8,7 +8,6 @@ from .base import ConfigBase
 
 CONFIG_PATH = Path("./data") / "configs" / "nekro_live_studio.yaml"
 CONFIG_DIR = Path("./data") / "configs"
-CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 
 class ApiConfig(ConfigBase):
@@ -91,6 +90,72 @@ class FFmpegConfig(ConfigBase):
 
     FFMPEG_CMD: str = Field(default="./ffmpeg/ffmpeg.exe", description="ffmpeg 可执行文件完整路径或命令名")
     FFPLAY_CMD: str = Field(default="./ffmpeg/ffplay.exe", description="ffplay 可执行文件完整路径或命令名")
+    FFPLAY_LATENCY: float = Field(
+        default=0.2,
+        description="ffplay 尚未报告音频时钟时, 估算的从开始写入到声音被听到的延迟(秒), 仅用于口型时间轴",
+        ge=0,
+    )
+    WORKER_POOL_SIZE: int = Field(
+        default=1,
+        description="每种 ffplay/ffmpeg 命令预先启动的备用进程数, 用于降低每次说话的进程启动延迟, 为 0 时不预启动",
+        ge=0,
+    )
+    WORKER_MAX_IDLE: float = Field(default=600.0, description="备用进程的最长空闲时间(秒), 超过后回收并重新启动", gt=0)
+    WORKER_CHECK_INTERVAL: float = Field(default=5.0, description="备用进程健康检查的间隔(秒)", gt=0)
+
+
+class AudioConfig(ConfigBase):
+    """音效播放配置"""
+
+    SOUND_CACHE_MAX_MB: int = Field(default=256, description="已解码音效缓存的 PCM 数据总量上限 (MB)", ge=0)
+    DECODE_WORKERS: int = Field(default=2, description="音效解码线程数", gt=0)
+    PRELOAD_ENABLED: bool = Field(default=True, description="启动后是否在后台预先解码音效描述文件中的全部音效")
+    PRELOAD_BUDGET_MB: int = Field(
+        default=128,
+        description="预解码占用的 PCM 数据总量上限 (MB), 超过缓存上限时按缓存上限计",
+        ge=0,
+    )
+    MIXER_ENABLED: bool = Field(
+        default=False,
+        description="是否使用进程内混音器统一输出语音与音效 (取代 ffplay 与 pygame 两条输出路径)",
+    )
+    MIXER_BACKEND: Literal["sounddevice", "null"] = Field(
+        default="sounddevice",
+        description="混音器输出后端: sounddevice 输出到声卡 (需安装 sounddevice), null 丢弃输出 (无声卡环境)",
+    )
+    MIXER_SAMPLE_RATE: int = Field(default=48000, description="混音器采样率", gt=0)
+    MIXER_CHANNELS: int = Field(default=2, description="混音器输出声道数", gt=0)
+    MIXER_BLOCK_SIZE: int = Field(default=480, description="混音器每次回调输出的帧数, 越小延迟越低", gt=0)
+    SPEECH_GAIN: float = Field(default=1.0, description="语音总线增益", ge=0)
+    EFFECTS_GAIN: float = Field(default=1.0, description="音效总线增益", ge=0)
+    MUSIC_GAIN: float = Field(default=0.6, description="音乐总线增益", ge=0)
+    LOUDNESS_HOP: float = Field(
+        default=0.015,
+        description="嘴型同步响度包络的步长(秒), 每个步长输出一个响度值",
+        ge=0.005,
+        le=0.1,
+    )
+    TEE_BUFFER_KB: int = Field(default=512, description="语音流同时送往播放与响度分析时共用的环形缓冲区大小 (KB)", gt=0)
+    TEE_ANALYSIS_POLICY: Literal["block", "drop"] = Field(
+        default="drop",
+        description="响度分析积压超过缓冲区时的处理: block 让语音流等待分析, drop 断开分析 (本句嘴型同步提前结束)",
+    )
+    LOUDNESS_WEIGHTING: Literal["k", "rms"] = Field(
+        default="k",
+        description="响度计算方式: k 为 K 加权响度 (LUFS, 与 ebur128 一致), rms 为未加权的 RMS 电平 (dBFS)",
+    )
+
+
+class SchedulerConfig(ConfigBase):
+    """动作调度配置"""
+
+    MAX_QUEUE_LENGTH: int = Field(default=256, description="单次执行前动作队列的最大长度", gt=0)
+    MAX_CONCURRENT_ACTIONS: int = Field(default=64, description="同时执行的动作数量上限 (说话动作不计入)", gt=0)
+    OVERFLOW_POLICY: Literal["drop_oldest", "reject", "merge"] = Field(
+        default="drop_oldest",
+        description="队列已满时的策略: drop_oldest 丢弃最早的动作, reject 拒绝新动作, merge 先合并重复动画再拒绝",
+    )
+    SPAWN_BATCH_SIZE: int = Field(default=32, description="执行队列时每创建多少个动作任务让出一次事件循环", gt=0)
 
 
 class VTSModelControlConfig(ConfigBase):
@@ -107,6 +172,8 @@ class VTSModelControlConfig(ConfigBase):
     TTS: VITSSimpleAPIConfig = Field(default_factory=VITSSimpleAPIConfig)
     NCM: NeteaseCloudMusicConfig = Field(default_factory=NeteaseCloudMusicConfig)
     FFMPEG: FFmpegConfig = Field(default_factory=FFmpegConfig)
+    AUDIO: AudioConfig = Field(default_factory=AudioConfig)
+    SCHEDULER: SchedulerConfig = Field(default_factory=SchedulerConfig)
 
 
 try:
@@ -115,7 +182,6 @@ except Exception as e:
     print(f"VTS Model Controll 配置文件加载失败: {e} | 请检查配置文件是否符合语法要求")
     print("应用将退出...")
     exit(1)
-config.dump_config(file_path=CONFIG_PATH)
 
 
 def save_config():
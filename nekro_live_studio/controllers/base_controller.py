@@ -44,6 +44,11 @@ class BaseController(Generic[TConfig], ABC):
         """保存配置"""
         config_manager.dump_config()
 
+    @property
+    def superseded(self) -> bool:
+        """是否已被其他控制器取代, 被取代的控制器启动后直接退出"""
+        return False
+
     @property
     def is_running(self) -> bool:
         """检查动画是否正在运行"""
@@ -81,7 +86,7 @@ class BaseController(Generic[TConfig], ABC):
     async def _run(self,*args, **kwargs):
         """主运行逻辑，根据动画类型选择执行方式"""
         try:
-            if not self.config.ENABLED:
+            if not self.config.ENABLED or self.superseded:
                 return
 
             if self.get_animation_type() == AnimationType.IDLE:
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field, BaseModel
 
@@ -90,6 +90,111 @@ class MouthSyncConfig(ControllerConfig):
     OPEN_MAX: float = Field(default=0.7, description="嘴巴开合最大值（张开，可调小避免过度张嘴）")
     OPEN_PARAMETER: str = Field(default="MouthOpen", description="嘴巴开合控制的参数名")
     LOUDNESS_THRESHOLD: float = Field(default=-30, description="响度阈值(LUFS)")
+    LOUDNESS_RANGE: float = Field(default=20, gt=0, description="响度从阈值升高多少(dB)时嘴巴张到最大")
+    LOOKAHEAD_ENABLED: bool = Field(
+        default=False,
+        description="是否启用前瞻嘴型同步: 提前分析语音生成口型时间轴, 按播放时钟输出, 不再滞后于声音",
+    )
+    LOOKAHEAD_LEAD: float = Field(default=0.03, ge=0, le=0.5, description="前瞻模式下嘴型领先实际听到的声音的时长（秒）")
+    LOOKAHEAD_FPS: int = Field(default=60, gt=0, description="前瞻模式下嘴型的输出帧率")
+    FORM_PARAMETER: str = Field(default="", description="口型扁圆控制的参数名（如 MouthForm），为空则不控制，仅前瞻模式")
+    FORM_MIN: float = Field(default=-0.5, description="声音最低沉（接近 u/o）时的口型值")
+    FORM_MAX: float = Field(default=0.5, description="声音最明亮（接近 i/e）时的口型值")
+
+
+class SpringConfig(BaseModel):
+    """单个弹簧: 输出参数以阻尼振动跟随驱动参数"""
+
+    SOURCE: str = Field(description="驱动参数名, 取其当前值 (通常来自缓动) 计算弹簧目标")
+    TARGET: str = Field(description="输出参数名")
+    GAIN: float = Field(default=1.0, description="驱动值到目标值的比例")
+    OFFSET: float = Field(default=0.0, description="目标值的偏移")
+    FREQUENCY: float = Field(default=2.0, gt=0, description="弹簧固有频率（Hz），越大跟随越紧")
+    DAMPING_RATIO: float = Field(default=0.4, ge=0, description="阻尼比，小于1时会越过目标后回弹")
+
+
+class SecondaryMotionConfig(ControllerConfig):
+    """弹簧二次运动配置"""
+
+    ENABLED: bool = Field(default=False, description="是否启用弹簧二次运动（头发、头部惯性、眼睛滞后等）")
+    FPS: int = Field(default=60, gt=0, description="物理模拟帧率")
+    SPRINGS: List[SpringConfig] = Field(
+        default_factory=lambda: [
+            SpringConfig(SOURCE="FaceAngleX", TARGET="FacePositionX", GAIN=0.2, FREQUENCY=1.5, DAMPING_RATIO=0.35),
+            SpringConfig(SOURCE="FaceAngleY", TARGET="FacePositionY", GAIN=0.2, FREQUENCY=1.5, DAMPING_RATIO=0.35),
+        ],
+        description="弹簧列表",
+    )
+
+
+class NoiseChannelConfig(BaseModel):
+    """程序化待机动画中的单个参数通道: 基准值 + 平滑噪声 + 周期分量"""
+
+    PARAMETER: str = Field(description="参数名")
+    CENTER: float = Field(default=0.0, description="基准值")
+    NOISE_AMPLITUDE: float = Field(default=0.0, description="噪声幅度，为负时反向")
+    NOISE_PERIOD: float = Field(default=4.0, gt=0, description="噪声的特征周期（秒），越大变化越慢")
+    NOISE_OCTAVES: int = Field(default=2, ge=1, le=6, description="噪声叠加层数，越多细节越丰富")
+    NOISE_KEY: str = Field(default="", description="噪声序列名，名称与周期都相同的通道同步运动，为空时使用参数名")
+    WAVE_AMPLITUDE: float = Field(default=0.0, description="周期分量幅度")
+    WAVE_PERIOD: float = Field(default=3.0, gt=0, description="周期分量的周期（秒）")
+    WAVE_PHASE: float = Field(default=0.0, description="周期分量的相位（弧度）")
+    MIN: Optional[float] = Field(default=None, description="输出下限")
+    MAX: Optional[float] = Field(default=None, description="输出上限")
+
+
+class IdleBlinkConfig(BaseModel):
+    """程序化待机动画中的眨眼"""
+
+    ENABLED: bool = Field(default=True, description="是否眨眼")
+    MIN_INTERVAL: float = Field(default=2.0, gt=0, description="两次眨眼之间的最小间隔时间（秒）")
+    MAX_INTERVAL: float = Field(default=4.0, gt=0, description="两次眨眼之间的最大间隔时间（秒）")
+    CLOSE_DURATION: float = Field(default=0.15, ge=0, description="闭眼持续时间（秒）")
+    CLOSED_HOLD: float = Field(default=0.05, ge=0, description="眼睛闭合状态的保持时间（秒）")
+    OPEN_DURATION: float = Field(default=0.3, ge=0, description="睁眼持续时间（秒）")
+    LEFT_PARAMETER: str = Field(default="EyeOpenLeft", description="左眼参数名")
+    RIGHT_PARAMETER: str = Field(default="EyeOpenRight", description="右眼参数名")
+    MIN_VALUE: float = Field(default=0.0, description="闭眼时的值")
+    MAX_VALUE: float = Field(default=1.0, description="睁眼时的值")
+
+
+class ProceduralIdleConfig(ControllerConfig):
+    """程序化待机动画配置, 启用时取代呼吸、身体摇摆、眼睛跟随、眨眼与嘴部表情控制器"""
+
+    ENABLED: bool = Field(default=False, description="是否使用程序化待机动画（取代呼吸、身体摇摆、眼睛跟随、眨眼与嘴部表情控制器）")
+    FPS: int = Field(default=30, gt=0, description="输出帧率")
+    SEED: Optional[int] = Field(default=None, description="随机种子，为空时每次启动随机生成，固定后动作可复现")
+    CHANNELS: List[NoiseChannelConfig] = Field(
+        default_factory=lambda: [
+            # 呼吸
+            NoiseChannelConfig(PARAMETER="FaceAngleY", WAVE_AMPLITUDE=3.0, WAVE_PERIOD=3.0),
+            # 身体摇摆
+            NoiseChannelConfig(PARAMETER="FaceAngleX", CENTER=2.5, NOISE_AMPLITUDE=12.5, NOISE_PERIOD=5.0, NOISE_KEY="body_x"),
+            NoiseChannelConfig(PARAMETER="FaceAngleZ", CENTER=2.5, NOISE_AMPLITUDE=12.5, NOISE_PERIOD=5.0, NOISE_KEY="body_z"),
+            # 眼睛跟随身体, 垂直方向与上肢旋转相反
+            NoiseChannelConfig(PARAMETER="EyeLeftX", NOISE_AMPLITUDE=1.0, NOISE_PERIOD=5.0, NOISE_KEY="body_x"),
+            NoiseChannelConfig(PARAMETER="EyeRightX", NOISE_AMPLITUDE=1.0, NOISE_PERIOD=5.0, NOISE_KEY="body_x"),
+            NoiseChannelConfig(PARAMETER="EyeLeftY", NOISE_AMPLITUDE=-1.0, NOISE_PERIOD=5.0, NOISE_KEY="body_z"),
+            NoiseChannelConfig(PARAMETER="EyeRightY", NOISE_AMPLITUDE=-1.0, NOISE_PERIOD=5.0, NOISE_KEY="body_z"),
+            # 嘴部表情; 不包含 MouthOpen, 以免在嘴型同步的缓动间隙中逐帧覆盖说话时的开口
+            NoiseChannelConfig(PARAMETER="MouthSmile", CENTER=0.4, NOISE_AMPLITUDE=0.3, NOISE_PERIOD=4.5, MIN=0.0),
+        ],
+        description="参数通道列表",
+    )
+    BLINK: IdleBlinkConfig = Field(default_factory=IdleBlinkConfig, description="眨眼")
+
+
+class IdleLoopConfig(ControllerConfig):
+    """预渲染待机循环配置"""
+
+    ENABLED: bool = Field(
+        default=False,
+        description="是否播放预渲染的待机循环（按眨眼、呼吸、身体摇摆、眼睛跟随、嘴部表情配置渲染），启用时取代实时生成的待机动作",
+    )
+    DURATION: float = Field(default=180.0, gt=0, description="循环时长（秒）")
+    CROSSFADE: float = Field(default=2.0, ge=0, description="循环首尾衔接处的交叉淡化时长（秒）")
+    FPS: int = Field(default=30, gt=0, description="渲染与播放帧率")
+    SEED: Optional[int] = Field(default=None, description="渲染用的随机种子，为空时每次渲染随机生成")
 
 
 class ExpressionState(BaseModel):
@@ -116,4 +221,7 @@ class ControllersConfig(ControllerConfig):
     eye_follow: EyeFollowConfig = Field(default_factory=EyeFollowConfig, title="眼睛跟随")
     mouth_expression: MouthExpressionConfig = Field(default_factory=MouthExpressionConfig, title="嘴部表情")
     mouth_sync: MouthSyncConfig = Field(default_factory=MouthSyncConfig, title="嘴型同步")
+    secondary_motion: SecondaryMotionConfig = Field(default_factory=SecondaryMotionConfig, title="弹簧二次运动")
+    procedural_idle: ProceduralIdleConfig = Field(default_factory=ProceduralIdleConfig, title="程序化待机动画")
+    idle_loop: IdleLoopConfig = Field(default_factory=IdleLoopConfig, title="预渲染待机循环")
     expression_apply: ExpressionApplyConfig = Field(default_factory=ExpressionApplyConfig, title="表情应用")
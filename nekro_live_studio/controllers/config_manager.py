@@ -7,7 +7,6 @@ from ..utils.logger import logger
 from .config import ControllersConfig, ExpressionState
 
 CONFIG_DIR = Path("data") / "configs"
-CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 
 class ConfigManager:
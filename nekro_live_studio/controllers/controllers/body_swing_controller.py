@@ -4,6 +4,7 @@ from typing import Type
 
 from pydantic import Field
 
+from ...services.idle_loop import idle_loop_active
 from ...services.tweener import tweener
 from ...utils.logger import logger
 from ..base_controller import IdleController
@@ -22,6 +23,12 @@ class BodySwingController(IdleController[BodySwingConfig]):
     def eye_config(self) -> EyeFollowConfig:
         return config_manager.config.eye_follow
 
+    @property
+    def superseded(self) -> bool:
+        # 程序化待机动画或预渲染待机循环启用时由对应控制器统一输出
+        config = config_manager.config
+        return config.procedural_idle.ENABLED or idle_loop_active(config)
+
     async def run_cycle(self):
         """执行一次身体摇摆周期。"""
         target_x = random.uniform(self.config.X_MIN, self.config.X_MAX)
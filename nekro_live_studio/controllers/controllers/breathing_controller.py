@@ -4,6 +4,7 @@ from typing import Type
 
 from pydantic import Field
 
+from ...services.idle_loop import idle_loop_active
 from ...services.tweener import tweener
 from ...utils.easing import Easing
 from ...utils.logger import logger
@@ -19,6 +20,12 @@ class BreathingController(IdleController[BreathingConfig]):
     def config(self) -> BreathingConfig:
         return config_manager.config.breathing
 
+    @property
+    def superseded(self) -> bool:
+        # 程序化待机动画或预渲染待机循环启用时由对应控制器统一输出
+        config = config_manager.config
+        return config.procedural_idle.ENABLED or idle_loop_active(config)
+
     async def run_cycle(self):
         """执行一次呼吸周期：吸气 -> 呼气"""
         # 吸气
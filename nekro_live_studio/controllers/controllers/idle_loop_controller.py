@@ -0,0 +1,110 @@
+import asyncio
+import time
+import zipfile
+from typing import Optional
+
+from ...services.controller_manager import controller_manager
+from ...services.idle_loop import (
+    IdleLoop,
+    idle_loop_active,
+    idle_loop_digest,
+    idle_loop_path,
+    load_idle_loop,
+    mark_idle_loop_failed,
+    render_idle_loop,
+    save_idle_loop,
+)
+from ...services.tweener import ReturnBlend, tweener
+from ...utils.logger import logger
+from ..base_controller import IdleController
+from ..config import ControllersConfig, IdleLoopConfig
+from ..config_manager import config_manager
+
+# 参数被缓动接管结束后, 从缓动的终值过渡回循环输出的时长(秒)
+RETURN_BLEND_DURATION = 0.3
+# 未检测到模型时使用的循环文件名
+DEFAULT_LOOP_NAME = "default"
+
+
+def _load_or_render(model_name: str, config: ControllersConfig) -> IdleLoop:
+    path = idle_loop_path(model_name)
+    digest = idle_loop_digest(config)
+    try:
+        idle_loop = load_idle_loop(path)
+    except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning(f"待机循环缓存 '{path}' 已损坏, 将删除并重新渲染: {e}")
+        path.unlink(missing_ok=True)
+        idle_loop = None
+    if idle_loop is not None and idle_loop.config_digest == digest:
+        return idle_loop
+
+    start = time.perf_counter()
+    idle_loop = render_idle_loop(config)
+    try:
+        save_idle_loop(path, idle_loop)
+    except OSError as e:
+        # 无法写入缓存不影响本次使用, 下次启动时重新渲染
+        logger.warning(f"保存待机循环 '{path}' 失败: {e}")
+    logger.info(
+        f"已渲染待机循环 '{path}': {idle_loop.frame_count} 帧 x {len(idle_loop.parameters)} 个参数, "
+        f"耗时 {time.perf_counter() - start:.2f}s",
+    )
+    return idle_loop
+
+
+class IdleLoopController(IdleController[IdleLoopConfig]):
+    """
+    预渲染待机循环控制器, 按当前模型的待机配置离线渲染一段首尾交叉淡化的循环, 播放时每帧只做一次数组索引。
+
+    启用时取代呼吸、身体摇摆、眼睛跟随、眨眼、嘴部表情与程序化待机控制器。配置变化后循环会在后台线程中重新渲染。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._loop: Optional[IdleLoop] = None
+        self._source_config: Optional[ControllersConfig] = None
+        self._start_time: float = 0.0
+        self._return_blend = ReturnBlend(RETURN_BLEND_DURATION)
+        self._fallback_task: Optional[asyncio.Task] = None
+
+    @property
+    def config(self) -> IdleLoopConfig:
+        return config_manager.config.idle_loop
+
+    @property
+    def superseded(self) -> bool:
+        # 当前配置下的循环无法渲染时, 由各待机控制器输出
+        return not idle_loop_active(config_manager.config)
+
+    async def _ensure_loop(self, now: float) -> Optional[IdleLoop]:
+        """取得当前模型的循环, 无法加载也无法渲染时回退到各待机控制器并返回 None"""
+        # 模型切换后配置对象会被替换, 需要重新加载对应的循环
+        config = config_manager.config
+        if self._loop is None or self._source_config is not config:
+            model_name = config_manager.current_model_name or DEFAULT_LOOP_NAME
+            try:
+                self._loop = await asyncio.to_thread(_load_or_render, model_name, config)
+            except Exception as e:
+                logger.error(f"待机循环不可用, 回退到各待机控制器: {e}", exc_info=True)
+                self._loop = None
+                mark_idle_loop_failed(config)
+                self._stop_event.set()
+                # 被取代的待机控制器启动时已直接退出, 需要重新启动
+                self._fallback_task = asyncio.create_task(controller_manager.start_all_idle())
+                return None
+            self._source_config = config
+            self._start_time = now
+        return self._loop
+
+    async def run_cycle(self):
+        """输出一帧待机循环"""
+        loop = asyncio.get_running_loop()
+        idle_loop = await self._ensure_loop(loop.time())
+        if idle_loop is None:
+            return
+        now = loop.time()
+        values = idle_loop.frame(now - self._start_time)
+        await tweener.set_frame(self._return_blend.apply(tweener, values, now))
+
+        sleep_time = now + 1 / idle_loop.fps - loop.time()
+        await asyncio.sleep(max(sleep_time, 0.0))
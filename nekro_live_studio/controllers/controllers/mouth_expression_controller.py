@@ -2,6 +2,7 @@ import asyncio
 import random
 from typing import Type
 
+from ...services.idle_loop import idle_loop_active
 from ...services.tweener import tweener
 from ...utils.easing import Easing
 from ...utils.logger import logger
@@ -17,6 +18,12 @@ class MouthExpressionController(IdleController[MouthExpressionConfig]):
     def config(self) -> MouthExpressionConfig:
         return config_manager.config.mouth_expression
 
+    @property
+    def superseded(self) -> bool:
+        # 程序化待机动画或预渲染待机循环启用时由对应控制器统一输出
+        config = config_manager.config
+        return config.procedural_idle.ENABLED or idle_loop_active(config)
+
     async def run_cycle(self):
         """执行一次嘴部表情变化周期。"""
         target_smile = random.uniform(self.config.SMILE_MIN, self.config.SMILE_MAX)
@@ -1,8 +1,10 @@
 import asyncio
-import random
 from typing import Optional, Type
 
+from ...configs.config import config
+from ...services.loudness import SILENCE_FLOOR
 from ...services.tweener import tweener
+from ...services.viseme import VisemeTimeline
 from ...utils.easing import Easing
 from ...utils.logger import logger
 from ..base_controller import OneShotController
@@ -17,39 +19,103 @@ class MouthSyncController(OneShotController[MouthSyncConfig]):
     def config(self) -> MouthSyncConfig:
         return config_manager.config.mouth_sync
 
+    def _open_for(self, lufs: float) -> float:
+        # 包络已跟随音节起伏, 直接按高出阈值的程度线性映射到开合度
+        level = min(max((lufs - self.config.LOUDNESS_THRESHOLD) / self.config.LOUDNESS_RANGE, 0.0), 1.0)
+        return self.config.OPEN_MIN + (self.config.OPEN_MAX - self.config.OPEN_MIN) * level
+
     async def execute(self, loudness_queue: asyncio.Queue[Optional[float]]):
+        """每个响度值对应音频中的一个步长, 按步长的节奏依次过渡到对应的嘴型"""
         logger.info("启动嘴型同步...")
+        loop = asyncio.get_running_loop()
+        hop = config.AUDIO.LOUDNESS_HOP
+        next_time: Optional[float] = None
         try:
             while True:
                 lufs = await loudness_queue.get()
-                logger.debug(f"响度: {lufs}")
                 if lufs is None:  # End of stream
                     break
 
-                target_open = self.config.OPEN_MIN
-                if lufs >= self.config.LOUDNESS_THRESHOLD:
-                    target_open = random.uniform(self.config.OPEN_MIN, self.config.OPEN_MAX)
-
+                # 按绝对时间排期, 避免每步的调度误差累积; 队列等待过久时从当前时间重新开始
+                now = loop.time()
+                next_time = now + hop if next_time is None or next_time < now else next_time + hop
                 await tweener.tween(
                     param=self.config.OPEN_PARAMETER,
-                    end=target_open,
-                    duration=0.05, #0.06 0.07都会提前结束
+                    end=self._open_for(lufs),
+                    duration=next_time - now,
                     easing_func=Easing.linear,
                     priority=2,  # 高优先级以覆盖其他可能影响嘴部的动画
                 )
-                await asyncio.sleep(0.05)
+                # 目标值不变时缓动立即返回, 仍需等到下一步
+                await asyncio.sleep(max(next_time - loop.time(), 0.0))
 
         except asyncio.CancelledError:
             logger.info("嘴型同步任务被取消.")
         finally:
-            logger.info("嘴型同步结束, 闭合嘴巴.")
-            await tweener.tween(
+            await self._close_mouth()
+
+    async def execute_timeline(self, timeline: VisemeTimeline):
+        """
+        前瞻模式: 每帧读取播放时钟, 在口型时间轴上取 LOOKAHEAD_LEAD 秒之后的值, 使嘴型略微领先实际听到的声音。
+
+        时间轴由分析端提前写入; 播放位置超出已分析的范围时保持当前嘴型, 分析结束后超出部分视为静音。
+        """
+        logger.info("启动前瞻嘴型同步...")
+        loop = asyncio.get_running_loop()
+        frame = 1 / self.config.LOOKAHEAD_FPS
+        next_time: Optional[float] = None
+        try:
+            while not timeline.closed:
+                # 与响应模式一致, 在缓动之前确定下一帧的时刻, 缓动只占用到该时刻为止
+                now = loop.time()
+                next_time = now + frame if next_time is None or next_time < now else next_time + frame
+                position = timeline.position()
+                if position is not None:
+                    sample = timeline.sample(position + self.config.LOOKAHEAD_LEAD)
+                    if sample is None and timeline.analysis_done:
+                        sample = (SILENCE_FLOOR, 0.0)
+                    if sample is not None:
+                        await self._apply_viseme(*sample, duration=next_time - now)
+
+                await asyncio.sleep(max(next_time - loop.time(), 0.0))
+
+        except asyncio.CancelledError:
+            logger.info("嘴型同步任务被取消.")
+        finally:
+            await self._close_mouth()
+
+    async def _apply_viseme(self, lufs: float, brightness: float, duration: float):
+        tweens = [
+            tweener.tween(
                 param=self.config.OPEN_PARAMETER,
-                end=self.config.OPEN_MIN,
-                duration=0.2,
-                easing_func=Easing.out_quad,
+                end=self._open_for(lufs),
+                duration=duration,
+                easing_func=Easing.linear,
                 priority=2,
+            ),
+        ]
+        # 只在发声时更新口型的扁圆, 静音时保持上一个口型
+        if self.config.FORM_PARAMETER and lufs >= self.config.LOUDNESS_THRESHOLD:
+            tweens.append(
+                tweener.tween(
+                    param=self.config.FORM_PARAMETER,
+                    end=self.config.FORM_MIN + (self.config.FORM_MAX - self.config.FORM_MIN) * brightness,
+                    duration=duration,
+                    easing_func=Easing.linear,
+                    priority=2,
+                ),
             )
+        await asyncio.gather(*tweens)
+
+    async def _close_mouth(self):
+        logger.info("嘴型同步结束, 闭合嘴巴.")
+        await tweener.tween(
+            param=self.config.OPEN_PARAMETER,
+            end=self.config.OPEN_MIN,
+            duration=0.2,
+            easing_func=Easing.out_quad,
+            priority=2,
+        )
 
 
 mouth_sync_controller = MouthSyncController()
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Optional
+
+from ...services.idle_loop import idle_loop_active
+from ...services.procedural_idle import ProceduralIdleGenerator
+from ...services.tweener import ReturnBlend, tweener
+from ...utils.logger import logger
+from ..base_controller import IdleController
+from ..config import ProceduralIdleConfig
+from ..config_manager import config_manager
+
+# 参数被缓动接管结束后, 从缓动的终值过渡回待机输出的时长(秒)
+RETURN_BLEND_DURATION = 0.3
+
+
+class ProceduralIdleController(IdleController[ProceduralIdleConfig]):
+    """
+    程序化待机动画控制器, 以单个任务逐帧输出噪声与周期分量生成的待机动作。
+
+    启用时取代呼吸、身体摇摆、眼睛跟随、眨眼与嘴部表情控制器。正在被缓动的参数
+    (如动画模板、嘴型同步) 由缓动控制, 待机输出不会覆盖。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._generator: Optional[ProceduralIdleGenerator] = None
+        self._start_time: float = 0.0
+        self._return_blend = ReturnBlend(RETURN_BLEND_DURATION)
+
+    @property
+    def config(self) -> ProceduralIdleConfig:
+        return config_manager.config.procedural_idle
+
+    @property
+    def superseded(self) -> bool:
+        # 预渲染待机循环启用且可用时由 IdleLoopController 播放
+        return idle_loop_active(config_manager.config)
+
+    def _ensure_generator(self, now: float) -> ProceduralIdleGenerator:
+        # 模型切换后配置对象会被替换, 需要重建求值器
+        if self._generator is None or self._generator.config is not self.config:
+            self._generator = ProceduralIdleGenerator(self.config, seed=self.config.SEED)
+            self._start_time = now
+            logger.debug(
+                f"程序化待机动画: {len(self._generator.parameters)} 个通道, 种子 {self._generator.seed}",
+            )
+        return self._generator
+
+    async def run_cycle(self):
+        """输出一帧待机动作"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        generator = self._ensure_generator(now)
+        values = generator.evaluate(now - self._start_time)
+        await tweener.set_frame(self._return_blend.apply(tweener, values, now))
+
+        sleep_time = now + 1 / self.config.FPS - loop.time()
+        await asyncio.sleep(max(sleep_time, 0.0))
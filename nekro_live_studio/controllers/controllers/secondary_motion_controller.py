@@ -0,0 +1,43 @@
+import asyncio
+
+from ...services.spring_physics import SpringSystem
+from ...services.tweener import tweener
+from ..base_controller import IdleController
+from ..config import SecondaryMotionConfig
+from ..config_manager import config_manager
+
+# 帧间隔上限(秒), 事件循环卡顿后不一次性积分过长时间
+MAX_FRAME_DT = 0.1
+
+
+class SecondaryMotionController(IdleController[SecondaryMotionConfig]):
+    """
+    弹簧二次运动控制器, 让头发、头部惯性、眼睛滞后等参数以阻尼振动跟随缓动中的驱动参数。
+
+    所有弹簧在同一个任务中逐帧向量化计算, 每帧的输出合并为一次注入请求。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.springs = SpringSystem()
+        self._last_frame: float = 0.0
+
+    @property
+    def config(self) -> SecondaryMotionConfig:
+        return config_manager.config.secondary_motion
+
+    async def run_cycle(self):
+        """推进一帧物理模拟"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        dt = min(now - self._last_frame, MAX_FRAME_DT) if self._last_frame else 1 / self.config.FPS
+        self._last_frame = now
+
+        # 模型切换后配置可能改变
+        self.springs.configure(self.config.SPRINGS)
+        values = self.springs.step_params(tweener.controlled_params, dt)
+        if values:
+            await tweener.set_frame(values)
+
+        sleep_time = self._last_frame + 1 / self.config.FPS - loop.time()
+        await asyncio.sleep(max(sleep_time, 0.0))
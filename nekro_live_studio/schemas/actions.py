@@ -1,6 +1,7 @@
-from typing import Any, Dict, Literal, Optional, Union
+from itertools import pairwise
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 
 from ..configs.config import config
 
@@ -11,7 +12,7 @@ class SoundPlayData(BaseModel):
     path: str = Field(default="", description="音效路径, 如果为空则返回所有音效列表")
     duration: float = Field(default=0.0, description="持续时间,为0则完整播放直至结束", ge=0)
     volume: float = Field(default=1.0, description="音量,范围为0~1", ge=0, le=1)
-    speed: float = Field(default=1.0, description="播放速度,默认为1", gt=0)
+    speed: float = Field(default=1.0, description="播放速度,默认为1, 小于1放慢, 大于1加快, 音调不变", gt=0)
     delay: float = Field(default=0.0, description="延迟执行的时间(秒)", ge=0)
 
 
@@ -36,7 +37,63 @@ class AnimationData(BaseModel):
     target: float = Field(default=0, description="参数目标值")
     duration: float = Field(description="动画持续时间(秒)")
     delay: float = Field(default=0.0, description="延迟执行的时间(秒)")
-    easing: str = Field(default="linear", description="缓动函数名称")
+    easing: str = Field(
+        default="linear",
+        description="缓动函数名称, 或参数化缓动 cubic-bezier(x1,y1,x2,y2) / steps(n) / spring(k,d)",
+    )
+    priority: int = Field(default=0, description="缓动优先级, 0是最低")
+
+
+class AnimationSegmentData(BaseModel):
+    """动画轨道中的单个缓动段"""
+
+    offset: float = Field(default=0.0, description="相对轨道起点的开始时间(秒)", ge=0)
+    from_value: Optional[float] = Field(default=None, description="段起始值, 为空则从参数当前值开始")
+    target: float = Field(description="段目标值")
+    duration: float = Field(description="段持续时间(秒)")
+    easing: str = Field(
+        default="linear",
+        description="缓动函数名称, 或参数化缓动 cubic-bezier(x1,y1,x2,y2) / steps(n) / spring(k,d)",
+    )
+
+
+class AnimationTrackData(BaseModel):
+    parameter: str = Field(description="VTS模型参数名称")
+    segments: List[AnimationSegmentData] = Field(description="按 offset 排序的缓动段", min_length=1)
+    delay: float = Field(default=0.0, description="延迟执行的时间(秒)")
+    priority: int = Field(default=0, description="缓动优先级, 0是最低")
+
+
+class KeyframeData(BaseModel):
+    """关键帧轨道中的单个关键帧"""
+
+    time: float = Field(description="相对轨道起点的时间(秒)", ge=0)
+    value: float = Field(description="参数值")
+    easing: str = Field(default="linear", description="从上一关键帧过渡到此关键帧的缓动函数名称或参数化缓动")
+
+
+class AnimationKeyframesData(BaseModel):
+    parameter: str = Field(description="VTS模型参数名称")
+    keyframes: List[KeyframeData] = Field(description="按时间升序排列的关键帧", min_length=1)
+    repeat: int = Field(default=1, description="整条轨道重复播放的次数", ge=1)
+    delay: float = Field(default=0.0, description="延迟执行的时间(秒)")
+    priority: int = Field(default=0, description="缓动优先级, 0是最低")
+
+    @model_validator(mode="after")
+    def _check_order(self):
+        times = [keyframe.time for keyframe in self.keyframes]
+        if any(later < earlier for earlier, later in pairwise(times)):
+            raise ValueError("关键帧必须按时间升序排列")
+        return self
+
+
+class BakedAnimationData(BaseModel):
+    """播放预烘焙动画的数据, 由 AnimationPlayer 在模板存在有效烘焙文件时生成"""
+
+    name: str = Field(description="动画模板名称")
+    variant: int = Field(default=0, description="烘焙变体序号", ge=0)
+    duration: float = Field(description="烘焙曲线总时长(秒)", ge=0)
+    delay: float = Field(default=0.0, description="延迟执行的时间(秒)")
     priority: int = Field(default=0, description="缓动优先级, 0是最低")
 
 
@@ -73,26 +130,82 @@ class GetExpressions(BaseModel):
     type: Literal["get_expressions"]
 
 
-class SoundPlay(BaseModel):
+class GetSchedulerMetrics(BaseModel):
+    type: Literal["get_scheduler_metrics"]
+
+
+class GetAudioMetrics(BaseModel):
+    type: Literal["get_audio_metrics"]
+
+
+class ScheduledActionBase(BaseModel):
+    """可由 ActionScheduler 调度的动作的公共字段, 用于声明动作间的依赖关系"""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: Optional[str] = Field(default=None, description="动作标识, 供同一队列中其他动作的 after/with 引用")
+    after: Optional[str] = Field(default=None, description="在指定 id 的动作结束后开始, 随后再计算自身 delay")
+    with_: Optional[str] = Field(
+        default=None,
+        alias="with",
+        description="在指定 id 的动作真正开始时开始 (如 TTS 音频开始播放), 随后再计算自身 delay",
+    )
+
+    @model_validator(mode="after")
+    def _check_dependency(self):
+        if self.after is not None and self.with_ is not None:
+            raise ValueError("after 与 with 不能同时指定")
+        if self.id is not None and self.id in (self.after, self.with_):
+            raise ValueError(f"动作 '{self.id}' 不能依赖自身")
+        return self
+
+    @property
+    def dependency(self) -> Optional[str]:
+        """所依赖动作的 id, 未声明依赖时为 None"""
+        return self.after if self.after is not None else self.with_
+
+
+class SoundPlay(ScheduledActionBase):
     type: Literal["sound_play"]
     data: SoundPlayData
 
 
-class Say(BaseModel):
+class Say(ScheduledActionBase):
     """说话行为"""
 
     type: Literal["say"]
     data: SayData
 
 
-class Animation(BaseModel):
+class Animation(ScheduledActionBase):
     """动画行为"""
 
     type: Literal["animation"]
     data: AnimationData
 
 
-class Expression(BaseModel):
+class AnimationTrack(ScheduledActionBase):
+    """多段动画轨道行为, 同一参数的多个缓动段由单个任务依次播放"""
+
+    type: Literal["animation_track"]
+    data: AnimationTrackData
+
+
+class AnimationKeyframes(ScheduledActionBase):
+    """关键帧动画行为, 整条轨道 (含重复) 由单个缓动播放"""
+
+    type: Literal["animation_keyframes"]
+    data: AnimationKeyframesData
+
+
+class PlayBakedAnimation(ScheduledActionBase):
+    """播放预烘焙动画的行为, 逐帧输出烘焙好的参数曲线"""
+
+    type: Literal["baked_animation"]
+    data: BakedAnimationData
+
+
+class Expression(ScheduledActionBase):
     """表情行为"""
 
     type: Literal["expression"]
@@ -119,6 +232,29 @@ class ListPreformAnimation(BaseModel):
     type: Literal["list_preformed_animations"]
     data: ListPreformAnimationData = Field(default_factory=ListPreformAnimationData)
 
+
+ScheduledAction = Annotated[
+    Union[Say, Animation, AnimationTrack, AnimationKeyframes, Expression, SoundPlay],
+    Field(discriminator="type"),
+]
+"""可加入 ActionScheduler 队列的动作, 按 type 字段区分"""
+
+
+class BatchData(BaseModel):
+    """批量提交动作的数据"""
+
+    actions: List[ScheduledAction] = Field(description="按顺序加入队列的动作列表")
+    execute: bool = Field(default=False, description="加入队列后是否立即执行")
+    loop: int = Field(default=0, description="立即执行时的循环次数，含义同 execute 动作")
+
+
+class Batch(BaseModel):
+    """批量提交动作的行为，一次校验、一次响应"""
+
+    type: Literal["batch"]
+    data: BatchData
+
+
 class ResponseMessage(BaseModel):
     """响应消息"""
 
@@ -126,6 +262,41 @@ class ResponseMessage(BaseModel):
     message: str
     data: Optional[Any] = None
 
-Action = Union[
-    Say, Animation, Expression, Execute, SoundPlay, PlayPreformAnimation,
+Action = Annotated[
+    Union[
+        Say,
+        Animation,
+        AnimationTrack,
+        AnimationKeyframes,
+        PlayBakedAnimation,
+        Expression,
+        Execute,
+        SoundPlay,
+        PlayPreformAnimation,
+    ],
+    Field(discriminator="type"),
 ]
+
+ControlMessage = Annotated[
+    Union[
+        Say,
+        Animation,
+        AnimationTrack,
+        AnimationKeyframes,
+        Expression,
+        SoundPlay,
+        Execute,
+        Batch,
+        PlayPreformAnimation,
+        ListPreformAnimation,
+        GetExpressions,
+        GetSounds,
+        GetSchedulerMetrics,
+        GetAudioMetrics,
+    ],
+    Field(discriminator="type"),
+]
+"""/ws/animate_control 端点可接收的全部消息, 按 type 字段区分"""
+
+control_message_adapter: TypeAdapter[ControlMessage] = TypeAdapter(ControlMessage)
+"""预编译的控制消息校验器, 直接对原始 JSON 文本调用 validate_json"""
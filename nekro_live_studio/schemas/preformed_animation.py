@@ -1,6 +1,6 @@
-from typing import Dict, List, Literal, Optional, Union
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Discriminator, Field, Tag
 
 
 class ParamDef(BaseModel):
@@ -27,6 +27,7 @@ class Expression(BaseModel):
 class ActionTemplate(BaseModel):
     """动画模板中的单个动作"""
 
+    type: Literal["tween"] = "tween"
     parameter: str
     from_value: Optional[Union[float, int, Expression, RandomFloat, RandomInt]] = None
     to: Union[float, int, Expression, RandomFloat, RandomInt]
@@ -35,6 +36,40 @@ class ActionTemplate(BaseModel):
     delay: Union[float, Expression, RandomFloat] = 0.0
 
 
+class KeyframeTemplate(BaseModel):
+    """关键帧轨道中的单个关键帧, easing 用于从上一关键帧过渡到此关键帧"""
+
+    time: Union[float, Expression, RandomFloat]
+    value: Union[float, int, Expression, RandomFloat, RandomInt]
+    easing: str = "linear"
+
+
+class KeyframeTrackTemplate(BaseModel):
+    """动画模板中的关键帧轨道, 整条轨道 (含重复) 由单个缓动播放"""
+
+    type: Literal["keyframes"]
+    parameter: str
+    keyframes: List[KeyframeTemplate] = Field(..., min_length=1)
+    repeat: Union[int, Expression] = 1
+    delay: Union[float, Expression, RandomFloat] = 0.0
+
+
+def _action_template_type(value: Any) -> str:
+    # 未声明 type 的动作视为普通缓动, 兼容已有模板
+    if isinstance(value, dict):
+        return value.get("type", "tween")
+    return getattr(value, "type", "tween")
+
+
+AnyActionTemplate = Annotated[
+    Union[
+        Annotated[ActionTemplate, Tag("tween")],
+        Annotated[KeyframeTrackTemplate, Tag("keyframes")],
+    ],
+    Discriminator(_action_template_type),
+]
+
+
 class AnimationTemplateData(BaseModel):
     """动画模板的 'data' 部分"""
 
@@ -45,7 +80,7 @@ class AnimationTemplateData(BaseModel):
     ] = Field(
         default_factory=dict,
     )
-    actions: List[ActionTemplate]
+    actions: List[AnyActionTemplate]
 
 
 class AnimationTemplate(BaseModel):
@@ -0,0 +1,144 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..schemas.actions import (
+    Action,
+    Animation,
+    AnimationSegmentData,
+    AnimationTrack,
+    AnimationTrackData,
+)
+
+# 判定两个缓动是否重叠时允许的时间误差(秒)
+TIME_EPSILON = 1e-6
+
+
+@dataclass
+class CoalesceReport:
+    """一次动作合并的结果统计"""
+
+    merged_tracks: int = 0
+    merged_actions: int = 0
+    dropped_actions: int = 0
+    details: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.merged_actions > 0 or self.dropped_actions > 0
+
+    def summary(self) -> str:
+        return (
+            f"合并 {self.merged_actions} 个动画为 {self.merged_tracks} 条轨道, "
+            f"丢弃 {self.dropped_actions} 个被完全覆盖的动画"
+        )
+
+
+def _effective_priority(action: Animation) -> int:
+    # 与 AnimationHandler 一致, 动画动作的优先级至少为 1
+    return max(action.data.priority, 1)
+
+
+def _occupied_until(action: Animation) -> float:
+    """缓动在 Tweener 中占用参数直到的时间点, 起止值相同的缓动会被即时设置而不占用"""
+    if action.data.from_value is not None and action.data.from_value == action.data.target:
+        return action.data.delay
+    return action.data.delay + action.data.duration
+
+
+def _is_coalescible(action: Animation) -> bool:
+    """带 id 或依赖的动画可能被其他动作引用或开始时间不确定, 不参与合并"""
+    return action.id is None and action.dependency is None
+
+
+def _build_track(chain: List[Animation]) -> AnimationTrack:
+    track_start = chain[0].data.delay
+    return AnimationTrack(
+        type="animation_track",
+        data=AnimationTrackData(
+            parameter=chain[0].data.parameter,
+            delay=track_start,
+            priority=chain[0].data.priority,
+            segments=[
+                AnimationSegmentData(
+                    offset=action.data.delay - track_start,
+                    from_value=action.data.from_value,
+                    target=action.data.target,
+                    duration=action.data.duration,
+                    easing=action.data.easing,
+                )
+                for action in chain
+            ],
+        ),
+    )
+
+
+def coalesce_animations(actions: List[Action]) -> Tuple[List[Action], CoalesceReport]:
+    """
+    合并同一参数上的重复动画动作。
+
+    按 Tweener 的优先级语义逐参数模拟: 在另一个缓动进行中开始且优先级不更高的动画
+    在运行时必然被拒绝, 直接丢弃; 互不重叠且优先级相同的动画合并为一条多段轨道,
+    由单个任务播放; 更高优先级的抢占会切断当前轨道。原动作列表不会被修改。
+
+    Returns:
+        合并后的动作列表 (保持原有顺序) 与合并报告
+    """
+    report = CoalesceReport()
+    by_parameter: Dict[str, List[Tuple[int, Animation]]] = defaultdict(list)
+    for index, action in enumerate(actions):
+        if isinstance(action, Animation) and _is_coalescible(action):
+            by_parameter[action.data.parameter].append((index, action))
+
+    replacements: Dict[int, Optional[Action]] = {}
+    for parameter, indexed_actions in by_parameter.items():
+        if len(indexed_actions) < 2:
+            continue
+        indexed_actions.sort(key=lambda item: (item[1].data.delay, item[0]))
+
+        chains: List[List[Tuple[int, Animation]]] = []
+        chain: List[Tuple[int, Animation]] = []
+        last: Optional[Animation] = None
+        for index, action in indexed_actions:
+            start = action.data.delay
+            if last is not None and start < _occupied_until(last) - TIME_EPSILON:
+                if _effective_priority(action) <= _effective_priority(last):
+                    replacements[index] = None
+                    report.dropped_actions += 1
+                    report.details.append(
+                        f"{parameter}: 丢弃 {start:.2f}s 开始的动画, 已被同时进行的同级或更高优先级动画覆盖",
+                    )
+                    continue
+                # 更高优先级的抢占, 切断当前轨道
+                chains.append(chain)
+                chain = []
+            elif chain and _effective_priority(chain[-1][1]) != _effective_priority(action):
+                chains.append(chain)
+                chain = []
+            chain.append((index, action))
+            last = action
+        chains.append(chain)
+
+        for merged in chains:
+            if len(merged) < 2:
+                continue
+            first_index = merged[0][0]
+            replacements[first_index] = _build_track([action for _, action in merged])
+            for index, _ in merged[1:]:
+                replacements[index] = None
+            report.merged_tracks += 1
+            report.merged_actions += len(merged)
+            report.details.append(f"{parameter}: {len(merged)} 个互不重叠的动画合并为一条轨道")
+
+    if not replacements:
+        return actions, report
+
+    coalesced: List[Action] = []
+    for index, action in enumerate(actions):
+        if index in replacements:
+            replacement = replacements[index]
+            if replacement is not None:
+                coalesced.append(replacement)
+        else:
+            coalesced.append(action)
+    return coalesced, report
@@ -1,14 +1,83 @@
 import asyncio
+import contextlib
 from collections import deque
-from typing import Deque, Optional, cast
+from dataclasses import dataclass, field, replace
+from typing import Deque, Dict, Iterable, List, Optional, Set, cast
 
 from ..action_handlers.base import ActionHandler
 from ..action_handlers.handlers.animation_handler import AnimationHandler
+from ..action_handlers.handlers.animation_keyframes_handler import (
+    AnimationKeyframesHandler,
+)
+from ..action_handlers.handlers.animation_track_handler import AnimationTrackHandler
+from ..action_handlers.handlers.baked_animation_handler import BakedAnimationHandler
 from ..action_handlers.handlers.expression_handler import ExpressionHandler
 from ..action_handlers.handlers.say_handler import SayHandler
 from ..action_handlers.handlers.sound_play_handler import SoundPlayHandler
-from ..schemas.actions import Action, Animation, Expression, Say, SoundPlay
+from ..configs.config import config
+from ..schemas.actions import (
+    Action,
+    Animation,
+    AnimationKeyframes,
+    AnimationTrack,
+    Expression,
+    PlayBakedAnimation,
+    Say,
+    ScheduledActionBase,
+    SoundPlay,
+)
 from ..utils.logger import logger
+from .action_coalescer import CoalesceReport, coalesce_animations
+
+
+@dataclass
+class ActionNode:
+    """一次执行中的单个动作节点, 记录其真实的开始/结束事件与依赖"""
+
+    action: Action
+    started: asyncio.Event = field(default_factory=asyncio.Event)
+    finished: asyncio.Event = field(default_factory=asyncio.Event)
+    after: Optional["ActionNode"] = None
+    with_: Optional["ActionNode"] = None
+
+    async def wait_dependency(self):
+        """等待所依赖的动作结束 (after) 或真正开始 (with)"""
+        if self.after:
+            await self.after.finished.wait()
+        elif self.with_:
+            await self.with_.started.wait()
+
+
+@dataclass
+class SchedulerMetrics:
+    """动作调度器的累计统计"""
+
+    accepted: int = 0
+    dropped: int = 0
+    """drop_oldest 策略丢弃的最早动作数"""
+    rejected: int = 0
+    merged: int = 0
+    """merge 策略合并动画后队列净减少的动作数 (多个动画合并为一条轨道, 或被完全覆盖而移除)"""
+    peak_queue_length: int = 0
+    running: int = 0
+    peak_running: int = 0
+
+
+class ActionQueueFullError(Exception):
+    """动作队列已满且溢出策略拒绝新动作"""
+
+    def __init__(self, queue_length: int, incoming: int):
+        self.queue_length = queue_length
+        self.incoming = incoming
+        super().__init__(f"动作队列已满 (当前 {queue_length} 个, 新增 {incoming} 个), 已拒绝新动作")
+
+
+def _get_action_id(action: Action) -> Optional[str]:
+    return action.id if isinstance(action, ScheduledActionBase) else None
+
+
+def _get_action_dependency(action: Action) -> Optional[str]:
+    return action.dependency if isinstance(action, ScheduledActionBase) else None
 
 
 class ActionScheduler:
@@ -23,41 +92,191 @@ class ActionScheduler:
         if hasattr(self, "_initialized") and self._initialized:
             return
         self.action_queue: Deque[Action] = deque()
+        # 队列中带 id 的动作, 用于估算依赖动作的完成时间
+        self._queued_by_id: Dict[str, Action] = {}
+        # 最近一次执行前的动画合并结果
+        self.last_coalesce_report: CoalesceReport = CoalesceReport()
+        self.metrics = SchedulerMetrics()
         self.handlers: dict[str, ActionHandler] = {
             "say": SayHandler(),
             "animation": AnimationHandler(),
+            "animation_track": AnimationTrackHandler(),
+            "animation_keyframes": AnimationKeyframesHandler(),
+            "baked_animation": BakedAnimationHandler(),
             "expression": ExpressionHandler(),
             "sound_play": SoundPlayHandler(),
         }
         self._initialized = True
 
-    def _get_action_completion_time(self, action: Action) -> float:
-        """计算单个动作的完成时间（包括延迟）"""
-        # 这个方法现在变得不那么准确了，因为它不再直接访问 audio_player
-        # 暂时保留，但可以考虑在未来移除或重构
-        delay = getattr(action.data, "delay", 0.0)
-        duration = 0.0
+    def _get_action_duration(self, action: Action) -> float:
+        """估算单个动作自身的持续时间（不含延迟）"""
         action_type = action.type
 
         if action_type == "animation":
             anim_action = cast(Animation, action)
-            duration = anim_action.data.duration
-        elif action_type == "expression":
+            return anim_action.data.duration
+        if action_type == "animation_track":
+            track_action = cast(AnimationTrack, action)
+            return max(segment.offset + segment.duration for segment in track_action.data.segments)
+        if action_type == "animation_keyframes":
+            keyframes_action = cast(AnimationKeyframes, action)
+            return keyframes_action.data.keyframes[-1].time * keyframes_action.data.repeat
+        if action_type == "baked_animation":
+            baked_action = cast(PlayBakedAnimation, action)
+            return baked_action.data.duration
+        if action_type == "expression":
             expression_action = cast(Expression, action)
-            if expression_action.data.duration > 0:
-                duration = expression_action.data.duration
-        elif action_type == "sound_play":
-            # 无法直接获取时长，返回0
-            duration = 0.0
+            return max(expression_action.data.duration, 0.0)
+        if action_type == "say":
+            # 仅用于推算 after 依赖, 按字幕播放速率粗略估计
+            say_action = cast(Say, action)
+            return len(say_action.data.text) / say_action.data.speed if say_action.data.speed > 0 else 0.0
+        # sound_play 无法直接获取时长
+        return 0.0
+
+    def _get_action_start_time(self, action: Action, visiting: Optional[Set[str]] = None) -> float:
+        """估算动作的开始时间, 沿 after/with 依赖链向上累加"""
+        delay = getattr(action.data, "delay", 0.0)
+        dependency_id = _get_action_dependency(action)
+        if dependency_id is None:
+            return delay
 
-        return delay + duration
+        dependency = self._queued_by_id.get(dependency_id)
+        visiting = visiting if visiting is not None else set()
+        if dependency is None or dependency_id in visiting:
+            # 依赖尚未入队或存在环, 无法继续推算
+            return delay
+        visiting.add(dependency_id)
 
-    def add_action(self, action: Action) -> float:
-        """添加动作到队列并返回其预估完成时间"""
+        dependency_start = self._get_action_start_time(dependency, visiting)
+        if isinstance(action, ScheduledActionBase) and action.after is not None:
+            return dependency_start + self._get_action_duration(dependency) + delay
+        return dependency_start + delay
+
+    def _get_action_completion_time(self, action: Action) -> float:
+        """计算单个动作的完成时间（包括延迟与依赖）"""
+        # 这个方法现在变得不那么准确了，因为它不再直接访问 audio_player
+        # 暂时保留，但可以考虑在未来移除或重构
+        if action.type == "say" and _get_action_dependency(action) is None:
+            return 0.0
+        return self._get_action_start_time(action) + self._get_action_duration(action)
+
+    def _enqueue(self, action: Action):
         self.action_queue.append(action)
+        action_id = _get_action_id(action)
+        if action_id is not None:
+            if action_id in self._queued_by_id:
+                logger.warning(f"动作 id '{action_id}' 重复, 依赖将指向最先加入的动作.")
+            else:
+                self._queued_by_id[action_id] = action
+
+    def _reindex_queue(self):
+        self._queued_by_id.clear()
+        for action in self.action_queue:
+            action_id = _get_action_id(action)
+            if action_id is not None and action_id not in self._queued_by_id:
+                self._queued_by_id[action_id] = action
+
+    def _make_room(self, incoming: int):
+        """按溢出策略为即将加入的动作腾出空间, 策略为拒绝时抛出 ActionQueueFullError"""
+        max_length = config.SCHEDULER.MAX_QUEUE_LENGTH
+        if len(self.action_queue) + incoming <= max_length:
+            return
+
+        policy = config.SCHEDULER.OVERFLOW_POLICY
+        if policy == "merge":
+            coalesced, report = coalesce_animations(list(self.action_queue))
+            if report.changed:
+                self.metrics.merged += len(self.action_queue) - len(coalesced)
+                self.action_queue = deque(coalesced)
+                self._reindex_queue()
+                logger.debug(f"动作队列已满, 尝试合并: {report.summary()}")
+            if len(self.action_queue) + incoming <= max_length:
+                return
+
+        if policy in ("reject", "merge"):
+            self.metrics.rejected += incoming
+            raise ActionQueueFullError(len(self.action_queue), incoming)
+
+    def _trim_queue(self):
+        """drop_oldest 策略下丢弃超出上限的最早动作"""
+        max_length = config.SCHEDULER.MAX_QUEUE_LENGTH
+        dropped = 0
+        while len(self.action_queue) > max_length:
+            self.action_queue.popleft()
+            dropped += 1
+        if dropped:
+            self._reindex_queue()
+            self.metrics.dropped += dropped
+            logger.warning(f"动作队列已满, 丢弃了最早的 {dropped} 个动作.")
+
+    def _admit(self, actions: List[Action]):
+        self._make_room(len(actions))
+        for action in actions:
+            self._enqueue(action)
+        self._trim_queue()
+        self.metrics.accepted += len(actions)
+        self.metrics.peak_queue_length = max(self.metrics.peak_queue_length, len(self.action_queue))
+
+    def add_action(self, action: Action) -> float:
+        """添加动作到队列并返回其预估完成时间, 队列已满且策略为拒绝时抛出 ActionQueueFullError"""
+        self._admit([action])
         logger.debug(f"动作已添加到队列: {action.type}. 队列大小: {len(self.action_queue)}")
         return self._get_action_completion_time(action)
 
+    def add_actions(self, actions: Iterable[Action]) -> float:
+        """批量添加动作到队列, 返回其中最晚的预估完成时间 (不含 say 动作)
+
+        批量添加是原子的: 策略为拒绝时, 放不下整批动作则一个都不添加。
+        """
+        added = list(actions)
+        self._admit(added)
+        logger.debug(f"批量添加了 {len(added)} 个动作到队列. 队列大小: {len(self.action_queue)}")
+
+        max_completion_time = 0.0
+        for action in added:
+            if action.type != "say":
+                max_completion_time = max(max_completion_time, self._get_action_completion_time(action))
+        return max_completion_time
+
+    def get_metrics(self) -> SchedulerMetrics:
+        """返回调度器统计的快照"""
+        return replace(self.metrics)
+
+    def _build_nodes(self, actions: List[Action]) -> List[ActionNode]:
+        """为一次执行构建动作节点并解析 after/with 依赖, 存在依赖环时抛出 ValueError"""
+        nodes = [ActionNode(action=action) for action in actions]
+        nodes_by_id: Dict[str, ActionNode] = {}
+        for node in nodes:
+            action_id = _get_action_id(node.action)
+            if action_id is not None and action_id not in nodes_by_id:
+                nodes_by_id[action_id] = node
+
+        for node in nodes:
+            action = node.action
+            if not isinstance(action, ScheduledActionBase) or action.dependency is None:
+                continue
+            dependency = nodes_by_id.get(action.dependency)
+            if dependency is None:
+                logger.warning(f"动作 {action.type} 依赖的 id '{action.dependency}' 不在本次执行的队列中, 忽略该依赖.")
+                continue
+            if action.after is not None:
+                node.after = dependency
+            else:
+                node.with_ = dependency
+
+        # 沿依赖链检测环
+        for node in nodes:
+            seen: Set[int] = set()
+            current: Optional[ActionNode] = node
+            while current is not None:
+                if id(current) in seen:
+                    raise ValueError(f"动作依赖存在环, 涉及动作 id '{_get_action_id(current.action)}'")
+                seen.add(id(current))
+                current = current.after or current.with_
+
+        return nodes
+
     async def execute_queue(self, loop: int = 0):
         """执行动作队列，可选循环"""
         logger.info(f"执行动作队列, 动作数量: {len(self.action_queue)}, 循环次数: {loop}.")
@@ -66,6 +285,13 @@ class ActionScheduler:
 
         actions_to_run = list(self.action_queue)
         self.action_queue.clear()
+        self._queued_by_id.clear()
+
+        actions_to_run, self.last_coalesce_report = coalesce_animations(actions_to_run)
+        if self.last_coalesce_report.changed:
+            logger.info(f"动作队列预处理: {self.last_coalesce_report.summary()}")
+            for detail in self.last_coalesce_report.details:
+                logger.debug(detail)
 
         say_action_with_tts_exists = any(action.type == "say" and cast(Say, action).data.tts_text for action in actions_to_run)
         tts_start_event = asyncio.Event() if say_action_with_tts_exists else None
@@ -76,10 +302,21 @@ class ActionScheduler:
             if tts_start_event:
                 tts_start_event.clear()
 
+            try:
+                nodes = self._build_nodes(actions_to_run)
+            except ValueError as e:
+                logger.error(f"动作队列无法执行: {e}")
+                break
+
             tasks = []
+            concurrency = asyncio.Semaphore(config.SCHEDULER.MAX_CONCURRENT_ACTIONS)
+            spawn_batch_size = config.SCHEDULER.SPAWN_BATCH_SIZE
             try:
-                for action in actions_to_run:
-                    tasks.append(asyncio.create_task(self._execute_action(action, tts_start_event)))
+                for index, node in enumerate(nodes, start=1):
+                    tasks.append(asyncio.create_task(self._execute_action(node, concurrency, tts_start_event)))
+                    # 大量动作时分批创建任务, 避免单次事件循环迭代过长
+                    if index % spawn_batch_size == 0:
+                        await asyncio.sleep(0)
 
                 if tasks:
                     await asyncio.gather(*tasks)
@@ -97,28 +334,48 @@ class ActionScheduler:
 
         logger.debug("动作队列执行完成")
 
-    async def _execute_action(self, action: Action, tts_start_event: Optional[asyncio.Event] = None):
-        """执行单个动作，延迟执行并委托给对应的处理器"""
-        delay = getattr(action.data, "delay", 0.0)
-        if delay > 0:
-            await asyncio.sleep(delay)
+    async def _execute_action(
+        self,
+        node: ActionNode,
+        concurrency: asyncio.Semaphore,
+        tts_start_event: Optional[asyncio.Event] = None,
+    ):
+        """执行单个动作: 等待依赖, 延迟执行并委托给对应的处理器"""
+        action = node.action
+        try:
+            await node.wait_dependency()
 
-        logger.debug(f"执行动作: {action.type} (延迟 {delay}s)，委托给处理器...")
+            delay = getattr(action.data, "delay", 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay)
 
-        handler = self.handlers.get(action.type)
-        if handler:
-            try:
-                # 统一调用签名，传递 tts_start_event
-                await handler.handle(action, tts_start_event=tts_start_event)
-            except Exception as e:
-                logger.error(f"执行动作 {action.type} 时处理器发生错误: {e}", exc_info=True)
-                raise  # Re-raise the exception to be caught by execute_queue
-        else:
-            logger.warning(f"没有找到可以处理动作类型 '{action.type}' 的处理器。")
+            logger.debug(f"执行动作: {action.type} (延迟 {delay}s)，委托给处理器...")
+
+            handler = self.handlers.get(action.type)
+            if handler:
+                # say 动作可能在处理器内等待 TTS 开始, 不计入并发上限以免占满名额造成死锁
+                async with contextlib.nullcontext() if action.type == "say" else concurrency:
+                    self.metrics.running += 1
+                    self.metrics.peak_running = max(self.metrics.peak_running, self.metrics.running)
+                    try:
+                        # 统一调用签名，传递 tts_start_event 与本动作的开始事件
+                        await handler.handle(action, tts_start_event=tts_start_event, started_event=node.started)
+                    except Exception as e:
+                        logger.error(f"执行动作 {action.type} 时处理器发生错误: {e}", exc_info=True)
+                        raise  # Re-raise the exception to be caught by execute_queue
+                    finally:
+                        self.metrics.running -= 1
+            else:
+                logger.warning(f"没有找到可以处理动作类型 '{action.type}' 的处理器。")
+        finally:
+            # 无论成功与否都释放依赖于本动作的其他动作, 避免其永久等待
+            node.started.set()
+            node.finished.set()
 
     def clear_queue(self):
         """清空动作队列"""
         self.action_queue.clear()
+        self._queued_by_id.clear()
         logger.info("动作队列已清空")
 
 
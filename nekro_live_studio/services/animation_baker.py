@@ -0,0 +1,309 @@
+import hashlib
+import json
+import math
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..schemas.actions import AnimationData, AnimationKeyframesData
+from ..utils.easing import resolve_easing
+from .animation_compiler import CompiledTemplate, ResolvedActionData
+from .tweener import Keyframe, sample_keyframes
+
+# 与 Tweener 默认帧率一致
+BAKE_FPS = 60
+BAKED_SUFFIX = ".baked.npz"
+BAKE_FORMAT_VERSION = 1
+# 判定起始值系数已衰减为 0 的阈值
+GAIN_EPSILON = 1e-6
+
+
+@dataclass
+class BakedCurve:
+    """
+    单个参数的烘焙曲线。
+
+    曲线对运行时的参数起始值 v0 是仿射的: 第 i 帧的值为 offset[i] + gain[i] * v0。
+    gain 只保存开头不为 0 的部分, 之后的帧与起始值无关。
+    """
+
+    parameter: str
+    start_frame: int
+    offset: np.ndarray
+    gain: np.ndarray
+
+    @property
+    def end_frame(self) -> int:
+        """曲线最后一帧之后的帧序号"""
+        return self.start_frame + len(self.offset)
+
+    def value(self, frame: int, start_value: float) -> float:
+        index = frame - self.start_frame
+        if index < len(self.gain):
+            return float(self.offset[index] + self.gain[index] * start_value)
+        return float(self.offset[index])
+
+
+@dataclass
+class BakedVariant:
+    """模板一次解析结果的烘焙数据"""
+
+    curves: List[BakedCurve]
+
+    @property
+    def frame_count(self) -> int:
+        return max((curve.end_frame for curve in self.curves), default=0)
+
+
+@dataclass
+class BakedAnimation:
+    """一个动画模板的全部烘焙变体"""
+
+    name: str
+    fps: int
+    # 烘焙时使用的参数 (含默认值), 只有参数一致的调用才能使用烘焙数据
+    param_key: Tuple[Any, ...]
+    source_digest: str
+    variants: List[BakedVariant]
+
+    def duration(self, variant: int) -> float:
+        return self.variants[variant].frame_count / self.fps
+
+    def pick_variant(self) -> int:
+        return random.randrange(len(self.variants))
+
+
+def baked_path(source: Path) -> Path:
+    """模板文件对应的烘焙文件, 与 .jsonc 放在同一目录"""
+    return source.with_name(source.stem + BAKED_SUFFIX)
+
+
+def source_digest(content: bytes) -> str:
+    return hashlib.sha1(content).hexdigest()
+
+
+def _start_frame(time: float, fps: int) -> int:
+    return max(0, round(time * fps))
+
+
+def _end_frame(time: float, fps: int) -> int:
+    return max(0, math.ceil(time * fps - 1e-9))
+
+
+def _occupied_until(action_data: ResolvedActionData) -> float:
+    # 与 Tweener 一致: 起止值相同或时长为 0 的缓动即时完成
+    if isinstance(action_data, AnimationKeyframesData):
+        return action_data.delay + action_data.keyframes[-1].time * action_data.repeat
+    if action_data.duration <= 0 or (action_data.from_value is not None and action_data.from_value == action_data.target):
+        return action_data.delay
+    return action_data.delay + action_data.duration
+
+
+def _segment_function(action_data: ResolvedActionData) -> Tuple[Callable[[float, float], float], float]:
+    """返回 (起始值, 相对时间) -> 值 的函数与该段的最终值"""
+    if isinstance(action_data, AnimationKeyframesData):
+        keyframes = [
+            Keyframe(time=keyframe.time, value=keyframe.value, easing_func=resolve_easing(keyframe.easing))
+            for keyframe in action_data.keyframes
+        ]
+        times = [keyframe.time for keyframe in keyframes]
+        cycle = keyframes[-1].time
+        repeat = action_data.repeat
+        last_value = keyframes[-1].value
+
+        def sample(start: float, t: float) -> float:
+            if cycle <= 0:
+                return last_value
+            cycle_index = min(int(t // cycle), repeat - 1)
+            return sample_keyframes(keyframes, times, start if cycle_index == 0 else last_value, t - cycle_index * cycle)
+
+        return sample, last_value
+
+    easing_func = resolve_easing(action_data.easing)
+    target = action_data.target
+    duration = action_data.duration
+
+    def tween(start: float, t: float) -> float:
+        if duration <= 0:
+            return target
+        return start + (target - start) * easing_func(min(max(t / duration, 0.0), 1.0))
+
+    return tween, target
+
+
+def _bake_parameter(parameter: str, actions: Sequence[ResolvedActionData], fps: int) -> Optional[BakedCurve]:
+    """按 Tweener 的优先级语义把同一参数上的动作展开为逐帧曲线"""
+    accepted: List[ResolvedActionData] = []
+    for action_data in sorted(actions, key=lambda item: item.delay):
+        if accepted:
+            last = accepted[-1]
+            if action_data.delay < _occupied_until(last) - 1e-6 and max(action_data.priority, 1) <= max(last.priority, 1):
+                # 运行时会被拒绝
+                continue
+        accepted.append(action_data)
+    if not accepted:
+        return None
+
+    start_frame = _start_frame(accepted[0].delay, fps)
+    end_frame = max(_end_frame(_occupied_until(action_data), fps) for action_data in accepted)
+    frame_count = end_frame - start_frame + 1
+    offset = np.empty(frame_count, dtype=np.float64)
+    gain = np.empty(frame_count, dtype=np.float64)
+
+    # 当前值 = a + b * v0
+    a, b = 0.0, 1.0
+    cursor = start_frame
+    for index, action_data in enumerate(accepted):
+        seg_start = _start_frame(action_data.delay, fps)
+        offset[cursor - start_frame : seg_start - start_frame] = a
+        gain[cursor - start_frame : seg_start - start_frame] = b
+
+        seg_end = _end_frame(_occupied_until(action_data), fps)
+        if index + 1 < len(accepted):
+            # 被更高优先级的动作打断
+            seg_end = min(seg_end, _start_frame(accepted[index + 1].delay, fps) - 1)
+
+        if isinstance(action_data, AnimationData) and action_data.from_value is not None:
+            a, b = action_data.from_value, 0.0
+        func, final_value = _segment_function(action_data)
+        for frame in range(seg_start, seg_end + 1):
+            t = frame / fps - action_data.delay
+            f0 = func(0.0, t)
+            k = func(1.0, t) - f0
+            offset[frame - start_frame] = f0 + k * a
+            gain[frame - start_frame] = k * b
+
+        if seg_end >= _end_frame(_occupied_until(action_data), fps):
+            a, b = final_value, 0.0
+        elif seg_end >= seg_start:
+            a, b = float(offset[seg_end - start_frame]), float(gain[seg_end - start_frame])
+        cursor = max(cursor, seg_end + 1)
+
+    offset[cursor - start_frame :] = a
+    gain[cursor - start_frame :] = b
+
+    nonzero = np.flatnonzero(np.abs(gain) > GAIN_EPSILON)
+    gain_length = int(nonzero[-1]) + 1 if len(nonzero) else 0
+    return BakedCurve(
+        parameter=parameter,
+        start_frame=start_frame,
+        offset=offset.astype(np.float32),
+        gain=gain[:gain_length].astype(np.float32),
+    )
+
+
+def bake_actions(actions: Sequence[ResolvedActionData], fps: int = BAKE_FPS) -> BakedVariant:
+    """将一次模板解析结果采样为各参数的逐帧曲线"""
+    by_parameter: Dict[str, List[ResolvedActionData]] = {}
+    for action_data in actions:
+        by_parameter.setdefault(action_data.parameter, []).append(action_data)
+    curves = [_bake_parameter(parameter, items, fps) for parameter, items in by_parameter.items()]
+    return BakedVariant(curves=[curve for curve in curves if curve is not None])
+
+
+def bake_template(compiled: CompiledTemplate, content: bytes, variants: int = 8, fps: int = BAKE_FPS) -> BakedAnimation:
+    """
+    使用默认参数烘焙模板。含随机值的模板烘焙 variants 个变体, 不含随机值的模板只烘焙一个。
+
+    Raises:
+        ValueError: 模板存在没有默认值的参数
+    """
+    count = max(1, variants) if not compiled.deterministic else 1
+    return BakedAnimation(
+        name=compiled.name,
+        fps=fps,
+        param_key=compiled.param_key(),
+        source_digest=source_digest(content),
+        variants=[bake_actions(compiled.resolve(), fps) for _ in range(count)],
+    )
+
+
+def save_baked(path: Path, baked: BakedAnimation):
+    arrays: Dict[str, np.ndarray] = {}
+    variants_manifest = []
+    for variant_index, variant in enumerate(baked.variants):
+        curves_manifest = []
+        for curve_index, curve in enumerate(variant.curves):
+            prefix = f"v{variant_index}_c{curve_index}"
+            arrays[f"{prefix}_offset"] = curve.offset
+            arrays[f"{prefix}_gain"] = curve.gain
+            curves_manifest.append({"parameter": curve.parameter, "start_frame": curve.start_frame, "key": prefix})
+        variants_manifest.append(curves_manifest)
+
+    manifest = {
+        "version": BAKE_FORMAT_VERSION,
+        "name": baked.name,
+        "fps": baked.fps,
+        "param_key": list(baked.param_key),
+        "source_digest": baked.source_digest,
+        "variants": variants_manifest,
+    }
+    with path.open("wb") as f:
+        np.savez_compressed(f, manifest=np.array(json.dumps(manifest, ensure_ascii=False)), **arrays)
+
+
+def load_baked(path: Path) -> BakedAnimation:
+    """
+    读取烘焙文件。
+
+    Raises:
+        ValueError: 文件格式不正确或版本不兼容
+    """
+    with np.load(path, allow_pickle=False) as data:
+        try:
+            manifest = json.loads(str(data["manifest"]))
+        except (KeyError, json.JSONDecodeError) as e:
+            raise ValueError(f"烘焙文件缺少有效的 manifest: {e}") from e
+        if manifest.get("version") != BAKE_FORMAT_VERSION:
+            raise ValueError(f"不支持的烘焙文件版本: {manifest.get('version')}")
+        variants = [
+            BakedVariant(
+                curves=[
+                    BakedCurve(
+                        parameter=curve["parameter"],
+                        start_frame=curve["start_frame"],
+                        offset=data[f"{curve['key']}_offset"],
+                        gain=data[f"{curve['key']}_gain"],
+                    )
+                    for curve in curves
+                ],
+            )
+            for curves in manifest["variants"]
+        ]
+    if not variants:
+        raise ValueError("烘焙文件不包含任何变体")
+    return BakedAnimation(
+        name=manifest["name"],
+        fps=manifest["fps"],
+        param_key=tuple(manifest["param_key"]),
+        source_digest=manifest["source_digest"],
+        variants=variants,
+    )
+
+
+class BakedAnimationStore:
+    """已加载的烘焙动画, 由 AnimationPlayer 维护, 供播放时按名称查找"""
+
+    def __init__(self):
+        self._animations: Dict[str, BakedAnimation] = {}
+
+    def get(self, name: str) -> Optional[BakedAnimation]:
+        return self._animations.get(name)
+
+    def put(self, baked: BakedAnimation):
+        self._animations[baked.name] = baked
+
+    def pop(self, name: str):
+        self._animations.pop(name, None)
+
+    def clear(self):
+        self._animations.clear()
+
+    def __len__(self) -> int:
+        return len(self._animations)
+
+
+baked_animation_store = BakedAnimationStore()
@@ -0,0 +1,348 @@
+import ast
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from simpleeval import DEFAULT_FUNCTIONS, SimpleEval
+
+from ..schemas.actions import AnimationData, AnimationKeyframesData, KeyframeData
+from ..schemas.preformed_animation import (
+    ActionTemplate,
+    AnimationTemplate,
+    Expression,
+    KeyframeTrackTemplate,
+    ParamDef,
+    RandomFloat,
+    RandomInt,
+)
+
+Value = Union[float, int, str]
+TemplateValue = Union[float, int, str, Expression, RandomFloat, RandomInt]
+ValueFn = Callable[[Dict[str, Any]], Value]
+
+# simpleeval 内置函数中会产生随机数的函数
+RANDOM_FUNCTIONS = {"rand", "randint"}
+
+
+class TemplateCompileError(ValueError):
+    """动画模板无法编译 (表达式语法错误、引用未定义名称或变量循环依赖等)"""
+
+
+@dataclass
+class CompiledAction:
+    """预编译的单个动作, 各字段均为 context -> 值 的求值函数"""
+
+    parameter: str
+    easing: str
+    to: ValueFn
+    duration: ValueFn
+    delay: ValueFn
+    from_value: Optional[ValueFn] = None
+
+    def resolve(self, context: Dict[str, Any], global_delay: float = 0.0) -> AnimationData:
+        from_value = self.from_value(context) if self.from_value is not None else None
+        return AnimationData(
+            parameter=self.parameter,
+            from_value=float(from_value) if from_value is not None else None,
+            target=float(self.to(context)),
+            duration=float(self.duration(context)),
+            delay=float(self.delay(context)) + global_delay,
+            easing=self.easing,
+            priority=3,
+        )
+
+
+@dataclass
+class CompiledKeyframe:
+    time: ValueFn
+    value: ValueFn
+    easing: str
+
+
+@dataclass
+class CompiledKeyframeTrack:
+    """预编译的关键帧轨道, 解析后仍是单个动作, 重复次数由播放时处理"""
+
+    parameter: str
+    keyframes: List[CompiledKeyframe]
+    repeat: ValueFn
+    delay: ValueFn
+
+    def resolve(self, context: Dict[str, Any], global_delay: float = 0.0) -> AnimationKeyframesData:
+        return AnimationKeyframesData(
+            parameter=self.parameter,
+            keyframes=[
+                KeyframeData(time=float(keyframe.time(context)), value=float(keyframe.value(context)), easing=keyframe.easing)
+                for keyframe in self.keyframes
+            ],
+            repeat=int(self.repeat(context)),
+            delay=float(self.delay(context)) + global_delay,
+            priority=3,
+        )
+
+
+ResolvedActionData = Union[AnimationData, AnimationKeyframesData]
+
+
+def _coerce_param(param_def: ParamDef, value: Any) -> Value:
+    """按参数声明的类型校验并转换外部参数, 数字参数也接受数字字符串, 类型不符时抛出 ValueError"""
+    if param_def.type == "str":
+        if isinstance(value, str):
+            return value
+        raise ValueError(f"参数 '{param_def.name}' 应为字符串, 实际为 {value!r}")
+    try:
+        # bool 是 int 的子类, 但不应作为数字参数
+        number = float(value) if not isinstance(value, bool) else math.nan
+    except (TypeError, ValueError):
+        number = math.nan
+    if math.isnan(number):
+        raise ValueError(f"参数 '{param_def.name}' 应为数字, 实际为 {value!r}")
+    if param_def.type == "float":
+        return number
+    if not number.is_integer():
+        raise ValueError(f"参数 '{param_def.name}' 应为整数, 实际为 {value!r}")
+    return int(number)
+
+
+@dataclass
+class CompiledTemplate:
+    """预编译的动画模板: 调用时只需绑定参数、抽取随机值并求值"""
+
+    template: AnimationTemplate
+    # 按依赖顺序排列的内部变量
+    variables: List[Tuple[str, ValueFn]]
+    actions: List[Union[CompiledAction, CompiledKeyframeTrack]]
+    # 不含任何随机值, 相同参数总是得到相同结果
+    deterministic: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+    def bind_params(self, user_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """按参数声明填充外部参数 (含默认值), 缺少必需参数时抛出 ValueError"""
+        context: Dict[str, Any] = {}
+        user_params = user_params or {}
+
+        for param_def in self.template.data.params:
+            if param_def.name in user_params:
+                context[param_def.name] = _coerce_param(param_def, user_params[param_def.name])
+            elif param_def.default is not None:
+                context[param_def.name] = param_def.default
+            else:
+                raise ValueError(f"缺少必需的参数: '{param_def.name}'")
+        return context
+
+    def param_key(self, user_params: Optional[Dict[str, Any]] = None) -> Tuple[Any, ...]:
+        """填充默认值后的参数元组, 可作为确定性模板的缓存键"""
+        return tuple(self.bind_params(user_params).values())
+
+    def bind(self, user_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """绑定外部参数并按依赖顺序计算内部变量, 缺少必需参数时抛出 ValueError"""
+        context = self.bind_params(user_params)
+
+        # 按依赖顺序计算内部变量
+        for var_name, evaluate in self.variables:
+            context[var_name] = evaluate(context)
+
+        return context
+
+    def resolve(
+        self,
+        user_params: Optional[Dict[str, Any]] = None,
+        global_delay: float = 0.0,
+    ) -> List[ResolvedActionData]:
+        """将模板解析为具体的动画数据"""
+        context = self.bind(user_params)
+        return [action.resolve(context, global_delay) for action in self.actions]
+
+
+def _referenced_names(node: ast.AST) -> Set[str]:
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+
+
+class _ExpressionCompiler:
+    """将模板中的值编译为求值函数, 表达式只解析一次"""
+
+    def __init__(self, template_name: str):
+        self.template_name = template_name
+        # 同一模板内共享一个求值器, 求值前替换 names
+        self._evaluator = SimpleEval()
+        # 编译过的值中是否出现随机值或 rand/randint 调用
+        self.uses_randomness = False
+
+    def parse(self, expr: str) -> ast.AST:
+        try:
+            return SimpleEval.parse(expr)
+        except SyntaxError as e:
+            raise TemplateCompileError(f"模板 '{self.template_name}' 表达式语法错误 '{expr}': {e.msg}") from e
+
+    def compile(self, value: TemplateValue) -> Tuple[ValueFn, Set[str]]:
+        """返回求值函数及其引用的名称"""
+        if isinstance(value, (float, int, str)):
+            constant = value
+            return (lambda _context: constant), set()
+        if isinstance(value, (RandomFloat, RandomInt)):
+            self.uses_randomness = True
+        if isinstance(value, RandomFloat):
+            min_float, max_float = value.random_float
+            return (lambda _context: random.uniform(min_float, max_float)), set()
+        if isinstance(value, RandomInt):
+            min_int, max_int = value.random_int
+            return (lambda _context: random.randint(min_int, max_int)), set()
+        if isinstance(value, Expression):
+            return self._compile_expression(value.expr)
+        raise TemplateCompileError(f"不支持的值类型: {type(value)}")
+
+    def _compile_expression(self, expr: str) -> Tuple[ValueFn, Set[str]]:
+        node = self.parse(expr)
+        names = _referenced_names(node) - set(DEFAULT_FUNCTIONS)
+        if any(
+            isinstance(child, ast.Call) and isinstance(child.func, ast.Name) and child.func.id in RANDOM_FUNCTIONS
+            for child in ast.walk(node)
+        ):
+            self.uses_randomness = True
+
+        # 常见的简单形式走快速路径, 不经过求值器
+        body = node.value if isinstance(node, ast.Expr) else node
+        if isinstance(body, ast.Constant) and isinstance(body.value, (int, float)) and not isinstance(body.value, bool):
+            constant = body.value
+            return (lambda _context: constant), set()
+        if isinstance(body, ast.Name) and body.id not in DEFAULT_FUNCTIONS:
+            name = body.id
+            return (lambda context: context[name]), names
+
+        evaluator = self._evaluator
+
+        def evaluate(context: Dict[str, Any]) -> Value:
+            evaluator.names = context
+            return evaluator.eval(expr, previously_parsed=node)
+
+        return evaluate, names
+
+
+def _order_variables(
+    template_name: str,
+    compiled: Dict[str, Tuple[ValueFn, Set[str]]],
+    param_names: Set[str],
+) -> List[Tuple[str, ValueFn]]:
+    """按依赖关系对内部变量做拓扑排序, 检查未定义名称与循环依赖"""
+    ordered: List[Tuple[str, ValueFn]] = []
+    state: Dict[str, int] = {}  # 1: 访问中, 2: 已完成
+
+    def visit(var_name: str, chain: List[str]):
+        if state.get(var_name) == 2:
+            return
+        if state.get(var_name) == 1:
+            cycle = " -> ".join([*chain, var_name])
+            raise TemplateCompileError(f"模板 '{template_name}' 的变量存在循环依赖: {cycle}")
+        state[var_name] = 1
+        evaluate, names = compiled[var_name]
+        for name in sorted(names):
+            if name in compiled and name not in param_names:
+                visit(name, [*chain, var_name])
+            elif name not in param_names:
+                raise TemplateCompileError(f"模板 '{template_name}' 的变量 '{var_name}' 引用了未定义的名称 '{name}'")
+        state[var_name] = 2
+        ordered.append((var_name, evaluate))
+
+    for var_name in compiled:
+        visit(var_name, [])
+    return ordered
+
+
+def _compile_field(
+    compiler: _ExpressionCompiler,
+    value: TemplateValue,
+    known_names: Set[str],
+    location: str,
+) -> ValueFn:
+    evaluate, names = compiler.compile(value)
+    undefined = names - known_names
+    if undefined:
+        raise TemplateCompileError(
+            f"模板 '{compiler.template_name}' {location}引用了未定义的名称: {', '.join(sorted(undefined))}",
+        )
+    return evaluate
+
+
+def _compile_keyframe_track(
+    compiler: _ExpressionCompiler,
+    track_template: KeyframeTrackTemplate,
+    known_names: Set[str],
+    index: int,
+) -> CompiledKeyframeTrack:
+    location = f"第 {index + 1} 个动作"
+    return CompiledKeyframeTrack(
+        parameter=track_template.parameter,
+        keyframes=[
+            CompiledKeyframe(
+                time=_compile_field(compiler, keyframe.time, known_names, f"{location}第 {i + 1} 个关键帧的 time "),
+                value=_compile_field(compiler, keyframe.value, known_names, f"{location}第 {i + 1} 个关键帧的 value "),
+                easing=keyframe.easing,
+            )
+            for i, keyframe in enumerate(track_template.keyframes)
+        ],
+        repeat=_compile_field(compiler, track_template.repeat, known_names, f"{location}的 repeat "),
+        delay=_compile_field(compiler, track_template.delay, known_names, f"{location}的 delay "),
+    )
+
+
+def _compile_action(
+    compiler: _ExpressionCompiler,
+    action_template: Union[ActionTemplate, KeyframeTrackTemplate],
+    known_names: Set[str],
+    index: int,
+) -> Union[CompiledAction, CompiledKeyframeTrack]:
+    if isinstance(action_template, KeyframeTrackTemplate):
+        return _compile_keyframe_track(compiler, action_template, known_names, index)
+
+    fields: Dict[str, ValueFn] = {}
+    for field_name in ("to", "duration", "delay", "from_value"):
+        value = getattr(action_template, field_name)
+        if value is None:
+            continue
+        fields[field_name] = _compile_field(
+            compiler,
+            value,
+            known_names,
+            f"第 {index + 1} 个动作的 {field_name} ",
+        )
+
+    return CompiledAction(
+        parameter=action_template.parameter,
+        easing=action_template.easing,
+        to=fields["to"],
+        duration=fields["duration"],
+        delay=fields["delay"],
+        from_value=fields.get("from_value"),
+    )
+
+
+def compile_template(template: AnimationTemplate) -> CompiledTemplate:
+    """
+    将动画模板编译为求值计划: 表达式预先解析, 内部变量按依赖排序。
+
+    Raises:
+        TemplateCompileError: 表达式语法错误、引用未定义名称或变量循环依赖
+    """
+    compiler = _ExpressionCompiler(template.name)
+    param_names = {param_def.name for param_def in template.data.params}
+
+    compiled_variables = {
+        var_name: compiler.compile(var_value) for var_name, var_value in template.data.variables.items()
+    }
+    variables = _order_variables(template.name, compiled_variables, param_names)
+
+    known_names = param_names | set(template.data.variables)
+    actions = [
+        _compile_action(compiler, action_template, known_names, index)
+        for index, action_template in enumerate(template.data.actions)
+    ]
+    return CompiledTemplate(
+        template=template,
+        variables=variables,
+        actions=actions,
+        deterministic=not compiler.uses_randomness,
+    )
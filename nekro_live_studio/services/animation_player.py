@@ -1,26 +1,48 @@
-import random
+import os
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple
 
 import json5
 from pydantic import ValidationError
-from simpleeval import SimpleEval
-
-from ..schemas.actions import Action, Animation, AnimationData
-from ..schemas.preformed_animation import (
-    ActionTemplate,
-    AnimationInfo,
-    AnimationTemplate,
-    Expression,
-    RandomFloat,
-    RandomInt,
+
+from ..schemas.actions import (
+    Action,
+    Animation,
+    AnimationKeyframes,
+    AnimationKeyframesData,
+    BakedAnimationData,
+    PlayBakedAnimation,
 )
+from ..schemas.preformed_animation import AnimationInfo, AnimationTemplate
 from ..services.action_scheduler import action_scheduler
+from ..utils.cache import CacheStats, LRUCache
 from ..utils.logger import logger
+from .animation_baker import (
+    BAKED_SUFFIX,
+    baked_animation_store,
+    baked_path,
+    load_baked,
+    source_digest,
+)
+from .animation_compiler import CompiledTemplate, ResolvedActionData, compile_template
 
 ANIMATIONS_DIR = Path("./data/resources/animations")
 ANIMATIONS_DIR.mkdir(parents=True, exist_ok=True)
 
+# 两次扫描动画目录之间的最小间隔(秒), 间隔内的查询直接使用内存中的模板
+SCAN_INTERVAL = 1.0
+# 确定性模板解析结果的缓存条目上限
+RESOLUTION_CACHE_SIZE = 256
+
+ResolutionKey = Tuple[str, Tuple[Any, ...], float]
+
+
+def _to_action(action_data: ResolvedActionData) -> Action:
+    if isinstance(action_data, AnimationKeyframesData):
+        return AnimationKeyframes(type="animation_keyframes", data=action_data)
+    return Animation(type="animation", data=action_data)
+
 
 class AnimationPlayer:
     _instance: Optional["AnimationPlayer"] = None
@@ -35,29 +57,139 @@ class AnimationPlayer:
             return
         self._initialized = True
         self._templates: Dict[str, AnimationTemplate] = {}
+        # 模板名称 -> 加载时编译好的求值计划
+        self._compiled: Dict[str, CompiledTemplate] = {}
+        # 模板名称 -> 当前生效的定义文件
+        self._template_sources: Dict[str, Path] = {}
+        # 文件 -> 其中定义的模板名称, 包括因重名而未生效的文件
+        self._file_templates: Dict[Path, str] = {}
+        # 文件 -> (mtime_ns, size, 烘焙文件 mtime_ns), 用于判断文件是否变化
+        self._file_states: Dict[Path, Tuple[int, int, int]] = {}
+        self._last_scan: float = 0.0
+        # (模板名称, 参数元组, 延迟) -> 解析好的动作, 仅缓存不含随机值的模板
+        self._resolution_cache: LRUCache[ResolutionKey, Tuple[Action, ...]] = LRUCache(
+            max_size=RESOLUTION_CACHE_SIZE,
+        )
         self.load_animations()
 
     def load_animations(self):
+        """丢弃缓存并重新加载所有动画模板"""
         self._templates.clear()
-        for file_path in ANIMATIONS_DIR.glob("*.jsonc"):
-            try:
-                with Path(file_path).open("r", encoding="utf-8") as f:
-                    data = json5.load(f)
-                template = AnimationTemplate.model_validate(data)
-                if template.name in self._templates:
-                    logger.warning(
-                        f"动画名称冲突: '{template.name}' 在多个文件中定义. 将使用 {file_path} 中的版本.",
-                    )
-                self._templates[template.name] = template
-            except (ValidationError, ValueError) as e:
-                logger.error(f"解析动画文件失败 {file_path.name}: {e}")
-            except Exception as e:
-                logger.error(f"加载动画文件时发生未知错误 {file_path.name}: {e}")
+        self._compiled.clear()
+        self._template_sources.clear()
+        self._file_templates.clear()
+        self._file_states.clear()
+        self._resolution_cache.clear()
+        baked_animation_store.clear()
+        self.refresh(force=True)
         logger.info(f"成功加载 {len(self._templates)} 个动画模板.")
 
+    def refresh(self, force: bool = False):
+        """
+        增量同步动画目录: 仅重新解析新增或修改过的文件, 移除已删除文件中的模板。
+
+        Args:
+            force: 忽略扫描间隔立即扫描
+        """
+        now = time.monotonic()
+        if not force and now - self._last_scan < SCAN_INTERVAL:
+            return
+        self._last_scan = now
+
+        current_states: Dict[Path, Tuple[int, int, int]] = {}
+        baked_mtimes: Dict[Path, int] = {}
+        try:
+            with os.scandir(ANIMATIONS_DIR) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    if entry.name.endswith(".jsonc"):
+                        stat = entry.stat()
+                        current_states[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size, 0)
+                    elif entry.name.endswith(BAKED_SUFFIX):
+                        baked_mtimes[Path(entry.path)] = entry.stat().st_mtime_ns
+        except OSError as e:
+            logger.error(f"扫描动画目录 {ANIMATIONS_DIR} 失败: {e}")
+            return
+        for file_path, (mtime_ns, size, _) in current_states.items():
+            current_states[file_path] = (mtime_ns, size, baked_mtimes.get(baked_path(file_path), 0))
+
+        initial_load = not self._file_states
+        for file_path in set(self._file_states) - set(current_states):
+            self._forget_file(file_path)
+            del self._file_states[file_path]
+            logger.info(f"动画文件已删除: {file_path.name}")
+
+        for file_path, state in sorted(current_states.items()):
+            if self._file_states.get(file_path) == state:
+                continue
+            is_new = file_path not in self._file_states
+            self._file_states[file_path] = state
+            self._forget_file(file_path)
+            if self._load_file(file_path) and not initial_load:
+                logger.info(f"动画文件已{'新增' if is_new else '更新'}: {file_path.name}")
+
+    def _forget_file(self, file_path: Path):
+        """移除由指定文件定义的模板, 若其他文件也定义了同名模板则改用其中的版本"""
+        name = self._file_templates.pop(file_path, None)
+        if name is None or self._template_sources.get(name) != file_path:
+            return
+        del self._templates[name]
+        del self._compiled[name]
+        del self._template_sources[name]
+        baked_animation_store.pop(name)
+        for key in [key for key in self._resolution_cache if key[0] == name]:
+            self._resolution_cache.pop(key)
+
+        # 与全量加载时一致, 按文件名顺序由最后一个定义者生效
+        for other in sorted((path for path, other_name in self._file_templates.items() if other_name == name), reverse=True):
+            if self._load_file(other):
+                logger.info(f"动画 '{name}' 改用 {other.name} 中的定义")
+                return
+
+    def _load_file(self, file_path: Path) -> bool:
+        try:
+            content = Path(file_path).read_bytes()
+            data = json5.loads(content.decode("utf-8"))
+            template = AnimationTemplate.model_validate(data)
+            compiled = compile_template(template)
+        except (ValidationError, ValueError) as e:
+            logger.error(f"解析动画文件失败 {file_path.name}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"加载动画文件时发生未知错误 {file_path.name}: {e}")
+            return False
+
+        if template.name in self._templates:
+            logger.warning(
+                f"动画名称冲突: '{template.name}' 在多个文件中定义. 将使用 {file_path} 中的版本.",
+            )
+        self._templates[template.name] = template
+        self._compiled[template.name] = compiled
+        self._template_sources[template.name] = file_path
+        self._file_templates[file_path] = template.name
+        self._load_baked(file_path, template.name, content)
+        return True
+
+    def _load_baked(self, file_path: Path, name: str, content: bytes):
+        """加载模板旁的烘焙文件, 烘焙后模板又被修改过时忽略并提示重新烘焙"""
+        path = baked_path(file_path)
+        if not path.exists():
+            return
+        try:
+            baked = load_baked(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"读取烘焙文件失败 {path.name}: {e}")
+            return
+        if baked.source_digest != source_digest(content) or baked.name != name:
+            logger.warning(f"烘焙文件 {path.name} 与模板不一致, 已忽略, 请重新烘焙")
+            return
+        baked_animation_store.put(baked)
+        logger.debug(f"已加载动画 '{name}' 的 {len(baked.variants)} 个烘焙变体")
+
     def list_preformed_animations(self) -> List[AnimationInfo]:
         """返回所有动画的摘要信息列表"""
-        self.load_animations()
+        self.refresh()
         return [
             AnimationInfo(name=t.name, description=t.data.description, params=t.data.params) for t in self._templates.values()
         ]
@@ -68,94 +200,73 @@ class AnimationPlayer:
         params: Optional[Dict[str, Any]] = None,
         delay: float = 0.0,
     ) -> float:
-        self.load_animations()
-        template = self._templates.get(name)
-        if not template:
+        self.refresh()
+        compiled = self._compiled.get(name)
+        if not compiled:
             logger.error(f"未找到名为 '{name}' 的动画模板.")
             return 0.0
 
-        max_completion_time = 0.0
         try:
-            context = self._prepare_context(template, params)
-
-            resolved_actions: List[Animation] = []
-            for action_template in template.data.actions:
-                final_action_data = self._resolve_action(
-                    action_template,
-                    context,
-                    global_delay=delay,
-                )
-                resolved_actions.append(Animation(type="animation", data=final_action_data))
-
-            for action in resolved_actions:
-                completion_time = action_scheduler.add_action(action)
-                if completion_time > max_completion_time:
-                    max_completion_time = completion_time
-
+            baked_action = self._baked_action(compiled, params, delay)
+            resolved_actions = (baked_action,) if baked_action else self._resolve(compiled, params, delay)
         except (ValueError, KeyError) as e:
             logger.error(f"执行动画 '{name}' 失败: {e}", exc_info=True)
             return 0.0
-        
-        return max_completion_time
-
-    def _prepare_context(self, template: AnimationTemplate, user_params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        context: Dict[str, Any] = {}
-        user_params = user_params or {}
-
-        # 1. 处理外部参数
-        for param_def in template.data.params:
-            if param_def.name in user_params:
-                # TODO: 添加类型校验
-                context[param_def.name] = user_params[param_def.name]
-            elif param_def.default is not None:
-                context[param_def.name] = param_def.default
-            else:
-                raise ValueError(f"缺少必需的参数: '{param_def.name}'")
-
-        # 2. 处理内部变量
-        for var_name, var_value in template.data.variables.items():
-            context[var_name] = self._evaluate_value(var_value, context)
-
-        return context
-
-    def _resolve_action(
-        self, action_template: ActionTemplate, context: Dict[str, Any], global_delay: float,
-    ) -> AnimationData:
-        target = self._evaluate_value(action_template.to, context)
-        duration = self._evaluate_value(action_template.duration, context)
-        action_delay = self._evaluate_value(action_template.delay, context)
-
-        from_value = None
-        if action_template.from_value is not None:
-            from_value = self._evaluate_value(action_template.from_value, context)
-
-        return AnimationData(
-            parameter=action_template.parameter,
-            from_value=float(from_value) if from_value is not None else None,
-            target=float(target),
-            duration=float(duration),
-            delay=float(action_delay) + global_delay,
-            easing=action_template.easing,
-            priority=3,
+
+        # 整个模板原子地入队, 队列放不下时一个动作都不添加
+        return action_scheduler.add_actions(resolved_actions)
+
+    def _baked_action(
+        self,
+        compiled: CompiledTemplate,
+        params: Optional[Dict[str, Any]],
+        delay: float,
+    ) -> Optional[PlayBakedAnimation]:
+        """模板有烘焙数据且参数与烘焙时一致时, 返回播放随机一个烘焙变体的动作"""
+        baked = baked_animation_store.get(compiled.name)
+        if baked is None or compiled.param_key(params) != baked.param_key:
+            return None
+        variant = baked.pick_variant()
+        return PlayBakedAnimation(
+            type="baked_animation",
+            data=BakedAnimationData(
+                name=compiled.name,
+                variant=variant,
+                duration=baked.duration(variant),
+                delay=delay,
+                priority=3,
+            ),
         )
 
-    def _evaluate_value(
+    def _resolve(
         self,
-        value: Union[float, str, Expression, RandomFloat, RandomInt],
-        context: Dict[str, Any],
-    ) -> Union[float, int, str]:
-        if isinstance(value, (float, int, str)):
-            return value
-        if isinstance(value, RandomFloat):
-            min_val, max_val = value.random_float
-            return random.uniform(min_val, max_val)
-        if isinstance(value, RandomInt):
-            min_val, max_val = value.random_int
-            return random.randint(min_val, max_val)
-        if isinstance(value, Expression):
-            evaluator = SimpleEval(names=context)
-            return evaluator.eval(value.expr)
-        raise TypeError(f"不支持的值类型: {type(value)}")
+        compiled: CompiledTemplate,
+        params: Optional[Dict[str, Any]],
+        delay: float,
+    ) -> Tuple[Action, ...]:
+        """解析模板, 不含随机值的模板按参数复用之前的解析结果"""
+        key: Optional[ResolutionKey] = None
+        if compiled.deterministic:
+            key = (compiled.name, compiled.param_key(params), delay)
+            try:
+                cached = self._resolution_cache.get(key)
+            except TypeError:
+                # 参数中含有不可哈希的值, 不走缓存
+                key = None
+            else:
+                if cached is not None:
+                    # 入队后的动作可能被调度器修改, 缓存中保留原件, 每次返回副本
+                    return tuple(action.model_copy(deep=True) for action in cached)
+
+        resolved = tuple(_to_action(action_data) for action_data in compiled.resolve(params, global_delay=delay))
+        if key is not None:
+            self._resolution_cache.put(key, tuple(action.model_copy(deep=True) for action in resolved))
+            logger.debug(f"缓存动画 '{compiled.name}' 的解析结果, 当前缓存 {len(self._resolution_cache)} 条")
+        return resolved
+
+    def get_resolution_cache_stats(self) -> CacheStats:
+        """返回模板解析缓存的命中统计"""
+        return self._resolution_cache.stats()
 
 
 animation_player = AnimationPlayer()
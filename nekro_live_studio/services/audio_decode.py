@@ -0,0 +1,199 @@
+import asyncio
+import contextlib
+import struct
+from typing import AsyncIterator, Optional, Tuple
+
+import numpy as np
+
+from ..configs.config import config
+from ..utils.logger import logger
+from .audio_index import WAVE_FORMAT_EXTENSIBLE, WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_PCM
+from .process_pool import process_pool
+
+# 非 WAV 流交给 ffmpeg 解码时每次读取的字节数
+DECODE_READ_SIZE = 16384
+
+
+def _pcm_to_float(raw: bytes, format_tag: int, width: int, channels: int) -> np.ndarray:
+    """把交错的 PCM 字节转换为形状为 (帧数, 声道数) 的 [-1, 1] 浮点采样"""
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        samples = np.frombuffer(raw, dtype=f"<f{width}").astype(np.float32)
+    elif width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width in (2, 4):
+        samples = np.frombuffer(raw, dtype=f"<i{width}").astype(np.float32) / 2 ** (8 * width - 1)
+    else:
+        data = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = data[:, 0] | (data[:, 1] << 8) | (data[:, 2] << 16)
+        samples = (np.where(values >= 1 << 23, values - (1 << 24), values) / (1 << 23)).astype(np.float32)
+    return samples.reshape(-1, channels)
+
+
+class WaveStreamDecoder:
+    """
+    增量解析 WAV 流: 先缓存字节直到读到 data 块, 之后每次 feed 返回完整帧的浮点采样。
+
+    流式接口写出的 data 块大小通常为 0 或占位值, 因此 data 块之后的所有字节都视为采样。
+    """
+
+    def __init__(self):
+        self.sample_rate = 0
+        self.channels = 0
+        self._format_tag = 0
+        self._width = 0
+        self._buffer = bytearray()
+        self._in_data = False
+
+    @staticmethod
+    def is_wave(head: bytes) -> bool:
+        return head[:4] == b"RIFF" and head[8:12] == b"WAVE"
+
+    def _parse_header(self) -> bool:
+        offset = 12
+        while offset + 8 <= len(self._buffer):
+            chunk_id, chunk_size = struct.unpack_from("<4sI", self._buffer, offset)
+            if chunk_id == b"data":
+                if not self.channels:
+                    raise ValueError("WAV 流在 data 块之前缺少 fmt 块")
+                del self._buffer[: offset + 8]
+                return True
+            end = offset + 8 + chunk_size + chunk_size % 2
+            if end > len(self._buffer):
+                return False
+            if chunk_id == b"fmt ":
+                fmt = bytes(self._buffer[offset + 8 : offset + 8 + chunk_size])
+                self._format_tag, self.channels, self.sample_rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+                if self._format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    self._format_tag = struct.unpack("<H", fmt[24:26])[0]
+                self._width = bits // 8
+                supported = (self._format_tag == WAVE_FORMAT_PCM and self._width in (1, 2, 3, 4)) or (
+                    self._format_tag == WAVE_FORMAT_IEEE_FLOAT and self._width in (4, 8)
+                )
+                if not supported or not self.channels:
+                    raise ValueError(f"不支持的 WAV 采样格式: 格式 {self._format_tag}, {bits} 位")
+            offset = end
+        return False
+
+    def feed(self, data: bytes) -> Optional[np.ndarray]:
+        self._buffer += data
+        if not self._in_data:
+            if len(self._buffer) < 12:
+                return None
+            if not self.is_wave(self._buffer):
+                raise ValueError("不是 RIFF/WAVE 流")
+            self._in_data = self._parse_header()
+            if not self._in_data:
+                return None
+        frame_bytes = self._width * self.channels
+        usable = len(self._buffer) - len(self._buffer) % frame_bytes
+        if not usable:
+            return None
+        samples = _pcm_to_float(bytes(self._buffer[:usable]), self._format_tag, self._width, self.channels)
+        del self._buffer[:usable]
+        return samples
+
+
+async def _decode_wave(head: bytes, stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[np.ndarray, int]]:
+    decoder = WaveStreamDecoder()
+    samples = decoder.feed(head)
+    if samples is not None:
+        yield samples, decoder.sample_rate
+    async for chunk in stream:
+        samples = decoder.feed(chunk)
+        if samples is not None:
+            yield samples, decoder.sample_rate
+
+
+async def _decode_ffmpeg(
+    head: bytes,
+    stream: AsyncIterator[bytes],
+    sample_rate: int,
+    channels: int,
+) -> AsyncIterator[Tuple[np.ndarray, int]]:
+    """非 WAV 流 (mp3/ogg 等) 由 ffmpeg 解码为指定采样率与声道数的浮点 PCM"""
+    process = await process_pool.acquire(
+        [
+            config.FFMPEG.FFMPEG_CMD,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            "pipe:0",
+            "-f",
+            "f32le",
+            "-ac",
+            str(channels),
+            "-ar",
+            str(sample_rate),
+            "pipe:1",
+        ],
+    )
+    assert process.stdin and process.stdout
+
+    async def write_input():
+        try:
+            process.stdin.write(head)
+            await process.stdin.drain()
+            async for chunk in stream:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.warning("ffmpeg 解码进程已关闭, 无法继续写入音频流")
+        finally:
+            if not process.stdin.is_closing():
+                process.stdin.close()
+
+    writer_task = asyncio.create_task(write_input())
+    frame_bytes = 4 * channels
+    pending = b""
+    try:
+        while True:
+            data = await process.stdout.read(DECODE_READ_SIZE)
+            if not data:
+                break
+            pending += data
+            usable = len(pending) - len(pending) % frame_bytes
+            if usable:
+                yield np.frombuffer(pending[:usable], dtype="<f4").reshape(-1, channels), sample_rate
+                pending = pending[usable:]
+    finally:
+        if not writer_task.done():
+            writer_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await writer_task
+        if process.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+        await process.wait()
+
+
+async def decode_audio_stream(
+    stream: AsyncIterator[bytes],
+    fallback_rate: Optional[int] = None,
+    fallback_channels: Optional[int] = None,
+) -> AsyncIterator[Tuple[np.ndarray, int]]:
+    """
+    把音频字节流解码为 (形状为 (帧数, 声道数) 的浮点采样, 采样率) 序列。
+
+    WAV 流在进程内解析, 保持原始采样率与声道数; 其他格式由 ffmpeg 解码为 fallback_rate 与 fallback_channels,
+    默认取混音器的配置。
+    """
+    # 读够 RIFF 头再判断格式
+    head = b""
+    async for chunk in stream:
+        head += chunk
+        if len(head) >= 12:
+            break
+    if WaveStreamDecoder.is_wave(head):
+        decoded = _decode_wave(head, stream)
+    elif head:
+        decoded = _decode_ffmpeg(
+            head,
+            stream,
+            fallback_rate or config.AUDIO.MIXER_SAMPLE_RATE,
+            fallback_channels or config.AUDIO.MIXER_CHANNELS,
+        )
+    else:
+        return
+    async for item in decoded:
+        yield item
@@ -0,0 +1,108 @@
+import math
+
+import numpy as np
+
+# WSOLA 分析帧长(秒), 约为语音/音效中最低基频周期的数倍, 过短会产生颤音, 过长会模糊瞬态
+WSOLA_FRAME_SECONDS = 0.04
+# 相似位置先在降采样后的波形上粗搜, 再在原始采样上细化, 降低每帧 FFT 的长度
+SEARCH_DECIMATION = 4
+
+
+def _hann(length: int) -> np.ndarray:
+    # 周期 Hann 窗, 以半帧为步长叠加时窗函数之和恒为 1
+    return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(length) / length)
+
+
+def time_stretch(samples: np.ndarray, speed: float, sample_rate: int) -> np.ndarray:
+    """
+    WSOLA 变速不变调。
+
+    输出以固定步长 (半帧) 叠加, 输入按 speed 倍步长前进; 每帧在标称位置附近的容差范围内
+    搜索与上一帧自然延续波形最相似的位置。相关性先在降采样波形上用 FFT 一次算出所有候选偏移,
+    再在原始采样上对最优候选附近逐点细化。
+
+    Args:
+        samples: 形状为 (帧数, 声道数) 的浮点采样
+        speed: 播放速度, 大于 1 加快, 小于 1 放慢
+        sample_rate: 采样率
+    """
+    if speed == 1.0 or len(samples) == 0:
+        return samples
+    frame = max(2 * round(WSOLA_FRAME_SECONDS * sample_rate / 2), 4)
+    synthesis_hop = frame // 2
+    tolerance = synthesis_hop // 2
+    analysis_hop = synthesis_hop * speed
+
+    out_length = max(1, round(len(samples) / speed))
+    frame_count = math.ceil(out_length / synthesis_hop) + 1
+    # 两端补零, 搜索与取帧时无需边界判断
+    tail = math.ceil(frame_count * analysis_hop) + frame + 2 * tolerance + synthesis_hop
+    padded = np.pad(samples, ((tolerance, max(tail - len(samples), 0)), (0, 0)))
+    guide = padded.mean(axis=1)
+    step = SEARCH_DECIMATION
+    coarse = guide[: len(guide) // step * step].reshape(-1, step).mean(axis=1)
+    coarse_frame = frame // step
+    coarse_candidates = 2 * tolerance // step + 1
+    fft_size = 1 << (coarse_frame + coarse_candidates + coarse_frame - 1).bit_length()
+    refine_offsets = np.arange(-step, step + 1)
+
+    window = _hann(frame)
+    output = np.zeros((frame_count * synthesis_hop + frame, samples.shape[1]))
+    norm = np.zeros(len(output))
+
+    position = tolerance
+    for k in range(frame_count):
+        nominal = round(k * analysis_hop) + tolerance
+        if k:
+            # 上一帧在输入中的自然延续, 新帧应尽量与之对齐
+            natural = position + synthesis_hop
+            low = nominal - tolerance
+            region = coarse[low // step : low // step + coarse_candidates + coarse_frame]
+            template = coarse[natural // step : natural // step + coarse_frame]
+            spectrum = np.fft.rfft(region, fft_size) * np.conj(np.fft.rfft(template, fft_size))
+            best = low // step * step + int(np.argmax(np.fft.irfft(spectrum, fft_size)[:coarse_candidates])) * step
+            best += natural % step
+            candidates = np.clip(best + refine_offsets, low, nominal + tolerance)
+            segments = guide[candidates[:, None] + np.arange(frame)]
+            position = int(candidates[np.argmax(segments @ guide[natural : natural + frame])])
+        else:
+            position = nominal
+        start = k * synthesis_hop
+        output[start : start + frame] += padded[position : position + frame] * window[:, None]
+        norm[start : start + frame] += window
+
+    output = output[:out_length] / np.maximum(norm[:out_length], 1e-3)[:, None]
+    return output.astype(samples.dtype, copy=False)
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """
+    频域重采样: 对整段做 FFT 后截断或补零频谱, 不引入混叠。音效较短, 整段变换的开销可以接受。
+
+    Args:
+        samples: 形状为 (帧数, 声道数) 的浮点采样
+    """
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    length = len(samples)
+    target_length = max(1, round(length * target_rate / source_rate))
+    spectrum = np.fft.rfft(samples, axis=0)
+    bins = target_length // 2 + 1
+    if bins <= len(spectrum):
+        spectrum = spectrum[:bins]
+    else:
+        spectrum = np.pad(spectrum, ((0, bins - len(spectrum)), (0, 0)))
+    resampled = np.fft.irfft(spectrum, target_length, axis=0) * (target_length / length)
+    return resampled.astype(samples.dtype, copy=False)
+
+
+def match_channels(samples: np.ndarray, channels: int) -> np.ndarray:
+    """转换 (帧数, 声道数) 采样的声道数: 单声道复制到各声道, 输出单声道时取平均, 其余按声道循环映射"""
+    source = samples.shape[1]
+    if source == channels:
+        return samples
+    if source == 1:
+        return np.repeat(samples, channels, axis=1)
+    if channels == 1:
+        return samples.mean(axis=1, keepdims=True)
+    return samples[:, np.arange(channels) % source]
@@ -0,0 +1,238 @@
+import json
+import math
+import os
+import struct
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field, ValidationError
+
+from ..utils.logger import logger
+
+AUDIO_INDEX_PATH = Path("./data/cache/audio_index.json")
+AUDIO_INDEX_VERSION = 1
+# 目录修改时间不变时, 两次扫描文件修改时间的最小间隔(秒), 用于发现原地修改的文件
+RESCAN_INTERVAL = 5.0
+
+# WAVE 格式标签
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class AudioMetadata(BaseModel):
+    """单个音频文件的元数据"""
+
+    name: str
+    size: int
+    mtime_ns: int
+    duration: Optional[float] = None
+    """时长(秒), 无法解析文件头时为空"""
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    bits_per_sample: Optional[int] = None
+    loudness: Optional[float] = None
+    """整段音频的 RMS 响度 (dBFS), 无法解析采样格式时为空"""
+
+
+class AudioIndexData(BaseModel):
+    version: int = AUDIO_INDEX_VERSION
+    files: Dict[str, AudioMetadata] = Field(default_factory=dict)
+
+
+class _WaveHeader:
+    __slots__ = ("bits_per_sample", "byte_rate", "channels", "data_offset", "data_size", "format_tag", "sample_rate")
+
+    def __init__(self):
+        self.format_tag = 0
+        self.channels = 0
+        self.sample_rate = 0
+        self.byte_rate = 0
+        self.bits_per_sample = 0
+        self.data_offset = 0
+        self.data_size = 0
+
+
+def _read_wave_header(f: BinaryIO, file_size: int) -> _WaveHeader:
+    """只读取 RIFF 块头, 不读取采样数据"""
+    riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+    if riff != b"RIFF" or wave != b"WAVE":
+        raise ValueError("不是 RIFF/WAVE 文件")
+    header = _WaveHeader()
+    has_format = False
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            break
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+        if chunk_id == b"fmt ":
+            fmt = f.read(chunk_size)
+            (
+                header.format_tag,
+                header.channels,
+                header.sample_rate,
+                header.byte_rate,
+                _,
+                header.bits_per_sample,
+            ) = struct.unpack("<HHIIHH", fmt[:16])
+            if header.format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                # 子格式 GUID 的前两个字节即实际的格式标签
+                header.format_tag = struct.unpack("<H", fmt[24:26])[0]
+            has_format = True
+            f.seek(chunk_size % 2, os.SEEK_CUR)
+        elif chunk_id == b"data":
+            header.data_offset = f.tell()
+            # 部分录音软件写出的 data 块大小为 0 或超出文件, 按文件剩余长度计
+            remaining = file_size - header.data_offset
+            header.data_size = chunk_size if 0 < chunk_size <= remaining else remaining
+            break
+        else:
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+    if not has_format or header.byte_rate <= 0:
+        raise ValueError("缺少有效的 fmt 块")
+    return header
+
+
+def _samples(f: BinaryIO, header: _WaveHeader) -> Optional[np.ndarray]:
+    """读取 data 块并转换为 [-1, 1] 的浮点采样, 不支持的格式返回 None"""
+    f.seek(header.data_offset)
+    raw = f.read(header.data_size)
+    width = header.bits_per_sample // 8
+    raw = raw[: len(raw) - len(raw) % max(width, 1)]
+    if header.format_tag == WAVE_FORMAT_IEEE_FLOAT and width in (4, 8):
+        return np.frombuffer(raw, dtype=f"<f{width}").astype(np.float64)
+    if header.format_tag != WAVE_FORMAT_PCM:
+        return None
+    if width == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float64) - 128) / 128
+    if width in (2, 4):
+        return np.frombuffer(raw, dtype=f"<i{width}").astype(np.float64) / 2 ** (8 * width - 1)
+    if width == 3:
+        data = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = data[:, 0] | (data[:, 1] << 8) | (data[:, 2] << 16)
+        values = np.where(values >= 1 << 23, values - (1 << 24), values)
+        return values.astype(np.float64) / (1 << 23)
+    return None
+
+
+def read_audio_metadata(path: Path) -> AudioMetadata:
+    """从 WAV 文件头读取时长与格式, 并计算一次整段响度"""
+    stat = path.stat()
+    with path.open("rb") as f:
+        header = _read_wave_header(f, stat.st_size)
+        samples = _samples(f, header)
+    loudness = None
+    if samples is not None and len(samples):
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        loudness = 20 * math.log10(rms) if rms > 0 else -math.inf
+    return AudioMetadata(
+        name=path.name,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        duration=header.data_size / header.byte_rate,
+        sample_rate=header.sample_rate,
+        channels=header.channels,
+        bits_per_sample=header.bits_per_sample,
+        loudness=loudness if loudness is None or math.isfinite(loudness) else None,
+    )
+
+
+class AudioIndex:
+    """
+    音效库的元数据索引, 持久化在本地文件中, 查询时直接从内存返回。
+
+    refresh 只重新读取新增或修改过的文件; 目录修改时间未变化时最多每 RESCAN_INTERVAL 秒扫描一次。
+    """
+
+    def __init__(self, audio_dir: Path, path: Path = AUDIO_INDEX_PATH, suffix: str = ".wav"):
+        self.audio_dir = audio_dir
+        self.path = path
+        self.suffix = suffix
+        self._data: Optional[AudioIndexData] = None
+        self._dir_mtime_ns: Optional[int] = None
+        self._last_scan: float = 0.0
+        # 每次内容变化时递增, 供调用方判断是否需要重建派生数据
+        self.revision = 0
+
+    def _load(self) -> AudioIndexData:
+        if self._data is not None:
+            return self._data
+        if self.path.exists():
+            try:
+                data = AudioIndexData.model_validate_json(self.path.read_text(encoding="utf-8"))
+                if data.version == AUDIO_INDEX_VERSION:
+                    self._data = data
+                    return data
+            except (OSError, ValidationError) as e:
+                logger.warning(f"读取音频索引 {self.path} 失败, 将重新建立: {e}")
+        self._data = AudioIndexData()
+        return self._data
+
+    def _save(self):
+        data = self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(data.model_dump(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        files: Dict[str, Tuple[int, int]] = {}
+        with os.scandir(self.audio_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(self.suffix):
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        同步索引与目录中的文件。
+
+        Returns:
+            索引内容是否发生变化
+        """
+        data = self._load()
+        try:
+            dir_mtime_ns = self.audio_dir.stat().st_mtime_ns
+        except OSError as e:
+            logger.error(f"访问音频目录 {self.audio_dir} 时出错: {e}")
+            return False
+        now = time.monotonic()
+        if not force and dir_mtime_ns == self._dir_mtime_ns and now - self._last_scan < RESCAN_INTERVAL:
+            return False
+        self._dir_mtime_ns = dir_mtime_ns
+        self._last_scan = now
+
+        files = self._scan()
+        changed = False
+        for name in set(data.files) - set(files):
+            del data.files[name]
+            changed = True
+        for name, (size, mtime_ns) in files.items():
+            entry = data.files.get(name)
+            if entry is not None and entry.size == size and entry.mtime_ns == mtime_ns:
+                continue
+            try:
+                data.files[name] = read_audio_metadata(self.audio_dir / name)
+            except (OSError, ValueError, struct.error) as e:
+                # 无法解析的文件仍保留在索引中, 文件未变化时不再重复解析
+                logger.warning(f"读取音频文件头 {name} 失败: {e}")
+                data.files[name] = AudioMetadata(name=name, size=size, mtime_ns=mtime_ns)
+            changed = True
+
+        if changed:
+            self.revision += 1
+            self._save()
+            logger.debug(f"音频索引已更新, 共 {len(data.files)} 个文件")
+        return changed
+
+    def get(self, name: str) -> Optional[AudioMetadata]:
+        self.refresh()
+        return self._load().files.get(name)
+
+    def items(self) -> List[AudioMetadata]:
+        self.refresh()
+        return sorted(self._load().files.values(), key=lambda item: item.name)
+
+    def names(self) -> List[str]:
+        return [item.name for item in self.items()]
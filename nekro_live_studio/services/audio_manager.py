@@ -1,13 +1,18 @@
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 from ..schemas.audio import AudioDescriptionFile
 from ..utils.logger import logger
+from .audio_index import AudioIndex
 
 AUDIO_DIR = Path("data/resources/audios")
 DESCRIPTIONS_FILE = AUDIO_DIR / "descriptions.yaml"
 
 
+def _rounded(duration: Optional[float]) -> Optional[float]:
+    return round(duration, 3) if duration is not None else None
+
+
 class AudioManager:
     """音频管理服务"""
 
@@ -16,6 +21,10 @@ class AudioManager:
         self.descriptions_file_path = descriptions_file
         self.audio_dir.mkdir(parents=True, exist_ok=True)
         self.description_data = self._load_descriptions()
+        self.index = AudioIndex(audio_dir)
+        # 上次生成音效列表时的索引版本与结果
+        self._sounds_revision: Optional[int] = None
+        self._sounds: List[Dict[str, Any]] = []
 
     def _load_descriptions(self) -> AudioDescriptionFile:
         """加载描述文件"""
@@ -27,16 +36,16 @@ class AudioManager:
         logger.debug(f"保存音效描述到 {self.descriptions_file_path}...")
         self.description_data.dump_config(self.descriptions_file_path)
 
-    def get_sounds_with_descriptions(self) -> List[Dict[str, str]]:
+    def get_sounds_with_descriptions(self) -> List[Dict[str, Any]]:
         """
-        获取所有音效文件及其描述。
+        获取所有音效文件及其描述和时长, 从音频索引读取, 文件未变化时直接返回上次的结果。
         如果描述文件不存在或有新的音频文件，则会创建/更新描述文件。
         """
-        try:
-            wav_files = {p.name for p in self.audio_dir.glob("*.wav")}
-        except Exception as e:
-            logger.error(f"访问音频目录 {self.audio_dir} 时出错: {e}")
-            return []
+        metadata = {item.name: item for item in self.index.items()}
+        if self._sounds_revision == self.index.revision:
+            return self._sounds
+        # 索引包含目录中的全部音效文件, 无法解析的文件也在其中 (时长为空)
+        wav_files = set(metadata)
 
         existing_descriptions = self.description_data.descriptions
 
@@ -67,7 +76,12 @@ class AudioManager:
             self.description_data.descriptions = existing_descriptions
             self._save_descriptions()
 
-        return [{"name": name, "description": desc} for name, desc in sorted(existing_descriptions.items())]
+        self._sounds = [
+            {"name": name, "description": desc, "duration": _rounded(metadata[name].duration)}
+            for name, desc in sorted(existing_descriptions.items())
+        ]
+        self._sounds_revision = self.index.revision
+        return self._sounds
 
 
 audio_manager = AudioManager(audio_dir=AUDIO_DIR, descriptions_file=DESCRIPTIONS_FILE) 
\ No newline at end of file
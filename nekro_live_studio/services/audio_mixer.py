@@ -0,0 +1,322 @@
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Literal, Optional, Protocol
+
+import numpy as np
+
+from ..configs.config import config
+from ..utils.logger import logger
+from .audio_dsp import match_channels
+
+Bus = Literal["speech", "effects", "music"]
+
+
+class MixerVoice:
+    """
+    混音器中的一个声部: 一段完整的采样 (音效) 或持续写入的流 (语音)。
+
+    写入在事件循环线程, 读取在输出回调线程, 两者通过 deque 交换数据块, 无需加锁。
+    """
+
+    def __init__(self, mixer: "AudioMixer", bus: Bus, gain: float, max_frames: Optional[int] = None):
+        self.mixer = mixer
+        self.bus = bus
+        self.gain = gain
+        self.frames_played = 0
+        self.start_frame: Optional[int] = None
+        """开始输出时混音器已输出的帧数, 用于换算播放位置"""
+        self._chunks: Deque[np.ndarray] = deque()
+        self._offset = 0
+        self._closed = False
+        self._stopped = False
+        self._finished = False
+        self._max_frames = max_frames
+        self._loop = asyncio.get_running_loop()
+        self._started_event = asyncio.Event()
+        self._finished_event = asyncio.Event()
+
+    def write(self, samples: np.ndarray):
+        """追加形状为 (帧数, 声道数) 的浮点采样, 声道数不同时自动转换"""
+        if self._closed or not len(samples):
+            return
+        self._chunks.append(match_channels(samples.astype(np.float32, copy=False), self.mixer.channels))
+
+    def close(self):
+        """不再写入, 已写入的数据播放完后声部结束"""
+        self._closed = True
+
+    def stop(self):
+        """立即停止"""
+        self._stopped = True
+        self._closed = True
+
+    def get_busy(self) -> bool:
+        return not self._finished
+
+    @property
+    def buffered_frames(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks) - self._offset
+
+    def position(self) -> float:
+        """按共享播放时钟计算的已播放时长(秒)"""
+        if self.start_frame is None:
+            return 0.0
+        elapsed = self.mixer.playback_time() - self.start_frame / self.mixer.sample_rate
+        return min(max(elapsed, 0.0), self.frames_played / self.mixer.sample_rate)
+
+    async def wait_started(self):
+        await self._started_event.wait()
+
+    async def wait_finished(self):
+        await self._finished_event.wait()
+
+    def _notify(self, event: asyncio.Event):
+        if not self._loop.is_closed():
+            with contextlib.suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(event.set)
+
+    def pull(self, frames: int, frame_counter: int) -> Optional[np.ndarray]:
+        """由混音器在输出回调线程中调用: 取出至多 frames 帧, 数据不足时返回较短的块 (流尚未写入时为 None)"""
+        if self._stopped:
+            self.finish()
+            return None
+        if self._max_frames is not None:
+            frames = min(frames, self._max_frames - self.frames_played)
+        parts: List[np.ndarray] = []
+        needed = frames
+        while needed > 0 and self._chunks:
+            chunk = self._chunks[0]
+            available = len(chunk) - self._offset
+            take = min(available, needed)
+            parts.append(chunk[self._offset : self._offset + take])
+            needed -= take
+            if take == available:
+                self._chunks.popleft()
+                self._offset = 0
+            else:
+                self._offset += take
+        block: Optional[np.ndarray] = None
+        if parts:
+            if self.start_frame is None:
+                self.start_frame = frame_counter
+                self._notify(self._started_event)
+            block = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            self.frames_played += len(block)
+        # 先计入已播放帧数再结束, 等待结束的协程被唤醒时看到的是最终的帧数
+        reached_limit = self._max_frames is not None and self.frames_played >= self._max_frames
+        if reached_limit or (self._closed and not self._chunks):
+            self.finish()
+        return block
+
+    def finish(self):
+        """由混音器调用: 丢弃未播放的数据并结束声部, 唤醒等待开始与结束的协程"""
+        if not self._finished:
+            self._finished = True
+            self._chunks.clear()
+            self._notify(self._started_event)
+            self._notify(self._finished_event)
+
+
+class MixerBackend(Protocol):
+    latency: float
+
+    def start(self, mixer: "AudioMixer") -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class NullBackend:
+    """丢弃输出的后端, 以实时速度驱动混音, 用于无声卡的环境"""
+
+    latency = 0.0
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+
+    def start(self, mixer: "AudioMixer") -> None:
+        self._running.set()
+
+        def run():
+            block_duration = mixer.block_size / mixer.sample_rate
+            next_time = time.perf_counter()
+            while self._running.is_set():
+                mixer.render(mixer.block_size)
+                next_time += block_duration
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.perf_counter()
+
+        self._thread = threading.Thread(target=run, name="audio-mixer-null", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+
+class SoundDeviceBackend:
+    """通过 sounddevice (PortAudio) 的回调输出到默认声卡"""
+
+    def __init__(self):
+        self.latency = 0.0
+        self._stream = None
+
+    def start(self, mixer: "AudioMixer") -> None:
+        import sounddevice  # 可选依赖, 仅在使用此后端时需要
+
+        def callback(outdata, frames, time_info, status):  # noqa: ARG001
+            outdata[:] = mixer.render(frames)
+
+        self._stream = sounddevice.OutputStream(
+            samplerate=mixer.sample_rate,
+            channels=mixer.channels,
+            blocksize=mixer.block_size,
+            dtype="float32",
+            latency="low",
+            callback=callback,
+        )
+        self._stream.start()
+        self.latency = float(self._stream.latency)
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+BACKENDS = {
+    "sounddevice": SoundDeviceBackend,
+    "null": NullBackend,
+}
+
+
+class AudioMixer:
+    """
+    进程内混音器: 语音、音效、音乐三条总线各自带增益, 在输出后端的回调中混合为一路输出。
+
+    所有声部共享同一个播放时钟 (已输出的帧数), 可据此把动画与实际听到的声音对齐。
+    """
+
+    def __init__(self, sample_rate: int, channels: int, block_size: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = block_size
+        self.bus_gains: Dict[str, float] = {"speech": 1.0, "effects": 1.0, "music": 1.0}
+        self.frames_rendered = 0
+        self._render_time = 0.0
+        self._last_block = 0
+        self._voices: List[MixerVoice] = []
+        self._lock = threading.Lock()
+        self._backend: Optional[MixerBackend] = None
+
+    @property
+    def running(self) -> bool:
+        return self._backend is not None
+
+    @property
+    def output_latency(self) -> float:
+        return self._backend.latency if self._backend else 0.0
+
+    def start(self, backend_name: str) -> bool:
+        """启动输出后端, 失败时返回 False"""
+        if self._backend is not None:
+            return True
+        backend = BACKENDS[backend_name]()
+        try:
+            backend.start(self)
+        except ImportError:
+            logger.error("混音器后端 sounddevice 未安装, 请执行 pip install sounddevice 或改用其他后端")
+            return False
+        except Exception as e:
+            logger.error(f"启动混音器后端 {backend_name} 失败: {e}")
+            return False
+        self._backend = backend
+        logger.info(
+            f"混音器已启动: {backend_name}, {self.sample_rate} Hz, {self.channels} 声道, "
+            f"块大小 {self.block_size}, 输出延迟 {backend.latency * 1000:.1f} ms",
+        )
+        return True
+
+    def stop(self):
+        if self._backend is None:
+            return
+        self._backend.stop()
+        self._backend = None
+        with self._lock:
+            voices, self._voices = self._voices, []
+        for voice in voices:
+            voice.finish()
+
+    def set_bus_gain(self, bus: Bus, gain: float):
+        self.bus_gains[bus] = gain
+
+    def play(self, samples: np.ndarray, bus: Bus = "effects", gain: float = 1.0, max_frames: Optional[int] = None) -> MixerVoice:
+        """播放一段完整的采样"""
+        voice = MixerVoice(self, bus, gain, max_frames=max_frames)
+        voice.write(samples)
+        voice.close()
+        self._add(voice)
+        return voice
+
+    def open_stream(self, bus: Bus = "speech", gain: float = 1.0) -> MixerVoice:
+        """创建一个流式声部, 调用方持续 write, 结束时 close"""
+        voice = MixerVoice(self, bus, gain)
+        self._add(voice)
+        return voice
+
+    def _add(self, voice: MixerVoice):
+        with self._lock:
+            self._voices.append(voice)
+
+    def playback_time(self) -> float:
+        """共享播放时钟: 已从输出设备播放出的时长(秒), 在两次回调之间按实际时间外推"""
+        # 最近一块在回调返回后才开始进入设备缓冲, 再经过输出延迟被听到
+        block_duration = self._last_block / self.sample_rate
+        since_render = min(time.perf_counter() - self._render_time, block_duration)
+        played = (self.frames_rendered - self._last_block) / self.sample_rate + since_render
+        return max(played - self.output_latency, 0.0)
+
+    def render(self, frames: int) -> np.ndarray:
+        """混合下一块输出, 在后端的回调线程中调用"""
+        output = np.zeros((frames, self.channels), dtype=np.float32)
+        with self._lock:
+            voices = list(self._voices)
+        finished = []
+        for voice in voices:
+            block = voice.pull(frames, self.frames_rendered)
+            if block is not None:
+                output[: len(block)] += block * (voice.gain * self.bus_gains.get(voice.bus, 1.0))
+            if not voice.get_busy():
+                finished.append(voice)
+        if finished:
+            with self._lock:
+                self._voices = [voice for voice in self._voices if voice not in finished]
+        np.clip(output, -1.0, 1.0, out=output)
+        self.frames_rendered += frames
+        self._last_block = frames
+        self._render_time = time.perf_counter()
+        return output
+
+    def active_voices(self) -> int:
+        with self._lock:
+            return len(self._voices)
+
+
+audio_mixer = AudioMixer(
+    sample_rate=config.AUDIO.MIXER_SAMPLE_RATE,
+    channels=config.AUDIO.MIXER_CHANNELS,
+    block_size=config.AUDIO.MIXER_BLOCK_SIZE,
+)
+audio_mixer.bus_gains.update(
+    speech=config.AUDIO.SPEECH_GAIN,
+    effects=config.AUDIO.EFFECTS_GAIN,
+    music=config.AUDIO.MUSIC_GAIN,
+)
@@ -1,12 +1,36 @@
+import asyncio
 import io
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pygame
 from pydub import AudioSegment
 
+from ..configs.config import config
 from ..schemas.actions import SoundPlayData
+from ..utils.cache import CacheStats, LRUCache
 from ..utils.logger import logger
+from .audio_dsp import resample, time_stretch
+from .audio_manager import audio_manager
+from .audio_mixer import MixerVoice, audio_mixer
+
+SoundKey = Tuple[str, float]
+
+
+@dataclass
+class CachedSound:
+    """已解码的音效及其来源文件的修改时间"""
+
+    sound: Optional[pygame.mixer.Sound]
+    mtime_ns: int
+    pcm_bytes: int
+    samples: Optional[np.ndarray] = None
+    """进程内混音器运行时解码为混音器采样率的浮点采样, 此时 sound 为空"""
 
 
 class AudioPlayer:
@@ -25,8 +49,20 @@ class AudioPlayer:
         pygame.mixer.set_num_channels(30)
         self.base_audio_path = Path(base_audio_path)
         self.base_audio_path.mkdir(parents=True, exist_ok=True)
-        self.playing_sounds: Dict[int, pygame.mixer.Channel] = {}
+        self.playing_sounds: Dict[int, Union[pygame.mixer.Channel, MixerVoice]] = {}
         self._next_id: int = 0  # ID计数器，从0开始
+        # (文件路径, 播放速度) -> 已解码的音效, 按 PCM 字节数限制容量
+        self._sound_cache: LRUCache[SoundKey, CachedSound] = LRUCache(
+            max_weight=config.AUDIO.SOUND_CACHE_MAX_MB * 1024 * 1024,
+            weigher=lambda cached: cached.pcm_bytes,
+        )
+        # 解码与变速在线程池中进行, 不阻塞事件循环
+        self._decode_executor = ThreadPoolExecutor(
+            max_workers=config.AUDIO.DECODE_WORKERS,
+            thread_name_prefix="audio-decode",
+        )
+        # 正在解码的音效, 同一音效的并发请求共用一次解码
+        self._pending_decodes: Dict[SoundKey, "asyncio.Future[CachedSound]"] = {}
         self._initialized = True
 
     def _resolve_path(self, file_path: str) -> Optional[Path]:
@@ -49,11 +85,19 @@ class AudioPlayer:
         return current_id
 
     def get_duration(self, sound_data: SoundPlayData) -> float:
-        """获取音频的播放时长（秒），考虑播放速度。如果文件未找到或出错，则返回0。"""
+        """
+        获取音频的播放时长（秒），考虑播放速度。如果文件未找到或出错，则返回0。
+        音效库中的文件从音频索引读取, 其他文件才需要完整解码。
+        """
         file_path = self._resolve_path(sound_data.path)
         if not file_path:
             return 0.0
 
+        if file_path.parent.resolve() == audio_manager.index.audio_dir.resolve():
+            metadata = audio_manager.index.get(file_path.name)
+            if metadata is not None and metadata.duration is not None:
+                return metadata.duration / sound_data.speed
+
         try:
             audio = AudioSegment.from_file(file_path)
             return audio.duration_seconds / sound_data.speed
@@ -61,29 +105,154 @@ class AudioPlayer:
             logger.error(f"Error getting duration for audio {sound_data.path}: {e}")
             return 0.0
 
-    def play(self, sound_data: SoundPlayData) -> Optional[int]:
-        """播放音频，返回播放ID，失败时返回None"""
+    @staticmethod
+    def _pcm_bytes(sound: pygame.mixer.Sound) -> int:
+        """按混音器格式估算音效占用的 PCM 字节数"""
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+
+    @staticmethod
+    def _decode_samples(file_path: Path, speed: float, frequency: int) -> np.ndarray:
+        """解码为 frequency 采样率、形状为 (帧数, 声道数) 的浮点采样, speed 不为 1 时用 WSOLA 变速不变调"""
+        audio = AudioSegment.from_file(file_path)
+        scale = float(1 << (8 * audio.sample_width - 1))
+        # pydub 读取 8 位 WAV 时已将无符号采样转换为有符号采样
+        samples = np.array(audio.get_array_of_samples(), dtype=np.float32).reshape(-1, audio.channels) / scale
+        samples = time_stretch(samples, speed, audio.frame_rate)
+        return resample(samples, audio.frame_rate, frequency)
+
+    def decode_sound(self, file_path: Path, speed: float = 1.0) -> pygame.mixer.Sound:
+        """在调用线程中同步解码为 pygame 混音器格式的 Sound, 不经过缓存"""
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        samples = self._decode_samples(file_path, speed, frequency)
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+
+        if sample_format == -16 and samples.shape[1] == channels:
+            return pygame.mixer.Sound(buffer=pcm.tobytes())
+        # 声道数或采样格式与混音器不同时交给 SDL 转换
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(samples.shape[1])
+            wav.setsampwidth(2)
+            wav.setframerate(frequency)
+            wav.writeframes(pcm.tobytes())
+        buffer.seek(0)
+        return pygame.mixer.Sound(buffer)
+
+    def _decode_entry(self, file_path: Path, speed: float, mtime_ns: int, for_mixer: bool) -> CachedSound:
+        if for_mixer:
+            samples = self._decode_samples(file_path, speed, audio_mixer.sample_rate)
+            return CachedSound(sound=None, mtime_ns=mtime_ns, pcm_bytes=samples.nbytes, samples=samples)
+        sound = self.decode_sound(file_path, speed)
+        return CachedSound(sound=sound, mtime_ns=mtime_ns, pcm_bytes=self._pcm_bytes(sound))
+
+    async def load_sound(self, file_path: Path, speed: float = 1.0) -> CachedSound:
+        """
+        读取已解码的音效, 未缓存或文件已修改时在解码线程池中重新解码并写入缓存。
+
+        进程内混音器运行时解码为浮点采样, 否则解码为 pygame 的 Sound。
+        """
+        key = (str(file_path), speed)
+        mtime_ns = file_path.stat().st_mtime_ns
+        for_mixer = audio_mixer.running
+        cached = self._sound_cache.get(key)
+        if cached is not None and cached.mtime_ns == mtime_ns and (cached.samples is not None) == for_mixer:
+            return cached
+
+        pending = self._pending_decodes.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = asyncio.ensure_future(
+                loop.run_in_executor(self._decode_executor, self._decode_entry, file_path, speed, mtime_ns, for_mixer),
+            )
+            self._pending_decodes[key] = pending
+            pending.add_done_callback(lambda _: self._pending_decodes.pop(key, None))
+        # shield: 某个调用方被取消时不影响共用同一次解码的其他调用方
+        cached = await asyncio.shield(pending)
+        self._sound_cache.put(key, cached)
+        return cached
+
+    async def preload(self, file_names: List[str], budget_bytes: int) -> int:
+        """
+        在解码线程池中预先解码音效并写入缓存, 解码的 PCM 数据总量达到 budget_bytes 后停止。
+
+        并发数比解码线程数少 1 (至少为 1), 预解码期间仍留有线程给实时播放。
+
+        Returns:
+            成功预解码的音效数量
+        """
+        if self._sound_cache.max_weight is not None:
+            budget_bytes = min(budget_bytes, self._sound_cache.max_weight)
+        if budget_bytes <= 0:
+            # 缓存上限为 0 时解码结果不会被缓存, 预解码没有意义
+            return 0
+        pending = [path for path in (self._resolve_path(name) for name in file_names) if path]
+        total = len(pending)
+        if not total:
+            return 0
+
+        logger.info(f"开始预解码 {total} 个音效, 内存预算 {budget_bytes / 1024 / 1024:.0f} MB")
+        start = time.perf_counter()
+        used_bytes = 0
+        loaded = 0
+        processed = 0
+        next_report = 0.25
+
+        async def worker():
+            nonlocal used_bytes, loaded, processed, next_report
+            while pending and used_bytes < budget_bytes:
+                file_path = pending.pop(0)
+                try:
+                    await self.load_sound(file_path)
+                    cached = self._sound_cache.peek((str(file_path), 1.0))
+                    used_bytes += cached.pcm_bytes if cached else 0
+                    loaded += 1
+                except Exception as e:
+                    logger.warning(f"预解码音效 {file_path.name} 失败: {e}")
+                processed += 1
+                if processed / total >= next_report:
+                    logger.info(f"音效预解码进度 {processed}/{total}, 已占用 {used_bytes / 1024 / 1024:.1f} MB")
+                    next_report += 0.25
+
+        workers = max(1, config.AUDIO.DECODE_WORKERS - 1)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        skipped = total - processed
+        logger.info(
+            f"音效预解码完成: {loaded} 个, 占用 {used_bytes / 1024 / 1024:.1f} MB, 耗时 {time.perf_counter() - start:.2f}s"
+            + (f", 超出内存预算跳过 {skipped} 个" if skipped else ""),
+        )
+        return loaded
+
+    def get_cache_stats(self) -> CacheStats:
+        """已解码音效缓存的统计信息, weight 为缓存的 PCM 字节数"""
+        return self._sound_cache.stats()
+
+    def clear_cache(self) -> None:
+        self._sound_cache.clear()
+
+    async def play(self, sound_data: SoundPlayData) -> Optional[int]:
+        """播放音频, 在开始播放后返回播放ID, 失败时返回None"""
         file_path = self._resolve_path(sound_data.path)
         if not file_path:
             return None
 
         try:
-            audio = AudioSegment.from_file(file_path)
-
-            if sound_data.speed != 1.0:
-                audio = audio.speedup(playback_speed=sound_data.speed)
-
-            buffer = io.BytesIO()
-            audio.export(buffer, format="wav")
-            buffer.seek(0)
-
-            sound = pygame.mixer.Sound(buffer)
-            sound.set_volume(sound_data.volume)
+            cached = await self.load_sound(file_path, sound_data.speed)
 
-            maxtime = int(sound_data.duration * 1000) if sound_data.duration > 0 else 0
-            channel = sound.play(maxtime=maxtime)
+            if cached.samples is not None:
+                max_frames = int(sound_data.duration * audio_mixer.sample_rate) if sound_data.duration > 0 else None
+                voice = audio_mixer.play(cached.samples, "effects", sound_data.volume, max_frames=max_frames)
+                play_id = self._get_next_id()
+                self.playing_sounds[play_id] = voice
+                return play_id
 
+            # 缓存的 Sound 可能同时在多个通道播放, 音量设置在通道上
+            channel = pygame.mixer.find_channel()
             if channel:
+                channel.set_volume(sound_data.volume)
+                maxtime = int(sound_data.duration * 1000) if sound_data.duration > 0 else 0
+                channel.play(cached.sound, maxtime=maxtime)
                 play_id = self._get_next_id()
                 self.playing_sounds[play_id] = channel
                 return play_id
@@ -102,9 +271,16 @@ class AudioPlayer:
             return True
         return False
 
+    def shutdown(self) -> None:
+        """关闭解码线程池, 丢弃尚未开始的解码任务"""
+        self._decode_executor.shutdown(wait=False, cancel_futures=True)
+
     def stop_all(self) -> None:
         """停止所有音频播放"""
         pygame.mixer.stop()
+        for player in self.playing_sounds.values():
+            if isinstance(player, MixerVoice):
+                player.stop()
         self.playing_sounds.clear()
 
     def is_playing(self, play_id: int) -> bool:
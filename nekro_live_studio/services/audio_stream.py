@@ -0,0 +1,108 @@
+import asyncio
+from typing import AsyncIterator, Optional
+
+import numpy as np
+
+from ..configs.config import config
+from ..utils.logger import logger
+from .audio_decode import decode_audio_stream
+from .audio_mixer import audio_mixer
+from .loudness import LoudnessEnvelope
+from .viseme import VisemeTimeline
+
+
+class StreamResampler:
+    """分块线性插值重采样, 在块之间保留上一块的末尾采样与插值相位, 拼接处没有断点"""
+
+    def __init__(self, source_rate: int, target_rate: int):
+        self.step = source_rate / target_rate
+        self._last: Optional[np.ndarray] = None
+        self._position = 0.0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if self.step == 1.0 or not len(samples):
+            return samples
+        buffer = samples if self._last is None else np.concatenate((self._last, samples))
+        end = len(buffer) - 1
+        if end < self._position:
+            self._last = buffer[-1:]
+            self._position -= len(buffer) - 1
+            return samples[:0]
+        count = int((end - self._position) / self.step) + 1
+        positions = self._position + np.arange(count) * self.step
+        index = np.minimum(positions.astype(np.int64), max(end - 1, 0))
+        fraction = (positions - index)[:, None].astype(np.float32)
+        following = buffer[np.minimum(index + 1, end)]
+        output = buffer[index] * (1 - fraction) + following * fraction
+        self._position += count * self.step - end
+        self._last = buffer[-1:]
+        return output.astype(np.float32, copy=False)
+
+
+async def play_audio_stream_with_mixer(
+    audio_stream: AsyncIterator[bytes],
+    started_event: asyncio.Event | None = None,
+    finished_event: asyncio.Event | None = None,
+    volume: float | None = None,
+    loudness_queue: asyncio.Queue[Optional[float]] | None = None,
+    viseme_timeline: VisemeTimeline | None = None,
+) -> bool:
+    """
+    在进程内混音器的语音总线上播放音频流, 参数与返回值同 play_audio_stream_with_ffplay。
+
+    解码后的采样同时写入混音器并计算响度包络, 不需要再复制一份字节流; started_event 在第一块采样实际送入输出设备时触发。
+    口型时间轴直接使用混音器的共享播放时钟, 其中已扣除输出设备报告的延迟。
+    """
+    voice = audio_mixer.open_stream("speech", 1.0 if volume is None else min(max(volume, 0.0), 1.0))
+    if viseme_timeline:
+        viseme_timeline.set_clock(lambda: voice.position() if voice.start_frame is not None else None)
+
+    async def signal_started():
+        await voice.wait_started()
+        if started_event and voice.frames_played:
+            started_event.set()
+
+    started_task = asyncio.create_task(signal_started())
+    resampler: Optional[StreamResampler] = None
+    envelope: Optional[LoudnessEnvelope] = None
+    try:
+        async for samples, sample_rate in decode_audio_stream(audio_stream):
+            if resampler is None:
+                resampler = StreamResampler(sample_rate, audio_mixer.sample_rate)
+            voice.write(resampler.process(samples))
+            if loudness_queue or viseme_timeline:
+                if envelope is None:
+                    envelope = LoudnessEnvelope(sample_rate, config.AUDIO.LOUDNESS_HOP, config.AUDIO.LOUDNESS_WEIGHTING)
+                if viseme_timeline:
+                    levels, brightness = envelope.feed_with_brightness(samples)
+                    viseme_timeline.extend(envelope.hop, levels, brightness)
+                else:
+                    levels = envelope.feed(samples)
+                if loudness_queue:
+                    for level in levels:
+                        loudness_queue.put_nowait(level)
+        if viseme_timeline:
+            viseme_timeline.finish_analysis()
+        voice.close()
+        await voice.wait_finished()
+    except FileNotFoundError:
+        logger.error(f"`{config.FFMPEG.FFMPEG_CMD}` 未找到，请确保已安装 ffmpeg 并将其添加至系统 PATH 或在配置中设置正确的路径")
+        voice.stop()
+        return False
+    except Exception as e:
+        logger.error(f"混音器播放音频流时发生错误: {e}")
+        voice.stop()
+        return False
+    finally:
+        if not started_task.done():
+            started_task.cancel()
+        if loudness_queue:
+            await loudness_queue.put(None)  # 发送结束信号
+        if viseme_timeline:
+            viseme_timeline.finish_analysis()
+            viseme_timeline.close()
+
+        if finished_event:
+            finished_event.set()
+
+    return True
@@ -1,103 +1,54 @@
 import asyncio
 import re
-import subprocess
-from typing import AsyncIterator, List, Optional, TypeVar
+from typing import AsyncIterator, List, Optional
 
 from ..configs.config import config
 from ..utils.logger import logger
+from ..utils.stream_tee import StreamTee
+from .loudness import analyze_loudness_stream
+from .process_pool import process_pool
+from .viseme import ExtrapolatedClock, VisemeTimeline, analyze_viseme_stream
 
-T = TypeVar("T")
+# ffplay 约每 30 ms 输出一次的状态行, 行首为当前的主时钟 (仅音频时即音频时钟, 已扣除声卡缓冲的延迟)
+FFPLAY_STATUS_PATTERN = re.compile(rb"^\s*(-?\d+\.\d+)\s+(?:M-A|A-V|M-V):")
+# 保留的 ffplay 非状态输出的最大字节数, 用于出错时记录日志
+STDERR_TAIL_BYTES = 4096
 
-
-async def atee(iterable: AsyncIterator[T], n: int = 2) -> List[AsyncIterator[T]]:
-    """将一个异步迭代器 tee 分为多个独立的异步迭代器"""
-    queues = [asyncio.Queue() for _ in range(n)]
-
-    async def forward():
-        try:
-            async for item in iterable:
-                for q in queues:
-                    await q.put(item)
-        finally:
-            for q in queues:
-                await q.put(None) 
-
-    asyncio.create_task(forward())
-
-    async def gen(q: asyncio.Queue):
-        while True:
-            item = await q.get()
-            if item is None:
-                break
-            yield item
-
-    return [gen(q) for q in queues]
-
-
-async def _analyze_loudness_stream(audio_stream: AsyncIterator[bytes], loudness_queue: asyncio.Queue):
-    """
-    使用 ffmpeg 分析音频流的响度 (LUFS), 并将结果放入队列.
-    """
+def _ffplay_args(volume: float | None) -> List[str]:
     args = [
-        config.FFMPEG.FFMPEG_CMD,
-        "-hide_banner",
-        "-nostats",
+        config.FFMPEG.FFPLAY_CMD,
+        "-autoexit",
+        "-nodisp",
         "-i",
         "pipe:0",
-        "-af",
-        "ebur128",
-        "-f",
-        "null",
-        "-",
     ]
-    process = await asyncio.create_subprocess_exec(
-        *args,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-
-    if not process.stdin or not process.stderr:
-        logger.error("响度分析进程未能初始化IO流")
-        return
-
-    lufs_pattern = re.compile(r"M:\s*(-?\d+\.?\d*)")
-
-    async def read_stderr():
-        """读取并解析 ffmpeg 的 stderr 输出."""
-        if not process.stderr:
-            return
-        while not process.stderr.at_eof():
-            line_bytes = await process.stderr.readline()
-            if not line_bytes:
-                break
-            line = line_bytes.decode("utf-8", "ignore").strip()
-            match = lufs_pattern.search(line)
+    if volume is not None:
+        # ffplay音量是0-100的整数
+        args.extend(["-volume", str(int(min(max(volume, 0.0), 1.0) * 100))])
+    return args
+
+
+async def _read_ffplay_stderr(stream: asyncio.StreamReader, clock: Optional[ExtrapolatedClock], tail: bytearray):
+    """持续读取 ffplay 的标准错误: 状态行中的音频时钟报告给 clock, 其他输出保留末尾部分"""
+    buffer = b""
+    while True:
+        data = await stream.read(4096)
+        if not data:
+            break
+        *lines, buffer = re.split(rb"[\r\n]", buffer + data)
+        for line in lines:
+            match = FFPLAY_STATUS_PATTERN.match(line)
             if match:
-                try:
-                    lufs = float(match.group(1))
-                    await loudness_queue.put(lufs)
-                except (ValueError, IndexError):
-                    pass
+                if clock:
+                    clock.report(float(match.group(1)))
+            elif line.strip():
+                tail.extend(line + b"\n")
+                del tail[:-STDERR_TAIL_BYTES]
 
-    stderr_reader_task = asyncio.create_task(read_stderr())
 
-    try:
-        async for chunk in audio_stream:
-            if process.stdin.is_closing():
-                break
-            try:
-                process.stdin.write(chunk)
-                await process.stdin.drain()
-            except (BrokenPipeError, ConnectionResetError):
-                logger.warning("Loudness analysis ffmpeg process closed pipe.")
-                break
-    finally:
-        if not process.stdin.is_closing():
-            process.stdin.close()
-            await process.stdin.wait_closed()
-        await process.wait()
-        await stderr_reader_task
+def start_worker_pool(with_player: bool = True):
+    """为默认音量的 ffplay 预先启动备用进程, 混音器运行时不需要 ffplay"""
+    process_pool.start([_ffplay_args(config.TTS.VOLUME)] if with_player else [])
 
 
 async def play_audio_stream_with_ffplay(
@@ -106,49 +57,71 @@ async def play_audio_stream_with_ffplay(
     finished_event: asyncio.Event | None = None,
     volume: float | None = None,
     loudness_queue: asyncio.Queue[Optional[float]] | None = None,
+    viseme_timeline: VisemeTimeline | None = None,
 ) -> bool:
     """
-    使用 ffplay 播放音频流, 并可选择同时进行响度分析.
-    """
-    analysis_task = None
-    if loudness_queue:
-        play_stream, analysis_stream = await atee(audio_stream, 2)
-        analysis_task = asyncio.create_task(_analyze_loudness_stream(analysis_stream, loudness_queue))
-    else:
-        play_stream = audio_stream
+    使用 ffplay 播放音频流, 并可选择同时在进程内分析响度或生成口型时间轴.
 
+    口型时间轴的播放时钟取自 ffplay 状态行中的音频时钟, 收到第一行状态之前按 FFPLAY_LATENCY 估算.
+    """
+    analysis_tasks: List[asyncio.Task] = []
+    tee = None
+    play_consumer = None
+    play_stream: AsyncIterator = audio_stream
+    if loudness_queue or viseme_timeline:
+        # ffplay 必须收到完整的数据, 生产者等待它; 分析按配置在积压过多时等待或被断开
+        tee = StreamTee(audio_stream, config.AUDIO.TEE_BUFFER_KB * 1024)
+        play_stream = play_consumer = tee.add_consumer("ffplay", "block")
+        if loudness_queue:
+            analysis_tasks.append(
+                asyncio.create_task(
+                    analyze_loudness_stream(
+                        tee.add_consumer("loudness", config.AUDIO.TEE_ANALYSIS_POLICY),
+                        loudness_queue,
+                        config.AUDIO.LOUDNESS_HOP,
+                        config.AUDIO.LOUDNESS_WEIGHTING,
+                    ),
+                ),
+            )
+        if viseme_timeline:
+            analysis_tasks.append(
+                asyncio.create_task(
+                    analyze_viseme_stream(
+                        tee.add_consumer("viseme", config.AUDIO.TEE_ANALYSIS_POLICY),
+                        viseme_timeline,
+                        config.AUDIO.LOUDNESS_HOP,
+                        config.AUDIO.LOUDNESS_WEIGHTING,
+                    ),
+                ),
+            )
+        tee.start()
+
+    clock = ExtrapolatedClock(fallback_latency=config.FFMPEG.FFPLAY_LATENCY) if viseme_timeline else None
+    if viseme_timeline and clock:
+        viseme_timeline.set_clock(clock)
+    stderr_tail = bytearray()
+    stderr_task = None
     try:
-        args = [
-            config.FFMPEG.FFPLAY_CMD,
-            "-autoexit",
-            "-nodisp",
-            "-i",
-            "pipe:0",
-        ]
-        if volume is not None:
-            # ffplay音量是0-100的整数
-            args.extend(["-volume", str(int(min(max(volume, 0.0), 1.0) * 100))])
-
-        process = await asyncio.create_subprocess_exec(
-            *args,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        # 优先取用预先启动的 ffplay, 省去进程启动的延迟
+        process = await process_pool.acquire(_ffplay_args(volume))
 
         if not process.stdin:
             logger.error("ffplay 进程未能初始化标准输入")
-            if analysis_task and not analysis_task.done():
-                analysis_task.cancel()
             return False
+        if process.stderr:
+            # 持续读取, 避免长语音时状态输出填满管道使 ffplay 阻塞
+            stderr_task = asyncio.create_task(_read_ffplay_stderr(process.stderr, clock, stderr_tail))
 
         set_started = False
         async for chunk in play_stream:
             if process.stdin.is_closing():
                 break
 
-            if not set_started and started_event:
-                started_event.set()
+            if not set_started:
+                if started_event:
+                    started_event.set()
+                if clock:
+                    clock.mark_started()
                 set_started = True
 
             try:
@@ -166,12 +139,11 @@ async def play_audio_stream_with_ffplay(
             await process.stdin.wait_closed()
 
         await process.wait()
+        if stderr_task:
+            await stderr_task
 
         if process.returncode != 0:
-            stderr_output = ""
-            if process.stderr:
-                stderr_output_bytes = await process.stderr.read()
-                stderr_output = stderr_output_bytes.decode("utf-8", errors="ignore").strip()
+            stderr_output = stderr_tail.decode("utf-8", errors="ignore").strip()
             if stderr_output:
                 logger.error(f"ffplay 进程错误: {stderr_output}")
             return False
@@ -183,10 +155,27 @@ async def play_audio_stream_with_ffplay(
         logger.error(f"播放音频流时发生未知错误: {e}")
         return False
     finally:
-        if analysis_task:
-            await analysis_task
-            if loudness_queue:
-                await loudness_queue.put(None)  # 发送结束信号
+        if play_consumer:
+            # 播放提前结束时不再让生产者等待 ffplay, 响度分析仍可读完剩余数据
+            await play_consumer.aclose()
+        if stderr_task and not stderr_task.done():
+            stderr_task.cancel()
+        # 分析任务的异常不能跳过下面的结束信号与清理, 否则等待 finished_event 的一方会一直挂起
+        for result in await asyncio.gather(*analysis_tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"音频分析任务异常退出: {result}")
+        if loudness_queue:
+            await loudness_queue.put(None)  # 发送结束信号
+        if viseme_timeline:
+            viseme_timeline.close()
+        if tee:
+            await tee.aclose()
+            stats = tee.stats()
+            logger.debug(
+                f"语音流分流: 共 {stats.forwarded_bytes} 字节, 峰值积压 {stats.peak_buffered_bytes}/{stats.capacity} 字节, "
+                f"生产者等待 {stats.blocked_seconds * 1000:.0f} ms"
+                + (f", 已断开 {', '.join(stats.dropped)}" if stats.dropped else ""),
+            )
 
         if finished_event:
             finished_event.set()
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import math
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+from ..controllers.config import ControllersConfig
+from ..utils.easing import Easing
+from .tweener import Tweener
+
+IDLE_LOOP_DIR = Path("./data/cache/idle_loops")
+IDLE_LOOP_FORMAT_VERSION = 2
+
+# 无法加载也无法渲染的待机循环配置摘要, 这些配置下回退到各待机控制器
+_failed_digests: Set[str] = set()
+
+
+class _Track:
+    """单个参数的离线缓动时间线, 与 Tweener.tween 的插值方式一致"""
+
+    def __init__(self, fps: int, frame_count: int, start: float = 0.0):
+        self.fps = fps
+        self.values = np.empty(frame_count, dtype=np.float64)
+        self.time = 0.0
+        self.value = start
+        self._cursor = 0
+
+    @property
+    def done(self) -> bool:
+        return self._cursor >= len(self.values)
+
+    def _fill_until(self, end_time: float, func: Callable[[np.ndarray], np.ndarray]):
+        end_frame = min(len(self.values), math.ceil(end_time * self.fps))
+        if end_frame > self._cursor:
+            times = np.arange(self._cursor, end_frame) / self.fps
+            self.values[self._cursor : end_frame] = func(times)
+            self._cursor = end_frame
+
+    def tween_to(self, end: float, duration: float, easing_func: Callable[[float], float]):
+        start, start_time = self.value, self.time
+        if duration > 0:
+            easing = np.vectorize(easing_func, otypes=[np.float64])
+            self._fill_until(
+                start_time + duration,
+                lambda times: start + (end - start) * easing(np.clip((times - start_time) / duration, 0.0, 1.0)),
+            )
+        self.time += max(duration, 0.0)
+        self.value = end
+
+    def hold(self, duration: float):
+        value = self.value
+        self._fill_until(self.time + duration, lambda times: np.full(len(times), value))
+        self.time += max(duration, 0.0)
+
+
+def _render_breathing(config: ControllersConfig, fps: int, frame_count: int) -> Dict[str, np.ndarray]:
+    breathing = config.breathing
+    track = _Track(fps, frame_count)
+    while not track.done:
+        track.tween_to(breathing.MAX_VALUE, breathing.INHALE_DURATION, Easing.in_out_sine)
+        track.tween_to(breathing.MIN_VALUE, breathing.EXHALE_DURATION, Easing.in_out_sine)
+        if breathing.INHALE_DURATION <= 0 and breathing.EXHALE_DURATION <= 0:
+            track.hold(1.0)
+    return {breathing.PARAMETER: track.values}
+
+
+def _render_body_swing(config: ControllersConfig, fps: int, frame_count: int, rng: random.Random) -> Dict[str, np.ndarray]:
+    swing, eye = config.body_swing, config.eye_follow
+    names = [swing.X_PARAMETER, swing.Z_PARAMETER]
+    if eye.ENABLED:
+        names += [eye.LEFT_X_PARAMETER, eye.RIGHT_X_PARAMETER, eye.LEFT_Y_PARAMETER, eye.RIGHT_Y_PARAMETER]
+    tracks = {name: _Track(fps, frame_count) for name in names}
+    first = tracks[swing.X_PARAMETER]
+    while not first.done:
+        # 与 BodySwingController.run_cycle 相同的目标计算
+        target_x = rng.uniform(swing.X_MIN, swing.X_MAX)
+        target_z = rng.uniform(swing.Z_MIN, swing.Z_MAX)
+        duration = max(rng.uniform(swing.MIN_DURATION, swing.MAX_DURATION), 1 / fps)
+        x_range = swing.X_MAX - swing.X_MIN
+        x_norm = (target_x - swing.X_MIN) / x_range if x_range else 0
+        z_range = swing.Z_MAX - swing.Z_MIN
+        z_norm = (target_z - swing.Z_MIN) / z_range if z_range else 0
+        targets = {swing.X_PARAMETER: target_x, swing.Z_PARAMETER: target_z}
+        if eye.ENABLED:
+            eye_x = eye.X_MIN_RANGE + x_norm * (eye.X_MAX_RANGE - eye.X_MIN_RANGE)
+            eye_y = eye.Y_MAX_RANGE - z_norm * (eye.Y_MAX_RANGE - eye.Y_MIN_RANGE)
+            targets.update(
+                {
+                    eye.LEFT_X_PARAMETER: eye_x,
+                    eye.RIGHT_X_PARAMETER: eye_x,
+                    eye.LEFT_Y_PARAMETER: eye_y,
+                    eye.RIGHT_Y_PARAMETER: eye_y,
+                },
+            )
+        easing_func = Tweener.random_easing(rng)
+        for name, target in targets.items():
+            tracks[name].tween_to(target, duration, easing_func)
+    return {name: track.values for name, track in tracks.items()}
+
+
+def _render_blink(config: ControllersConfig, fps: int, frame_count: int, rng: random.Random) -> Dict[str, np.ndarray]:
+    blink = config.blink
+    track = _Track(fps, frame_count, start=blink.MAX_VALUE)
+    while not track.done:
+        track.tween_to(blink.MIN_VALUE, blink.CLOSE_DURATION, Easing.out_sine)
+        track.hold(blink.CLOSED_HOLD)
+        track.tween_to(blink.MAX_VALUE, blink.OPEN_DURATION, Easing.in_sine)
+        track.hold(max(rng.uniform(blink.MIN_INTERVAL, blink.MAX_INTERVAL), 1 / fps))
+    return {blink.LEFT_PARAMETER: track.values, blink.RIGHT_PARAMETER: track.values}
+
+
+def _render_mouth(config: ControllersConfig, fps: int, frame_count: int, rng: random.Random) -> Dict[str, np.ndarray]:
+    # 只渲染嘴部表情; 不包含 MouthOpen, 以免在嘴型同步的缓动间隙中逐帧覆盖说话时的开口
+    mouth = config.mouth_expression
+    smile = _Track(fps, frame_count)
+    while not smile.done:
+        target_smile = rng.uniform(mouth.SMILE_MIN, mouth.SMILE_MAX)
+        duration = max(rng.uniform(mouth.CHANGE_MIN_DURATION, mouth.CHANGE_MAX_DURATION), 1 / fps)
+        smile.tween_to(target_smile, duration, Tweener.random_easing(rng))
+    return {mouth.SMILE_PARAMETER: smile.values}
+
+
+@dataclass
+class IdleLoop:
+    """预渲染的待机循环, values 形状为 (帧数, 参数数)"""
+
+    parameters: List[str]
+    values: np.ndarray
+    fps: int
+    config_digest: str
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.values)
+
+    def frame(self, elapsed: float) -> Dict[str, float]:
+        """循环播放时 elapsed 秒处的参数值"""
+        row = self.values[int(elapsed * self.fps) % self.frame_count]
+        return dict(zip(self.parameters, row.tolist()))
+
+
+def idle_loop_digest(config: ControllersConfig) -> str:
+    """参与渲染的配置的摘要, 配置变化后需要重新渲染"""
+    relevant = {
+        name: getattr(config, name).model_dump()
+        for name in ("blink", "breathing", "body_swing", "eye_follow", "mouth_expression")
+    }
+    loop_config = config.idle_loop.model_dump()
+    loop_config.pop("ENABLED")
+    relevant["idle_loop"] = loop_config
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def mark_idle_loop_failed(config: ControllersConfig):
+    """记录该配置下的待机循环不可用, 配置变化后会重新尝试"""
+    _failed_digests.add(idle_loop_digest(config))
+
+
+def idle_loop_active(config: ControllersConfig) -> bool:
+    """预渲染待机循环是否启用且可用, 为 True 时取代其他待机控制器"""
+    return config.idle_loop.ENABLED and idle_loop_digest(config) not in _failed_digests
+
+
+def render_idle_loop(config: ControllersConfig) -> IdleLoop:
+    """
+    按各待机控制器的配置离线渲染一段待机循环。
+
+    多渲染 CROSSFADE 秒, 并把多出的部分与开头交叉淡化, 使最后一帧自然衔接到第一帧。
+    """
+    loop_config = config.idle_loop
+    fps = loop_config.FPS
+    loop_frames = max(1, round(loop_config.DURATION * fps))
+    fade_frames = min(round(loop_config.CROSSFADE * fps), loop_frames)
+    frame_count = loop_frames + fade_frames
+    rng = random.Random(loop_config.SEED)
+
+    channels: Dict[str, np.ndarray] = {}
+    if config.breathing.ENABLED:
+        channels.update(_render_breathing(config, fps, frame_count))
+    if config.body_swing.ENABLED:
+        channels.update(_render_body_swing(config, fps, frame_count, rng))
+    if config.blink.ENABLED:
+        channels.update(_render_blink(config, fps, frame_count, rng))
+    if config.mouth_expression.ENABLED:
+        channels.update(_render_mouth(config, fps, frame_count, rng))
+
+    parameters = list(channels)
+    rendered = np.stack([channels[name] for name in parameters], axis=1) if parameters else np.zeros((frame_count, 0))
+    looped = rendered[:loop_frames].copy()
+    if fade_frames:
+        # 开头 fade_frames 帧从渲染尾部的延续过渡到原本的开头
+        weight = (0.5 - 0.5 * np.cos(np.pi * np.arange(fade_frames) / fade_frames))[:, None]
+        looped[:fade_frames] = rendered[loop_frames:] * (1 - weight) + rendered[:fade_frames] * weight
+
+    return IdleLoop(
+        parameters=parameters,
+        values=looped.astype(np.float32),
+        fps=fps,
+        config_digest=idle_loop_digest(config),
+    )
+
+
+def idle_loop_path(model_name: str) -> Path:
+    return IDLE_LOOP_DIR / f"{model_name}.npz"
+
+
+def save_idle_loop(path: Path, idle_loop: IdleLoop):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        np.savez_compressed(
+            f,
+            version=np.array(IDLE_LOOP_FORMAT_VERSION),
+            parameters=np.array(idle_loop.parameters),
+            values=idle_loop.values,
+            fps=np.array(idle_loop.fps),
+            config_digest=np.array(idle_loop.config_digest),
+        )
+
+
+def load_idle_loop(path: Path) -> Optional[IdleLoop]:
+    """读取待机循环文件, 文件不存在或版本不兼容时返回 None"""
+    if not path.exists():
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        if int(data["version"]) != IDLE_LOOP_FORMAT_VERSION:
+            return None
+        return IdleLoop(
+            parameters=[str(name) for name in data["parameters"]],
+            values=data["values"],
+            fps=int(data["fps"]),
+            config_digest=str(data["config_digest"]),
+        )
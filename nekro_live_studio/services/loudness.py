@@ -0,0 +1,121 @@
+import asyncio
+from typing import List, Literal, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger import logger
+from ..utils.stream_tee import TeeConsumer
+from .audio_decode import decode_audio_stream
+
+Weighting = Literal["k", "rms"]
+
+# ITU-R BS.1770 K 加权滤波器 (48 kHz 下的两级双二阶系数): 高频搁架 + 高通
+_K_WEIGHTING_STAGES = (
+    ((1.53512485958697, -2.69169618940638, 1.19839281085285), (1.0, -1.69065929318241, 0.73248077421585)),
+    ((1.0, -2.0, 1.0), (1.0, -1.99004745483398, 0.99007225036621)),
+)
+_K_WEIGHTING_RATE = 48000
+# 静音时的响度下限, 避免 log(0)
+SILENCE_FLOOR = -120.0
+# 频谱质心在此范围内按对数映射为 0~1 的明亮度, 大致覆盖 "u/o" 到 "i/e" 的第二共振峰
+BRIGHTNESS_LOW_HZ = 300.0
+BRIGHTNESS_HIGH_HZ = 3000.0
+
+
+def k_weighting_power(frequencies: np.ndarray) -> np.ndarray:
+    """K 加权滤波器在给定频率 (Hz) 处的功率增益 |H(f)|²"""
+    omega = np.minimum(2 * np.pi * frequencies / _K_WEIGHTING_RATE, np.pi)
+    z = np.exp(-1j * omega)
+    response = np.ones_like(z)
+    for b, a in _K_WEIGHTING_STAGES:
+        response *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+    return np.abs(response) ** 2
+
+
+class LoudnessEnvelope:
+    """
+    把连续写入的采样按固定步长切块, 每块输出一个响度值。
+
+    weighting 为 "k" 时按 BS.1770 计算 K 加权响度 (LUFS): 每块做一次 FFT, 由 Parseval 定理在频域按滤波器的功率增益
+    加权求均方, 无需逐点滤波; 为 "rms" 时输出各声道平均的 RMS 电平 (dBFS)。
+    """
+
+    def __init__(self, sample_rate: int, hop: float, weighting: Weighting = "k"):
+        self.sample_rate = sample_rate
+        self.hop_frames = max(2, round(hop * sample_rate))
+        self.weighting = weighting
+        self._pending: Optional[np.ndarray] = None
+        self._frequencies = np.fft.rfftfreq(self.hop_frames, 1 / sample_rate)
+        if weighting == "k":
+            # 实数 FFT 只保留非负频率, 除直流与奈奎斯特分量外其余分量在完整频谱中出现两次
+            multiplicity = np.full(self.hop_frames // 2 + 1, 2.0)
+            multiplicity[0] = 1.0
+            if self.hop_frames % 2 == 0:
+                multiplicity[-1] = 1.0
+            self._spectral_weights = multiplicity * k_weighting_power(self._frequencies) / self.hop_frames**2
+
+    @property
+    def hop(self) -> float:
+        return self.hop_frames / self.sample_rate
+
+    def _take_blocks(self, samples: np.ndarray) -> np.ndarray:
+        """拼上次剩余的采样后切出完整的块, 形状为 (块数, 块长, 声道数)"""
+        if self._pending is not None and len(self._pending):
+            samples = np.concatenate((self._pending, samples))
+        count = len(samples) // self.hop_frames
+        self._pending = samples[count * self.hop_frames :]
+        return samples[: count * self.hop_frames].reshape(count, self.hop_frames, -1).astype(np.float64)
+
+    def _levels(self, blocks: np.ndarray, spectrum: Optional[np.ndarray]) -> np.ndarray:
+        if self.weighting == "k":
+            mean_square = np.einsum("f,bfc->bc", self._spectral_weights, np.abs(spectrum) ** 2)
+            # 各声道均方之和, 左右声道权重为 1
+            power = mean_square.sum(axis=1)
+            offset = -0.691
+        else:
+            power = np.mean(blocks * blocks, axis=(1, 2))
+            offset = 0.0
+        levels = offset + 10 * np.log10(np.maximum(power, 1e-30))
+        return np.maximum(levels, SILENCE_FLOOR)
+
+    def feed(self, samples: np.ndarray) -> List[float]:
+        """写入形状为 (帧数, 声道数) 的采样, 返回其中完整块的响度, 不足一块的部分留到下次"""
+        blocks = self._take_blocks(samples)
+        if not len(blocks):
+            return []
+        spectrum = np.fft.rfft(blocks, axis=1) if self.weighting == "k" else None
+        return self._levels(blocks, spectrum).tolist()
+
+    def feed_with_brightness(self, samples: np.ndarray) -> Tuple[List[float], List[float]]:
+        """同 feed, 另外返回每块频谱质心映射到 0~1 的明亮度, 可用于区分口型的扁圆"""
+        blocks = self._take_blocks(samples)
+        if not len(blocks):
+            return [], []
+        spectrum = np.fft.rfft(blocks, axis=1)
+        power = (np.abs(spectrum) ** 2).sum(axis=2)
+        centroid = (power @ self._frequencies) / np.maximum(power.sum(axis=1), 1e-30)
+        brightness = np.log(np.maximum(centroid, BRIGHTNESS_LOW_HZ) / BRIGHTNESS_LOW_HZ) / np.log(
+            BRIGHTNESS_HIGH_HZ / BRIGHTNESS_LOW_HZ,
+        )
+        return self._levels(blocks, spectrum).tolist(), np.minimum(brightness, 1.0).tolist()
+
+
+async def analyze_loudness_stream(
+    audio_stream: TeeConsumer,
+    loudness_queue: asyncio.Queue,
+    hop: float,
+    weighting: Weighting = "k",
+):
+    """解码音频流并在进程内计算响度包络, 每 hop 秒的响度依次放入队列"""
+    envelope: Optional[LoudnessEnvelope] = None
+    try:
+        async for samples, sample_rate in decode_audio_stream(audio_stream):
+            if envelope is None:
+                envelope = LoudnessEnvelope(sample_rate, hop, weighting)
+            for level in envelope.feed(samples):
+                await loudness_queue.put(level)
+    except Exception as e:
+        logger.warning(f"响度分析失败: {e}")
+    finally:
+        # 断开本端, 避免 tee 的生产者等待不再读取的消费者; 源流出错时再次读取只会重新抛出
+        await audio_stream.aclose()
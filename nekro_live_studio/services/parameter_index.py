@@ -0,0 +1,114 @@
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from ..clients.vtube_studio.plugin import VTSPlugin
+from ..utils.logger import logger
+
+PARAMETER_INDEX_PATH = Path("./data/cache/vts_parameters.json")
+# 随仓库提供的 VTS 默认输入参数列表, 尚未连接过 VTS 时使用
+DEFAULT_PARAMETERS_PATH = Path("./vts默认参数.txt")
+
+
+class ParameterInfo(BaseModel):
+    """VTS 输入参数的取值范围"""
+
+    name: str
+    min: float
+    max: float
+    default: float = 0.0
+
+
+class ParameterIndexData(BaseModel):
+    source: str
+    updated_at: float = 0.0
+    parameters: Dict[str, ParameterInfo]
+
+
+def _parse_default_parameters(text: str) -> Dict[str, ParameterInfo]:
+    """解析 vts默认参数.txt, 每个参数块以分隔线结束"""
+    parameters: Dict[str, ParameterInfo] = {}
+    fields: Dict[str, str] = {}
+    for line in [*text.splitlines(), "---"]:
+        line = line.strip()
+        if line.startswith("---"):
+            if "参数" in fields:
+                name = fields["参数"]
+                parameters[name] = ParameterInfo(
+                    name=name,
+                    min=float(fields.get("最小值", 0.0)),
+                    max=float(fields.get("最大值", 0.0)),
+                    default=float(fields.get("默认值", 0.0)),
+                )
+            fields = {}
+            continue
+        key, sep, value = line.partition(":")
+        if sep:
+            fields[key.strip()] = value.strip()
+    return parameters
+
+
+class ParameterIndex:
+    """
+    VTS 输入参数索引, 缓存在本地文件中, 供离线校验动画模板使用。
+
+    连接 VTS 后调用 refresh 更新缓存; 没有缓存时退回到随仓库提供的默认参数列表。
+    """
+
+    def __init__(self, path: Path = PARAMETER_INDEX_PATH):
+        self.path = path
+        self._data: Optional[ParameterIndexData] = None
+
+    def load(self) -> ParameterIndexData:
+        if self._data is not None:
+            return self._data
+        if self.path.exists():
+            try:
+                self._data = ParameterIndexData.model_validate_json(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValidationError) as e:
+                logger.warning(f"读取参数索引缓存 {self.path} 失败, 将使用默认参数列表: {e}")
+            else:
+                return self._data
+        parameters: Dict[str, ParameterInfo] = {}
+        if DEFAULT_PARAMETERS_PATH.exists():
+            parameters = _parse_default_parameters(DEFAULT_PARAMETERS_PATH.read_text(encoding="utf-8"))
+        self._data = ParameterIndexData(source="default", parameters=parameters)
+        return self._data
+
+    async def refresh(self, plugin: VTSPlugin) -> ParameterIndexData:
+        """从 VTS 拉取当前的输入参数 (默认与自定义) 并写入缓存"""
+        raw_parameters = await plugin.get_available_parameters()
+        parameters = {
+            item["name"]: ParameterInfo(
+                name=item["name"],
+                min=item.get("min", 0.0),
+                max=item.get("max", 0.0),
+                default=item.get("defaultValue", 0.0),
+            )
+            for item in raw_parameters
+            if "name" in item
+        }
+        self._data = ParameterIndexData(source="vts", updated_at=time.time(), parameters=parameters)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(self._data.model_dump(), ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        logger.debug(f"已更新 VTS 参数索引, 共 {len(parameters)} 个参数")
+        return self._data
+
+    def get(self, name: str) -> Optional[ParameterInfo]:
+        return self.load().parameters.get(name)
+
+    def names(self) -> List[str]:
+        return list(self.load().parameters)
+
+    @property
+    def source(self) -> str:
+        return self.load().source
+
+
+parameter_index = ParameterIndex()
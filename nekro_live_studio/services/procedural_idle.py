@@ -0,0 +1,128 @@
+import math
+import random
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..controllers.config import IdleBlinkConfig, ProceduralIdleConfig
+from ..utils.easing import Easing
+
+# 每个噪声序列的梯度表长度, 噪声每 GRADIENT_TABLE_SIZE 个周期重复一次
+GRADIENT_TABLE_SIZE = 256
+
+
+def _stream_seed(seed: int, name: str) -> List[int]:
+    # 内置 hash 对字符串加盐, 用 crc32 保证同一种子在不同进程中得到相同序列
+    return [seed, zlib.crc32(name.encode("utf-8"))]
+
+
+class _BlinkSchedule:
+    """按种子生成的眨眼时间表, 按时间顺序求值"""
+
+    def __init__(self, config: IdleBlinkConfig, seed: int):
+        self.config = config
+        self._rng = np.random.default_rng(_stream_seed(seed, "blink"))
+        self._length = config.CLOSE_DURATION + config.CLOSED_HOLD + config.OPEN_DURATION
+        self._start = self._next_interval()
+
+    def _next_interval(self) -> float:
+        low = min(self.config.MIN_INTERVAL, self.config.MAX_INTERVAL)
+        high = max(self.config.MIN_INTERVAL, self.config.MAX_INTERVAL)
+        return float(self._rng.uniform(low, high))
+
+    def closure(self, t: float) -> float:
+        """t 时刻眼睛的闭合程度, 0 为睁开, 1 为闭合"""
+        while t >= self._start + self._length:
+            self._start += self._length + self._next_interval()
+        local = t - self._start
+        config = self.config
+        if local < 0:
+            return 0.0
+        if local < config.CLOSE_DURATION:
+            return Easing.out_sine(local / config.CLOSE_DURATION)
+        local -= config.CLOSE_DURATION
+        if local < config.CLOSED_HOLD:
+            return 1.0
+        local -= config.CLOSED_HOLD
+        if config.OPEN_DURATION <= 0:
+            return 0.0
+        return 1.0 - Easing.in_sine(min(local / config.OPEN_DURATION, 1.0))
+
+
+class ProceduralIdleGenerator:
+    """
+    程序化待机动画求值器: 每个参数通道为 基准值 + 分形梯度噪声 + 正弦周期分量, 外加按种子生成的眨眼。
+
+    所有通道在一次向量化计算中求值, 相同种子下同一时刻的输出完全一致 (眨眼要求按时间顺序求值)。
+    """
+
+    def __init__(self, config: ProceduralIdleConfig, seed: Optional[int] = None):
+        self.config = config
+        self.seed = seed if seed is not None else random.randrange(2**31)
+        channels = config.CHANNELS
+        self.parameters = [channel.PARAMETER for channel in channels]
+
+        keys = [channel.NOISE_KEY or channel.PARAMETER for channel in channels]
+        unique_keys = list(dict.fromkeys(keys))
+        # 每个噪声序列一行梯度表
+        self._gradients = np.stack(
+            [
+                np.random.default_rng(_stream_seed(self.seed, key)).uniform(-1.0, 1.0, GRADIENT_TABLE_SIZE)
+                for key in unique_keys
+            ],
+        ) if unique_keys else np.zeros((0, GRADIENT_TABLE_SIZE))
+        self._key_index = np.array([unique_keys.index(key) for key in keys], dtype=np.intp)
+
+        self._center = np.array([channel.CENTER for channel in channels], dtype=np.float64)
+        self._noise_amplitude = np.array([channel.NOISE_AMPLITUDE for channel in channels], dtype=np.float64)
+        self._noise_frequency = np.array([1.0 / channel.NOISE_PERIOD for channel in channels], dtype=np.float64)
+        self._octaves = np.array([channel.NOISE_OCTAVES for channel in channels], dtype=np.intp)
+        self._wave_amplitude = np.array([channel.WAVE_AMPLITUDE for channel in channels], dtype=np.float64)
+        self._wave_frequency = np.array([2 * math.pi / channel.WAVE_PERIOD for channel in channels], dtype=np.float64)
+        self._wave_phase = np.array([channel.WAVE_PHASE for channel in channels], dtype=np.float64)
+        self._min = np.array([-np.inf if channel.MIN is None else channel.MIN for channel in channels], dtype=np.float64)
+        self._max = np.array([np.inf if channel.MAX is None else channel.MAX for channel in channels], dtype=np.float64)
+
+        self._blink = _BlinkSchedule(config.BLINK, self.seed) if config.BLINK.ENABLED else None
+
+    def _noise(self, x: np.ndarray) -> np.ndarray:
+        """一维梯度噪声, 输出约在 [-1, 1]"""
+        floor = np.floor(x)
+        f = x - floor
+        i0 = floor.astype(np.intp) % GRADIENT_TABLE_SIZE
+        i1 = (i0 + 1) % GRADIENT_TABLE_SIZE
+        g0 = self._gradients[self._key_index, i0]
+        g1 = self._gradients[self._key_index, i1]
+        fade = f * f * f * (f * (f * 6 - 15) + 10)
+        return 2 * (g0 * f + fade * (g1 * (f - 1) - g0 * f))
+
+    def _fractal_noise(self, t: float) -> np.ndarray:
+        x = t * self._noise_frequency
+        total = np.zeros_like(x)
+        norm = np.zeros_like(x)
+        for octave in range(int(self._octaves.max(initial=0))):
+            weight = np.where(octave < self._octaves, 0.5**octave, 0.0)
+            # 每层错开采样位置, 避免各层在整数点同时为 0
+            total += weight * self._noise(x * 2**octave + octave * 17.31)
+            norm += weight
+        return total / np.maximum(norm, 1e-9)
+
+    def evaluate(self, t: float) -> Dict[str, float]:
+        """求 t 时刻 (秒) 所有待机参数的值"""
+        values: Dict[str, float] = {}
+        if self.parameters:
+            output = (
+                self._center
+                + self._noise_amplitude * self._fractal_noise(t)
+                + self._wave_amplitude * np.sin(self._wave_frequency * t + self._wave_phase)
+            )
+            output = np.clip(output, self._min, self._max)
+            values.update(zip(self.parameters, output.tolist()))
+
+        if self._blink is not None:
+            blink = self.config.BLINK
+            value = blink.MAX_VALUE + (blink.MIN_VALUE - blink.MAX_VALUE) * self._blink.closure(t)
+            values[blink.LEFT_PARAMETER] = value
+            values[blink.RIGHT_PARAMETER] = value
+        return values
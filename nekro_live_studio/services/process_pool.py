@@ -0,0 +1,204 @@
+import asyncio
+import contextlib
+import subprocess
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..configs.config import config
+from ..utils.logger import logger
+
+ProcessKey = Tuple[str, ...]
+
+# 启动备用进程失败 (如可执行文件不存在) 后, 再次尝试之前等待的时长(秒)
+SPAWN_RETRY_INTERVAL = 30.0
+
+
+@dataclass
+class ProcessPoolStats:
+    """预启动进程池统计信息"""
+
+    warm_hits: int
+    """直接取到备用进程的次数"""
+    cold_spawns: int
+    """没有可用备用进程, 临时启动的次数"""
+    recycled: int
+    """空闲过久被回收的备用进程数"""
+    died: int
+    """健康检查时发现已退出的备用进程数"""
+    spares: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.warm_hits + self.cold_spawns
+        return self.warm_hits / total if total else 0.0
+
+
+@dataclass
+class _Spare:
+    process: asyncio.subprocess.Process
+    spawned_at: float
+
+
+class ProcessPool:
+    """
+    预启动子进程池: 按完整命令行为每种命令保留若干个已启动、正在等待标准输入的备用进程。
+
+    ffplay 与 ffmpeg 读取管道输入直到 EOF 后退出, 无法在同一进程中重置后播放下一段, 因此这里不复用进程,
+    而是提前付出启动开销: 取走一个备用进程后立即在后台补充。后台监督任务定期清理已退出的备用进程,
+    并回收空闲超过 max_idle 秒的进程, 避免长期持有的进程状态异常。
+    """
+
+    def __init__(self, size: int, max_idle: float, check_interval: float):
+        self.size = size
+        self.max_idle = max_idle
+        self.check_interval = check_interval
+        self._spares: Dict[ProcessKey, Deque[_Spare]] = {}
+        self._spawning: Dict[ProcessKey, int] = {}
+        # start 时指定的常用命令始终保留备用进程, 其他命令只在最近 max_idle 秒内用过时保留
+        self._pinned: set[ProcessKey] = set()
+        self._last_used: Dict[ProcessKey, float] = {}
+        self._retry_after: Dict[str, float] = {}
+        self._supervisor: Optional[asyncio.Task] = None
+        self._background: set[asyncio.Task] = set()
+        self._warm_hits = 0
+        self._cold_spawns = 0
+        self._recycled = 0
+        self._died = 0
+
+    @staticmethod
+    async def _spawn(key: ProcessKey) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            *key,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def start(self, keys: Iterable[Sequence[str]] = ()):
+        """启动监督任务, 并为 keys 中的命令预先启动备用进程"""
+        if self.size <= 0:
+            return
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise())
+        for key in map(tuple, keys):
+            self._pinned.add(key)
+            self._spares.setdefault(key, deque())
+            self._replenish(key)
+
+    async def stop(self):
+        """停止监督任务并结束所有备用进程"""
+        tasks = [task for task in (self._supervisor, *self._background) if task]
+        self._supervisor = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._background.clear()
+        spares = [spare for queue in self._spares.values() for spare in queue]
+        self._spares.clear()
+        for spare in spares:
+            await self._terminate(spare.process)
+
+    async def acquire(self, args: Sequence[str]) -> asyncio.subprocess.Process:
+        """
+        取得一个执行 args 的进程, 标准输入、输出、错误均为管道。
+
+        有健康的备用进程时直接返回, 否则临时启动; 之后在后台补充该命令的备用进程。
+        """
+        key = tuple(args)
+        self._last_used[key] = time.monotonic()
+        queue = self._spares.setdefault(key, deque())
+        process = None
+        while queue:
+            spare = queue.popleft()
+            if spare.process.returncode is None:
+                process = spare.process
+                self._warm_hits += 1
+                break
+            self._died += 1
+            logger.warning(f"备用进程 {key[0]} 已退出 (返回码 {spare.process.returncode}), 改用其他进程")
+        if process is None:
+            process = await self._spawn(key)
+            self._cold_spawns += 1
+        self._replenish(key)
+        return process
+
+    def stats(self) -> ProcessPoolStats:
+        return ProcessPoolStats(
+            warm_hits=self._warm_hits,
+            cold_spawns=self._cold_spawns,
+            recycled=self._recycled,
+            died=self._died,
+            spares=sum(len(queue) for queue in self._spares.values()),
+        )
+
+    def _replenish(self, key: ProcessKey):
+        if self._supervisor is None:
+            return
+        missing = self.size - len(self._spares.get(key, ())) - self._spawning.get(key, 0)
+        if missing <= 0 or time.monotonic() < self._retry_after.get(key[0], 0.0):
+            return
+        self._spawning[key] = self._spawning.get(key, 0) + missing
+        for _ in range(missing):
+            task = asyncio.create_task(self._add_spare(key))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _add_spare(self, key: ProcessKey):
+        try:
+            process = await self._spawn(key)
+        except OSError as e:
+            self._retry_after[key[0]] = time.monotonic() + SPAWN_RETRY_INTERVAL
+            logger.warning(f"预启动 {key[0]} 失败, {SPAWN_RETRY_INTERVAL:.0f}s 后重试: {e}")
+            return
+        finally:
+            self._spawning[key] -= 1
+        self._spares.setdefault(key, deque()).append(_Spare(process, time.monotonic()))
+
+    async def _terminate(self, process: asyncio.subprocess.Process):
+        if process.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+        await process.wait()
+
+    async def _check(self):
+        """清理已退出与空闲过久的备用进程, 并补足数量; 空闲过久且不再使用的命令不再补充"""
+        now = time.monotonic()
+        expired: List[_Spare] = []
+        for key, queue in list(self._spares.items()):
+            healthy: List[_Spare] = []
+            for spare in queue:
+                if spare.process.returncode is not None:
+                    self._died += 1
+                    logger.warning(f"备用进程 {key[0]} 意外退出 (返回码 {spare.process.returncode})")
+                elif now - spare.spawned_at > self.max_idle:
+                    expired.append(spare)
+                else:
+                    healthy.append(spare)
+            queue.clear()
+            queue.extend(healthy)
+            if key in self._pinned or now - self._last_used.get(key, 0.0) <= self.max_idle:
+                self._replenish(key)
+            elif not queue:
+                del self._spares[key]
+                self._last_used.pop(key, None)
+        # 先移出队列并安排补充, 再逐个结束旧进程
+        self._recycled += len(expired)
+        for spare in expired:
+            await self._terminate(spare.process)
+
+    async def _supervise(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self._check()
+            except Exception as e:
+                logger.error(f"检查预启动进程池时出错: {e}")
+
+
+process_pool = ProcessPool(
+    size=config.FFMPEG.WORKER_POOL_SIZE,
+    max_idle=config.FFMPEG.WORKER_MAX_IDLE,
+    check_interval=config.FFMPEG.WORKER_CHECK_INTERVAL,
+)
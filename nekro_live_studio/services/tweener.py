@@ -1,12 +1,68 @@
 import asyncio
+import bisect
 import contextlib
 import random
-from typing import Dict, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from ..clients.vtube_studio.plugin import VTSPlugin, plugin
 from ..utils.easing import Easing
 from ..utils.logger import logger
 
+if TYPE_CHECKING:
+    from .animation_baker import BakedCurve, BakedVariant
+
+
+class TweenSegment(NamedTuple):
+    """轨道中的单个缓动段, offset 为相对轨道起点的开始时间"""
+
+    offset: float
+    end: float
+    duration: float
+    easing_func: Callable[[float], float]
+    start: Optional[float] = None
+
+
+class Keyframe(NamedTuple):
+    """关键帧轨道中的单个关键帧, easing_func 用于从上一关键帧过渡到此关键帧"""
+
+    time: float
+    value: float
+    easing_func: Callable[[float], float]
+
+
+def sample_keyframes(keyframes: Sequence[Keyframe], times: Sequence[float], start: float, t: float) -> float:
+    """
+    计算关键帧轨道在 t 时刻的值。
+
+    Args:
+        keyframes: 按时间升序排列的关键帧
+        times: 各关键帧的时间, 供二分查找
+        start: 轨道起点 (t=0) 的值, 第一个关键帧之前由该值过渡到第一个关键帧
+        t: 相对轨道起点的时间
+    """
+    index = bisect.bisect_right(times, t)
+    if index >= len(keyframes):
+        return keyframes[-1].value
+    keyframe = keyframes[index]
+    if index == 0:
+        prev_time, prev_value = 0.0, start
+    else:
+        prev_time, prev_value = keyframes[index - 1].time, keyframes[index - 1].value
+    span = keyframe.time - prev_time
+    if span <= 0:
+        return keyframe.value
+    return prev_value + (keyframe.value - prev_value) * keyframe.easing_func((t - prev_time) / span)
+
 
 class Tweener:
     """
@@ -169,21 +225,280 @@ class Tweener:
                     if active_task is current_task:
                         del self._active_tweens[param]
 
+    async def tween_track(
+        self,
+        param: str,
+        segments: Sequence[TweenSegment],
+        mode: str = "set",
+        fps: int = 60,
+        priority: int = 0,
+    ):
+        """
+        在单个任务中按时间顺序播放同一参数的多个缓动段。
+
+        每一段的优先级判定与单独调用 tween 完全一致, 段与段之间的空隙不占用参数,
+        由保活机制维持当前值。某段开始时若已落后于计划时间, 则立即开始。
+
+        Args:
+            param: 参数名称
+            segments: 按 offset 升序排列的缓动段
+            mode: 设置模式
+            fps: 帧率
+            priority: 缓动优先级
+        """
+        loop = asyncio.get_event_loop()
+        track_start = loop.time()
+        for segment in segments:
+            wait_time = track_start + segment.offset - loop.time()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            await self.tween(
+                param=param,
+                end=segment.end,
+                duration=segment.duration,
+                easing_func=segment.easing_func,
+                start=segment.start,
+                mode=mode,
+                fps=fps,
+                priority=priority,
+            )
+
+    async def tween_keyframes(
+        self,
+        param: str,
+        keyframes: Sequence[Keyframe],
+        repeat: int = 1,
+        mode: str = "set",
+        fps: int = 60,
+        priority: int = 0,
+    ):
+        """
+        以单个缓动播放整条关键帧轨道, 整条轨道只做一次优先级判定并全程占用参数。
+
+        第一次播放从参数当前值过渡到第一个关键帧, 之后每次重复从最后一个关键帧的值开始。
+        重复播放按帧时间取模计算, 不会展开为多个缓动。
+
+        Args:
+            param: 参数名称
+            keyframes: 按时间升序排列的关键帧
+            repeat: 重复播放次数
+            mode: 设置模式
+            fps: 帧率
+            priority: 缓动优先级
+        """
+        if not keyframes:
+            return
+        cycle = keyframes[-1].time
+        if cycle <= 0:
+            # 所有关键帧都在起点, 等同于即时设置
+            await self.tween(param, keyframes[-1].value, 0.0, keyframes[-1].easing_func, mode=mode, priority=priority)
+            return
+
+        current_task = asyncio.current_task()
+        if not current_task:
+            logger.error("无法在 tween_keyframes 中获取当前任务.")
+            return
+
+        async with self._lock:
+            if param in self._active_tweens:
+                _existing_task, existing_priority = self._active_tweens[param]
+                if priority <= existing_priority:
+                    logger.debug(
+                        f"参数 {param} 的关键帧轨道被拒绝，因为已存在一个优先级为 "
+                        f"{existing_priority} 的缓动在运行 (新请求优先级: {priority}).",
+                    )
+                    return
+            first_start = self.controlled_params.get(param, 0.0)
+            self._active_tweens[param] = (current_task, priority)
+
+        times = [keyframe.time for keyframe in keyframes]
+        loop_start = keyframes[-1].value
+        duration = cycle * repeat
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        steps = max(1, int(duration * fps))
+        interval = duration / steps
+
+        try:
+            for step in range(steps):
+                elapsed = (step + 1) * interval
+                cycle_index = min(int(elapsed // cycle), repeat - 1)
+                value = sample_keyframes(
+                    keyframes,
+                    times,
+                    first_start if cycle_index == 0 else loop_start,
+                    elapsed - cycle_index * cycle,
+                )
+
+                async with self._lock:
+                    active_task_tuple = self._active_tweens.get(param)
+                    if not active_task_tuple or active_task_tuple[0] is not current_task:
+                        # 已被更高优先级的缓动接管
+                        return
+                    self.controlled_params[param] = value
+                await self._plugin.set_parameter_value(param, value, mode=mode)
+
+                sleep_time = start_time + (step + 1) * interval - loop.time()
+                if sleep_time > 0:
+                    await asyncio.sleep(sleep_time)
+        except asyncio.CancelledError:
+            logger.debug(f"参数 {param} 的关键帧轨道任务被取消.")
+            raise
+        finally:
+            async with self._lock:
+                if param in self._active_tweens:
+                    active_task, _ = self._active_tweens[param]
+                    if active_task is current_task:
+                        del self._active_tweens[param]
+
+    async def play_baked(
+        self,
+        variant: "BakedVariant",
+        fps: int,
+        mode: str = "set",
+        priority: int = 0,
+    ):
+        """
+        逐帧播放预烘焙的参数曲线, 不做缓动计算, 每帧的所有参数合并为一次注入请求。
+
+        每条曲线在其第一帧做一次优先级判定并占用参数直到最后一帧, 被拒绝或被更高优先级
+        接管的曲线不再输出。
+
+        Args:
+            variant: 烘焙变体
+            fps: 烘焙时的帧率
+            mode: 设置模式
+            priority: 缓动优先级
+        """
+        current_task = asyncio.current_task()
+        if not current_task:
+            logger.error("无法在 play_baked 中获取当前任务.")
+            return
+
+        pending = sorted(variant.curves, key=lambda curve: curve.start_frame)
+        next_pending = 0
+        # 曲线 -> 开始时参数的值
+        active: List[Tuple["BakedCurve", float]] = []
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        frame_count = variant.frame_count
+        frame = 0
+
+        try:
+            while frame < frame_count:
+                values: Dict[str, float] = {}
+                async with self._lock:
+                    while next_pending < len(pending) and pending[next_pending].start_frame <= frame:
+                        curve = pending[next_pending]
+                        next_pending += 1
+                        existing = self._active_tweens.get(curve.parameter)
+                        if existing and priority <= existing[1]:
+                            logger.debug(
+                                f"参数 {curve.parameter} 的烘焙曲线被拒绝，因为已存在一个优先级为 "
+                                f"{existing[1]} 的缓动在运行 (新请求优先级: {priority}).",
+                            )
+                            continue
+                        self._active_tweens[curve.parameter] = (current_task, priority)
+                        active.append((curve, self.controlled_params.get(curve.parameter, 0.0)))
+
+                    still_active: List[Tuple["BakedCurve", float]] = []
+                    for curve, start_value in active:
+                        owner = self._active_tweens.get(curve.parameter)
+                        if not owner or owner[0] is not current_task:
+                            continue
+                        value = curve.value(frame, start_value)
+                        self.controlled_params[curve.parameter] = value
+                        values[curve.parameter] = value
+                        if frame + 1 < curve.end_frame:
+                            still_active.append((curve, start_value))
+                        else:
+                            del self._active_tweens[curve.parameter]
+                    active = still_active
+
+                if values:
+                    await self._plugin.set_parameter_values(values, mode=mode)
+
+                if active:
+                    frame += 1
+                elif next_pending < len(pending):
+                    # 曲线之间的空隙不需要逐帧唤醒
+                    frame = pending[next_pending].start_frame
+                else:
+                    break
+
+                sleep_time = start_time + frame / fps - loop.time()
+                if sleep_time > 0:
+                    await asyncio.sleep(sleep_time)
+        except asyncio.CancelledError:
+            logger.debug("烘焙动画播放任务被取消.")
+            raise
+        finally:
+            async with self._lock:
+                for curve, _ in active:
+                    owner = self._active_tweens.get(curve.parameter)
+                    if owner and owner[0] is current_task:
+                        del self._active_tweens[curve.parameter]
+
+    def active_params(self) -> Set[str]:
+        """当前正被缓动控制的参数"""
+        return set(self._active_tweens)
+
+    async def set_frame(self, values: Dict[str, float], mode: str = "set") -> Dict[str, float]:
+        """
+        在一次注入请求中设置一帧的多个参数值, 正在被缓动的参数保持由缓动控制, 不会被覆盖。
+
+        Returns:
+            实际设置的参数值
+        """
+        async with self._lock:
+            applied = {param: value for param, value in values.items() if param not in self._active_tweens}
+            self.controlled_params.update(applied)
+        if applied:
+            await self._plugin.set_parameter_values(applied, mode=mode)
+        return applied
+
     def release_all(self):
         """释放所有参数的控制权。"""
         self.controlled_params.clear()
         logger.info("已释放所有 Tweener 控制的参数.")
 
     @staticmethod
-    def random_easing():
-        """随机从常用缓动函数中选择一个，按权重分布。"""
+    def random_easing(rng: Optional[random.Random] = None):
+        """随机从常用缓动函数中选择一个，按权重分布。可传入独立的随机数生成器以复现结果。"""
         funcs = [
             Easing.in_out_sine,
             Easing.in_out_quad,
             Easing.in_out_back,
         ]
         weights = [0.75, 0.15, 0.1]
-        return random.choices(funcs, weights=weights)[0]
+        return (rng or random).choices(funcs, weights=weights)[0]
+
+
+class ReturnBlend:
+    """
+    逐帧输出待机动作的控制器使用: 参数被缓动接管期间不覆盖, 缓动释放后从缓动的终值平滑过渡回待机输出。
+    """
+
+    def __init__(self, duration: float):
+        self.duration = duration
+        # 上一帧被缓动接管的参数
+        self._overridden: Set[str] = set()
+        # 正在过渡回待机输出的参数 -> (开始时间, 起始值)
+        self._returning: Dict[str, Tuple[float, float]] = {}
+
+    def apply(self, tweener: Tweener, values: Dict[str, float], now: float) -> Dict[str, float]:
+        """就地混合 values 中正在过渡的参数并返回"""
+        overridden = tweener.active_params() & values.keys()
+        for param in self._overridden - overridden:
+            self._returning[param] = (now, tweener.controlled_params.get(param, values[param]))
+        self._overridden = overridden
+        for param, (start, from_value) in list(self._returning.items()):
+            progress = (now - start) / self.duration
+            if progress >= 1 or param in overridden or param not in values:
+                del self._returning[param]
+                continue
+            values[param] = from_value + (values[param] - from_value) * Easing.out_sine(progress)
+        return values
 
 
 # 创建一个全局单例
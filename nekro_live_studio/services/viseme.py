@@ -0,0 +1,122 @@
+import math
+import time
+from typing import Callable, List, Optional, Tuple
+
+from ..utils.logger import logger
+from ..utils.stream_tee import TeeConsumer
+from .audio_decode import decode_audio_stream
+from .loudness import SILENCE_FLOOR, LoudnessEnvelope, Weighting
+
+PlaybackClock = Callable[[], Optional[float]]
+
+# 外部时钟停止报告 (如播放卡顿) 时最多向后外推的时长(秒)
+MAX_EXTRAPOLATION = 0.25
+
+
+class VisemeTimeline:
+    """
+    一句语音的口型时间轴: 分析端在解码后立即追加每个步长的响度与明亮度, 通常领先实际播放;
+    播放端提供播放时钟 (已被听到的时长, 秒), 嘴型控制器按 "时钟 + 提前量" 在时间轴上取值。
+    """
+
+    def __init__(self):
+        self.hop: float = 0.0
+        self.loudness: List[float] = []
+        self.brightness: List[float] = []
+        self.analysis_done = False
+        self.closed = False
+        """播放已结束 (或失败)"""
+        self._clock: Optional[PlaybackClock] = None
+
+    @property
+    def duration(self) -> float:
+        return len(self.loudness) * self.hop
+
+    def extend(self, hop: float, loudness: List[float], brightness: List[float]):
+        self.hop = hop
+        self.loudness.extend(loudness)
+        self.brightness.extend(brightness)
+
+    def finish_analysis(self):
+        self.analysis_done = True
+
+    def set_clock(self, clock: PlaybackClock):
+        self._clock = clock
+
+    def close(self):
+        self.closed = True
+
+    def position(self) -> Optional[float]:
+        """当前播放位置, 播放尚未开始时为 None"""
+        return self._clock() if self._clock else None
+
+    def sample(self, t: float) -> Optional[Tuple[float, float]]:
+        """
+        取 t 秒处的 (响度, 明亮度), 在相邻步长的中心之间线性插值; t 超出已分析的范围时返回 None,
+        t 为负 (尚未开口) 时返回静音。
+        """
+        if t < 0:
+            return SILENCE_FLOOR, 0.0
+        count = len(self.loudness)
+        if not count:
+            return None
+        # 每个值代表一个步长的平均, 对应步长的中心时刻
+        position = t / self.hop - 0.5
+        if position > count - 1:
+            return None
+        index = max(math.floor(position), 0)
+        following = min(index + 1, count - 1)
+        weight = min(max(position - index, 0.0), 1.0)
+        loudness = self.loudness[index] + (self.loudness[following] - self.loudness[index]) * weight
+        brightness = self.brightness[index] + (self.brightness[following] - self.brightness[index]) * weight
+        return loudness, brightness
+
+
+class ExtrapolatedClock:
+    """
+    由外部周期性报告的播放位置外推出连续的时钟, 例如 ffplay 状态行中的音频时钟 (约每 30 ms 一次)。
+
+    尚未收到报告时, 在 fallback_latency 不为 None 的情况下按 "开始写入后经过的时间 - fallback_latency" 估算。
+    """
+
+    def __init__(self, fallback_latency: Optional[float] = None):
+        self.fallback_latency = fallback_latency
+        self._reported: Optional[float] = None
+        self._reported_at = 0.0
+        self._started_at: Optional[float] = None
+
+    def mark_started(self):
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+
+    def report(self, position: float):
+        self._reported = position
+        self._reported_at = time.perf_counter()
+
+    def __call__(self) -> Optional[float]:
+        now = time.perf_counter()
+        if self._reported is not None:
+            return self._reported + min(now - self._reported_at, MAX_EXTRAPOLATION)
+        if self._started_at is None or self.fallback_latency is None:
+            return None
+        return max(now - self._started_at - self.fallback_latency, 0.0)
+
+
+async def analyze_viseme_stream(
+    audio_stream: TeeConsumer,
+    timeline: VisemeTimeline,
+    hop: float,
+    weighting: Weighting = "k",
+):
+    """解码音频流并把每个步长的响度与明亮度追加到口型时间轴"""
+    envelope: Optional[LoudnessEnvelope] = None
+    try:
+        async for samples, sample_rate in decode_audio_stream(audio_stream):
+            if envelope is None:
+                envelope = LoudnessEnvelope(sample_rate, hop, weighting)
+            timeline.extend(envelope.hop, *envelope.feed_with_brightness(samples))
+    except Exception as e:
+        logger.warning(f"口型分析失败: {e}")
+    finally:
+        await audio_stream.aclose()
+        timeline.finish_analysis()
@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """缓存统计信息"""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    weight: int
+    max_size: Optional[int]
+    max_weight: Optional[int]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    最近最少使用缓存, 可同时按条目数和总权重 (如字节数) 限制容量。
+
+    Args:
+        max_size: 最大条目数, 为 None 时不限制
+        max_weight: 最大总权重, 为 None 时不限制
+        weigher: 计算单个值权重的函数, 默认每个值权重为 1
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[V], int]] = None,
+    ):
+        self.max_size = max_size
+        self.max_weight = max_weight
+        self._weigher = weigher or (lambda _value: 1)
+        self._entries: "OrderedDict[K, Tuple[V, int]]" = OrderedDict()
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[K]:
+        # 遍历键的快照, 遍历过程中可以删除条目
+        return iter(list(self._entries))
+
+    def keys(self) -> Iterator[K]:
+        return iter(self)
+
+    @property
+    def weight(self) -> int:
+        return self._weight
+
+    def get(self, key: K) -> Optional[V]:
+        """读取并标记为最近使用, 计入命中/未命中统计"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def peek(self, key: K) -> Optional[V]:
+        """读取但不改变顺序, 也不计入统计"""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def put(self, key: K, value: V) -> bool:
+        """写入缓存并按容量淘汰最久未使用的条目, 单个值超过总权重上限时不缓存并返回 False"""
+        weight = self._weigher(value)
+        if self.max_weight is not None and weight > self.max_weight:
+            return False
+        self.pop(key)
+        self._entries[key] = (value, weight)
+        self._weight += weight
+        self._evict()
+        return True
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._weight -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self._weight = 0
+
+    def _evict(self):
+        while self._entries and (
+            (self.max_size is not None and len(self._entries) > self.max_size)
+            or (self.max_weight is not None and self._weight > self.max_weight)
+        ):
+            _, (_, weight) = self._entries.popitem(last=False)
+            self._weight -= weight
+            self.evictions += 1
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._entries),
+            weight=self._weight,
+            max_size=self.max_size,
+            max_weight=self.max_weight,
+        )
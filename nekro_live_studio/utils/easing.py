@@ -1,4 +1,18 @@
 import math
+import re
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from .cache import CacheStats, LRUCache
+from .logger import logger
+
+# 参数化缓动查找表的采样点数
+EASING_TABLE_SIZE = 512
+# 最多缓存的参数化缓动查找表数量
+EASING_CACHE_SIZE = 128
+# 弹簧缓动振幅衰减到该比例以下视为静止
+SPRING_SETTLE_THRESHOLD = 1e-3
 
 
 class Easing:
@@ -192,3 +206,172 @@ class Easing:
         if t < 0.5:
             return 8 * pow(2, 8 * (t - 1)) * abs(math.sin(t * math.pi * 7))
         return 1 - 8 * pow(2, -8 * t) * abs(math.sin(t * math.pi * 7))
+
+
+EasingFunc = Callable[[float], float]
+
+_PARAMETRIC_PATTERN = re.compile(r"^\s*([a-z-]+)\s*\((.*)\)\s*$")
+
+
+class EasingTable:
+    """
+    编译为查找表的缓动函数, 每次求值只做一次查表与线性插值, 与曲线的定义方式无关。
+
+    Args:
+        name: 规范化后的缓动描述, 如 cubic-bezier(0.25,0.1,0.25,1)
+        values: 在 [0, 1] 上等距采样的曲线值
+        step: 为 True 时按区间取值而不插值 (用于 steps)
+        jump_start: 阶梯缓动在区间起点跳变
+    """
+
+    __slots__ = ("__name__", "_jump_start", "_last", "_step", "_values")
+
+    def __init__(self, name: str, values: List[float], step: bool = False, jump_start: bool = False):
+        self.__name__ = name
+        self._values = values
+        self._last = len(values) - 1
+        self._step = step
+        self._jump_start = jump_start
+
+    def __call__(self, t: float) -> float:
+        if t <= 0:
+            return self._values[0]
+        if t >= 1:
+            return self._values[self._last]
+        x = t * self._last
+        i = int(x)
+        if self._step:
+            if self._jump_start and x > i:
+                i += 1
+            return self._values[i]
+        v0 = self._values[i]
+        return v0 + (self._values[i + 1] - v0) * (x - i)
+
+    def __repr__(self) -> str:
+        return f"EasingTable({self.__name__})"
+
+
+def _parse_numbers(kind: str, args: str, count: int) -> Tuple[float, ...]:
+    parts = [part.strip() for part in args.split(",")]
+    if len(parts) != count:
+        raise ValueError(f"{kind} 需要 {count} 个参数, 实际为 {len(parts)} 个")
+    try:
+        return tuple(float(part) for part in parts)
+    except ValueError:
+        raise ValueError(f"{kind} 的参数必须是数字: '{args}'") from None
+
+
+def _compile_cubic_bezier(x1: float, y1: float, x2: float, y2: float) -> EasingTable:
+    if not (0 <= x1 <= 1 and 0 <= x2 <= 1):
+        raise ValueError("cubic-bezier 的 x1 与 x2 必须在 [0, 1] 范围内")
+    t = np.linspace(0.0, 1.0, EASING_TABLE_SIZE)
+    # x(s) 在 x1, x2 ∈ [0, 1] 时单调, 对所有采样点同时二分求解 x(s) = t
+    low = np.zeros_like(t)
+    high = np.ones_like(t)
+    for _ in range(40):
+        s = (low + high) / 2
+        x = 3 * (1 - s) ** 2 * s * x1 + 3 * (1 - s) * s**2 * x2 + s**3
+        below = x < t
+        low = np.where(below, s, low)
+        high = np.where(below, high, s)
+    s = (low + high) / 2
+    y = 3 * (1 - s) ** 2 * s * y1 + 3 * (1 - s) * s**2 * y2 + s**3
+    y[0], y[-1] = 0.0, 1.0
+    return EasingTable(f"cubic-bezier({x1:g},{y1:g},{x2:g},{y2:g})", y.tolist())
+
+
+def _compile_steps(count: int, jump_start: bool) -> EasingTable:
+    if count < 1:
+        raise ValueError("steps 的阶数必须为正整数")
+    values = [i / count for i in range(count + 1)]
+    return EasingTable(f"steps({count},{'start' if jump_start else 'end'})", values, step=True, jump_start=jump_start)
+
+
+def _compile_spring(stiffness: float, damping: float) -> EasingTable:
+    """单位质量弹簧从 0 释放到 1 的阶跃响应, 时间轴缩放到振幅衰减至静止为止"""
+    if stiffness <= 0 or damping <= 0:
+        raise ValueError("spring 的刚度与阻尼必须为正数")
+    omega0 = math.sqrt(stiffness)
+    zeta = damping / (2 * omega0)
+    if zeta < 1:
+        decay = zeta * omega0
+        omega_d = omega0 * math.sqrt(1 - zeta * zeta)
+    elif zeta == 1:
+        decay = omega0
+    else:
+        root = omega0 * math.sqrt(zeta * zeta - 1)
+        r1, r2 = -zeta * omega0 + root, -zeta * omega0 - root
+        decay = -r1
+    settle = -math.log(SPRING_SETTLE_THRESHOLD) / decay
+    tau = np.linspace(0.0, settle, EASING_TABLE_SIZE)
+    if zeta < 1:
+        y = 1 - np.exp(-decay * tau) * (np.cos(omega_d * tau) + decay / omega_d * np.sin(omega_d * tau))
+    elif zeta == 1:
+        y = 1 - np.exp(-omega0 * tau) * (1 + omega0 * tau)
+    else:
+        y = 1 + (r2 * np.exp(r1 * tau) - r1 * np.exp(r2 * tau)) / (r1 - r2)
+    y[-1] = 1.0
+    return EasingTable(f"spring({stiffness:g},{damping:g})", y.tolist())
+
+
+_easing_tables: LRUCache[Tuple[object, ...], EasingTable] = LRUCache(max_size=EASING_CACHE_SIZE)
+
+
+def _parametric_easing(kind: str, args: str) -> EasingTable:
+    if kind == "cubic-bezier":
+        key: Tuple[object, ...] = (kind, *_parse_numbers(kind, args, 4))
+    elif kind == "steps":
+        parts = [part.strip() for part in args.split(",")]
+        if len(parts) not in (1, 2) or (len(parts) == 2 and parts[1] not in ("start", "end")):
+            raise ValueError("steps 的格式为 steps(n) 或 steps(n, start|end)")
+        try:
+            count = int(parts[0])
+        except ValueError:
+            raise ValueError(f"steps 的阶数必须为整数: '{parts[0]}'") from None
+        key = (kind, count, len(parts) == 2 and parts[1] == "start")
+    elif kind == "spring":
+        key = (kind, *_parse_numbers(kind, args, 2))
+    else:
+        raise ValueError(f"未知的参数化缓动 '{kind}'")
+
+    table = _easing_tables.get(key)
+    if table is None:
+        if kind == "cubic-bezier":
+            table = _compile_cubic_bezier(*key[1:])
+        elif kind == "steps":
+            table = _compile_steps(*key[1:])
+        else:
+            table = _compile_spring(*key[1:])
+        _easing_tables.put(key, table)
+    return table
+
+
+def parse_easing(spec: str) -> EasingFunc:
+    """
+    解析缓动描述: Easing 上的函数名, 或参数化缓动 cubic-bezier(x1,y1,x2,y2) / steps(n[,start|end]) / spring(k,d)。
+
+    参数化缓动按参数编译为查找表并缓存, 相同参数的描述共享同一张表。
+
+    Raises:
+        ValueError: 无法解析的描述
+    """
+    match = _PARAMETRIC_PATTERN.match(spec)
+    if match:
+        return _parametric_easing(match.group(1), match.group(2))
+    easing_func = getattr(Easing, spec, None) if not spec.startswith("_") else None
+    if easing_func is None:
+        raise ValueError(f"缓动函数 '{spec}' 未找到")
+    return easing_func
+
+
+def resolve_easing(spec: str) -> EasingFunc:
+    """解析缓动描述, 无法解析时回退到线性缓动"""
+    try:
+        return parse_easing(spec)
+    except ValueError as e:
+        logger.warning(f"{e}. 回退到线性缓动.")
+        return Easing.linear
+
+
+def get_easing_cache_stats() -> CacheStats:
+    return _easing_tables.stats()
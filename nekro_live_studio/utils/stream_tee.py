@@ -0,0 +1,216 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Literal, Optional
+
+from .logger import logger
+
+TeePolicy = Literal["block", "drop"]
+
+
+@dataclass
+class TeeStats:
+    """分流统计信息"""
+
+    buffered_bytes: Dict[str, int]
+    """各消费者尚未读取的字节数"""
+    peak_buffered_bytes: int
+    """所有消费者中出现过的最大积压字节数"""
+    capacity: int
+    forwarded_bytes: int
+    blocked_seconds: float
+    """生产者因缓冲区已满等待的总时长"""
+    dropped: List[str] = field(default_factory=list)
+    """因积压超过容量被断开的消费者"""
+
+
+class TeeConsumer:
+    """
+    StreamTee 的一个读取端, 异步迭代得到环形缓冲区上的 memoryview。
+
+    返回的视图只在下一次迭代 (或 aclose) 之前有效, 需要保留数据时应自行复制。
+    """
+
+    def __init__(self, tee: "StreamTee", name: str, policy: TeePolicy):
+        self.tee = tee
+        self.name = name
+        self.policy = policy
+        self.cursor = 0
+        self.detached = False
+        self.pending = 0
+        """当前视图的字节数, 释放之前该区域不能被覆盖"""
+
+    def __aiter__(self) -> "TeeConsumer":
+        return self
+
+    async def __anext__(self) -> memoryview:
+        return await self.tee.read(self)
+
+    @property
+    def buffered_bytes(self) -> int:
+        return self.tee.backlog(self)
+
+    async def aclose(self):
+        """不再读取, 生产者不再等待此消费者"""
+        await self.tee.release(self)
+
+
+class StreamTee:
+    """
+    把一个字节流分给多个消费者的有界分流器。
+
+    数据只写入一次固定大小的环形缓冲区, 各消费者持有自己的读取位置并直接读取缓冲区上的 memoryview, 不复制数据。
+    写入时若某个消费者的积压将超过容量: policy 为 "block" 的消费者使生产者等待, 为 "drop" 的消费者被断开
+    (其迭代随即结束), 因此内存占用始终不超过 capacity。字节流无法在任意位置丢弃部分数据而不破坏采样对齐,
+    所以 "drop" 断开整个消费者而不是跳过数据。
+
+    转发任务由分流器持有: 源流抛出的异常会在各消费者读完已缓冲的数据后重新抛出, aclose 会取消并等待该任务。
+    """
+
+    def __init__(self, source: AsyncIterator[bytes], capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity 必须大于 0")
+        self.source = source
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._consumers: List[TeeConsumer] = []
+        self._condition = asyncio.Condition()
+        self._written = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+        self._peak_buffered = 0
+        self._blocked_seconds = 0.0
+        self._dropped: List[str] = []
+
+    def add_consumer(self, name: str, policy: TeePolicy = "block") -> TeeConsumer:
+        """添加消费者, 需在 start 之前调用"""
+        if self._task is not None:
+            raise RuntimeError("分流已开始, 不能再添加消费者")
+        consumer = TeeConsumer(self, name, policy)
+        self._consumers.append(consumer)
+        return consumer
+
+    def start(self):
+        self._task = asyncio.create_task(self._forward())
+
+    async def aclose(self):
+        """停止转发并断开所有消费者"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        async with self._condition:
+            self._closed = True
+            for consumer in self._consumers:
+                consumer.detached = True
+            self._condition.notify_all()
+
+    async def read(self, consumer: TeeConsumer) -> memoryview:
+        """释放消费者上一次读取的视图并返回下一段数据, 流已结束或消费者已断开时抛出 StopAsyncIteration"""
+        async with self._condition:
+            # 上一个视图已经用完, 释放其占用的空间
+            if consumer.pending:
+                consumer.cursor += consumer.pending
+                consumer.pending = 0
+                self._condition.notify_all()
+            while not consumer.detached and self._written == consumer.cursor and not self._closed:
+                await self._condition.wait()
+            if consumer.detached:
+                raise StopAsyncIteration
+            if self._written == consumer.cursor:
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            start = consumer.cursor % self.capacity
+            size = min(self._written - consumer.cursor, self.capacity - start)
+            consumer.pending = size
+            return self._view[start : start + size]
+
+    async def release(self, consumer: TeeConsumer):
+        """断开消费者并释放其视图, 生产者不再等待它"""
+        async with self._condition:
+            consumer.detached = True
+            consumer.pending = 0
+            self._condition.notify_all()
+
+    def backlog(self, consumer: TeeConsumer) -> int:
+        """消费者尚未读取的字节数, 已断开的消费者为 0"""
+        return 0 if consumer.detached else self._written - consumer.cursor
+
+    def stats(self) -> TeeStats:
+        return TeeStats(
+            buffered_bytes={consumer.name: consumer.buffered_bytes for consumer in self._consumers},
+            peak_buffered_bytes=self._peak_buffered,
+            capacity=self.capacity,
+            forwarded_bytes=self._written,
+            blocked_seconds=self._blocked_seconds,
+            dropped=list(self._dropped),
+        )
+
+    def _attached(self) -> List[TeeConsumer]:
+        return [consumer for consumer in self._consumers if not consumer.detached]
+
+    def _holders(self) -> List[TeeConsumer]:
+        # 被断开的消费者在释放当前视图之前, 其视图所在的区域仍不能被覆盖
+        return [consumer for consumer in self._consumers if not consumer.detached or consumer.pending]
+
+    async def _reserve(self, size: int) -> int:
+        """等待至少有 1 字节可写, 返回本次可写入的字节数 (不超过 size)"""
+        while True:
+            holders = self._holders()
+            if not holders:
+                return size
+            free = self.capacity - (self._written - min(consumer.cursor for consumer in holders))
+            if free > 0:
+                return min(free, size)
+            # 缓冲区已满: 断开积压已达容量的 drop 消费者, 仍满时等待消费者读取
+            lagging = [
+                consumer
+                for consumer in self._attached()
+                if consumer.policy == "drop" and self._written - consumer.cursor >= self.capacity
+            ]
+            for consumer in lagging:
+                consumer.detached = True
+                self._dropped.append(consumer.name)
+                logger.warning(f"分流消费者 {consumer.name} 积压超过 {self.capacity} 字节, 已断开")
+            if lagging:
+                self._condition.notify_all()
+                continue
+            start = time.perf_counter()
+            await self._condition.wait()
+            self._blocked_seconds += time.perf_counter() - start
+
+    async def _write(self, data: bytes):
+        data = memoryview(data)
+        while data:
+            async with self._condition:
+                if not self._attached():
+                    # 所有消费者都已断开, 剩余数据无处可去
+                    return
+                size = await self._reserve(len(data))
+                start = self._written % self.capacity
+                first = min(size, self.capacity - start)
+                self._view[start : start + first] = data[:first]
+                self._view[: size - first] = data[first:size]
+                self._written += size
+                attached = self._attached()
+                if attached:
+                    lag = self._written - min(consumer.cursor for consumer in attached)
+                    self._peak_buffered = max(self._peak_buffered, lag)
+                self._condition.notify_all()
+            data = data[size:]
+
+    async def _forward(self):
+        try:
+            async for chunk in self.source:
+                await self._write(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            async with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+
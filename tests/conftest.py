@@ -0,0 +1,12 @@
+import os
+
+import pytest
+
+# pygame 在导入时初始化混音器, 需在导入被测模块之前设置
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """各服务按工作目录下的 data 路径读写缓存与配置, 测试在临时目录中运行以免写入仓库"""
+    monkeypatch.chdir(tmp_path)
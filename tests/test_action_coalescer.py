@@ -0,0 +1,69 @@
+from nekro_live_studio.schemas.actions import (
+    Animation,
+    AnimationData,
+    AnimationTrack,
+    Expression,
+    ExpressionData,
+)
+from nekro_live_studio.services.action_coalescer import coalesce_animations
+
+
+def make_animation(parameter: str, delay: float, duration: float = 0.5, priority: int = 0, **extra) -> Animation:
+    return Animation(
+        type="animation",
+        data=AnimationData(parameter=parameter, target=delay, duration=duration, delay=delay, priority=priority),
+        **extra,
+    )
+
+
+def test_sequential_animations_merge_into_track():
+    actions = [make_animation("FaceAngleX", 0.0), make_animation("FaceAngleX", 0.5), make_animation("FaceAngleX", 1.0)]
+
+    coalesced, report = coalesce_animations(actions)
+
+    assert len(coalesced) == 1
+    track = coalesced[0]
+    assert isinstance(track, AnimationTrack)
+    assert [segment.offset for segment in track.data.segments] == [0.0, 0.5, 1.0]
+    assert report.merged_tracks == 1
+    assert report.merged_actions == 3
+    assert report.dropped_actions == 0
+
+
+def test_overlapping_lower_priority_animation_is_dropped():
+    actions = [make_animation("FaceAngleX", 0.0, duration=1.0, priority=2), make_animation("FaceAngleX", 0.5, priority=1)]
+
+    coalesced, report = coalesce_animations(actions)
+
+    assert coalesced == [actions[0]]
+    assert report.dropped_actions == 1
+
+
+def test_higher_priority_preemption_splits_track():
+    actions = [
+        make_animation("FaceAngleX", 0.0, duration=1.0),
+        make_animation("FaceAngleX", 0.5, priority=3),
+        make_animation("FaceAngleX", 1.0, priority=3),
+    ]
+
+    coalesced, report = coalesce_animations(actions)
+
+    assert coalesced[0] is actions[0]
+    assert isinstance(coalesced[1], AnimationTrack)
+    assert len(coalesced) == 2
+    assert report.merged_actions == 2
+
+
+def test_actions_with_dependencies_and_other_types_are_kept():
+    expression = Expression(type="expression", data=ExpressionData(name="smile"))
+    actions = [
+        make_animation("FaceAngleX", 0.0, id="anchor"),
+        expression,
+        make_animation("FaceAngleX", 0.5),
+        make_animation("FaceAngleY", 0.0),
+    ]
+
+    coalesced, report = coalesce_animations(actions)
+
+    assert coalesced is actions
+    assert not report.changed
@@ -0,0 +1,105 @@
+from typing import Iterator
+
+import pytest
+
+from nekro_live_studio.configs.config import config
+from nekro_live_studio.schemas.actions import Animation, AnimationData
+from nekro_live_studio.services.action_scheduler import (
+    ActionQueueFullError,
+    ActionScheduler,
+)
+
+
+def make_animation(parameter: str = "FaceAngleX", **dependency) -> Animation:
+    return Animation(type="animation", data=AnimationData(parameter=parameter, target=1.0, duration=0.5), **dependency)
+
+
+@pytest.fixture
+def scheduler() -> Iterator[ActionScheduler]:
+    scheduler = ActionScheduler()
+    scheduler.clear_queue()
+    yield scheduler
+    scheduler.clear_queue()
+
+
+def test_build_nodes_resolves_after_and_with(scheduler: ActionScheduler):
+    first = make_animation(id="first")
+    follower = make_animation(after="first")
+    companion = make_animation(**{"with": "first"})
+
+    nodes = scheduler._build_nodes([first, follower, companion])
+
+    assert nodes[1].after is nodes[0]
+    assert nodes[1].with_ is None
+    assert nodes[2].with_ is nodes[0]
+    assert nodes[2].after is None
+
+
+def test_build_nodes_ignores_unknown_dependency(scheduler: ActionScheduler):
+    nodes = scheduler._build_nodes([make_animation(after="missing")])
+
+    assert nodes[0].after is None
+    assert nodes[0].with_ is None
+
+
+def test_build_nodes_detects_cycle(scheduler: ActionScheduler):
+    actions = [
+        make_animation(id="a", after="c"),
+        make_animation(id="b", after="a"),
+        make_animation(id="c", **{"with": "b"}),
+    ]
+
+    with pytest.raises(ValueError, match="环"):
+        scheduler._build_nodes(actions)
+
+
+def test_completion_time_follows_after_chain(scheduler: ActionScheduler):
+    scheduler.add_action(make_animation(id="first"))
+    completion = scheduler.add_action(
+        Animation(
+            type="animation",
+            after="first",
+            data=AnimationData(parameter="FaceAngleY", target=1.0, duration=0.25, delay=0.1),
+        ),
+    )
+
+    assert completion == pytest.approx(0.5 + 0.1 + 0.25)
+
+
+def test_add_actions_is_atomic_when_rejected(scheduler: ActionScheduler, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.SCHEDULER, "MAX_QUEUE_LENGTH", 3)
+    monkeypatch.setattr(config.SCHEDULER, "OVERFLOW_POLICY", "reject")
+    scheduler.add_action(make_animation())
+
+    with pytest.raises(ActionQueueFullError):
+        scheduler.add_actions([make_animation(f"Param{index}") for index in range(3)])
+
+    assert len(scheduler.action_queue) == 1
+
+
+def test_drop_oldest_keeps_newest_actions(scheduler: ActionScheduler, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.SCHEDULER, "MAX_QUEUE_LENGTH", 2)
+    monkeypatch.setattr(config.SCHEDULER, "OVERFLOW_POLICY", "drop_oldest")
+    actions = [make_animation(f"Param{index}") for index in range(3)]
+
+    scheduler.add_actions(actions)
+
+    assert list(scheduler.action_queue) == actions[1:]
+
+
+def test_merge_counts_net_queue_reduction(scheduler: ActionScheduler, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.SCHEDULER, "MAX_QUEUE_LENGTH", 3)
+    monkeypatch.setattr(config.SCHEDULER, "OVERFLOW_POLICY", "merge")
+    merged_before = scheduler.metrics.merged
+    # 三个连续的同参数动画合并为一条轨道, 队列净减少 2 个
+    scheduler.add_actions(
+        [
+            Animation(type="animation", data=AnimationData(parameter="FaceAngleX", target=1.0, duration=0.5, delay=delay))
+            for delay in (0.0, 0.5, 1.0)
+        ],
+    )
+
+    scheduler.add_action(make_animation("FaceAngleY"))
+
+    assert len(scheduler.action_queue) == 2
+    assert scheduler.metrics.merged - merged_before == 2
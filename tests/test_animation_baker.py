@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import pytest
+
+from nekro_live_studio.cli import bake_animations
+from nekro_live_studio.schemas.preformed_animation import AnimationTemplate
+from nekro_live_studio.services import animation_player as animation_player_module
+from nekro_live_studio.services.action_scheduler import action_scheduler
+from nekro_live_studio.services.animation_baker import (
+    bake_template,
+    baked_animation_store,
+    baked_path,
+    load_baked,
+    save_baked,
+)
+from nekro_live_studio.services.animation_compiler import compile_template
+from nekro_live_studio.services.animation_player import AnimationPlayer
+from nekro_live_studio.services.tweener import Tweener
+
+FPS = 60
+
+
+def template_content(target: float = 10.0) -> bytes:
+    template = {
+        "name": "nod",
+        "type": "animation",
+        "data": {
+            "params": [{"name": "amplitude", "default": target}],
+            "actions": [{"parameter": "FaceAngleX", "to": {"expr": "amplitude"}, "duration": 0.1}],
+        },
+    }
+    return json.dumps(template).encode("utf-8")
+
+
+def write_and_bake(directory: Path, content: bytes, mtime_ns: int) -> Path:
+    path = directory / "nod.jsonc"
+    path.write_bytes(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    compiled = compile_template(AnimationTemplate.model_validate_json(content))
+    save_baked(baked_path(path), bake_template(compiled, content, fps=FPS))
+    return path
+
+
+class RecordingPlugin:
+    def __init__(self):
+        self.frames: List[Dict[str, float]] = []
+
+    async def set_parameter_values(self, values: Dict[str, float], mode: str = "set"):  # noqa: ARG002
+        self.frames.append(dict(values))
+
+
+def test_bake_save_load_and_play(tmp_path: Path):
+    content = template_content()
+    path = write_and_bake(tmp_path, content, 1_000_000_000)
+
+    baked = load_baked(baked_path(path))
+    assert baked.name == "nod"
+    assert baked.param_key == (10.0,)
+    (variant,) = baked.variants
+    (curve,) = variant.curves
+    assert curve.parameter == "FaceAngleX"
+    assert variant.frame_count == 7
+
+    tweener = Tweener()
+    tweener._plugin = RecordingPlugin()
+    tweener.controlled_params["FaceAngleX"] = 4.0
+    asyncio.run(tweener.play_baked(variant, baked.fps))
+
+    # 线性缓动从运行时的起始值 4 过渡到 10
+    played = [frame["FaceAngleX"] for frame in tweener._plugin.frames]
+    assert played == pytest.approx([4.0 + 6.0 * min(frame / 6, 1.0) for frame in range(7)], abs=1e-5)
+    assert not tweener.active_params()
+
+
+def test_bake_cli(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(bake_animations, "ANIMATIONS_DIR", tmp_path)
+    (tmp_path / "nod.jsonc").write_bytes(template_content())
+
+    monkeypatch.setattr("sys.argv", ["bake_animations", "nod", "missing"])
+    assert bake_animations.main() == 1
+    assert load_baked(tmp_path / "nod.baked.npz").param_key == (10.0,)
+
+    monkeypatch.setattr("sys.argv", ["bake_animations"])
+    assert bake_animations.main() == 0
+
+
+@pytest.fixture
+def player(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[AnimationPlayer]:
+    monkeypatch.setattr(animation_player_module, "ANIMATIONS_DIR", tmp_path)
+    action_scheduler.clear_queue()
+    player = AnimationPlayer()
+    player.load_animations()
+    yield player
+    action_scheduler.clear_queue()
+    monkeypatch.undo()
+    player.load_animations()
+
+
+def queued_types() -> List[str]:
+    return [action.type for action in action_scheduler.action_queue]
+
+
+def test_matching_params_play_the_baked_curve(player: AnimationPlayer, tmp_path: Path):
+    write_and_bake(tmp_path, template_content(), 1_000_000_000)
+    player.refresh(force=True)
+
+    asyncio.run(player.add_preformed_animation("nod"))
+
+    assert queued_types() == ["baked_animation"]
+
+
+def test_param_mismatch_resolves_live(player: AnimationPlayer, tmp_path: Path):
+    write_and_bake(tmp_path, template_content(), 1_000_000_000)
+    player.refresh(force=True)
+
+    asyncio.run(player.add_preformed_animation("nod", params={"amplitude": 5.0}))
+
+    assert queued_types() == ["animation"]
+    assert action_scheduler.action_queue[0].data.target == 5.0
+
+
+def test_stale_bake_is_ignored(player: AnimationPlayer, tmp_path: Path):
+    path = write_and_bake(tmp_path, template_content(), 1_000_000_000)
+    # 烘焙后修改模板, 烘焙文件的 source_digest 不再匹配
+    path.write_bytes(template_content(target=20.0))
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    player.refresh(force=True)
+
+    assert baked_animation_store.get("nod") is None
+    asyncio.run(player.add_preformed_animation("nod"))
+
+    assert queued_types() == ["animation"]
+    assert action_scheduler.action_queue[0].data.target == 20.0
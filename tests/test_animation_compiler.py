@@ -0,0 +1,106 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from nekro_live_studio.schemas.preformed_animation import AnimationTemplate
+from nekro_live_studio.services.animation_compiler import (
+    TemplateCompileError,
+    compile_template,
+)
+
+
+def make_template(
+    variables: Optional[Dict[str, Any]] = None,
+    params: Optional[List[Dict[str, Any]]] = None,
+    to: Any = 1.0,
+    duration: Any = 0.5,
+) -> AnimationTemplate:
+    return AnimationTemplate.model_validate(
+        {
+            "name": "test",
+            "type": "animation",
+            "data": {
+                "params": params or [],
+                "variables": variables or {},
+                "actions": [{"parameter": "FaceAngleX", "to": to, "duration": duration}],
+            },
+        },
+    )
+
+
+def test_variables_are_evaluated_in_dependency_order():
+    template = make_template(
+        variables={"total": {"expr": "half * 2"}, "half": {"expr": "base / 2"}, "base": {"expr": "amplitude + 1"}},
+        params=[{"name": "amplitude", "default": 9}],
+        to={"expr": "total"},
+    )
+
+    compiled = compile_template(template)
+
+    assert [name for name, _ in compiled.variables] == ["base", "half", "total"]
+    assert compiled.resolve()[0].target == 10.0
+    assert compiled.resolve({"amplitude": 3})[0].target == 4.0
+
+
+def test_variable_cycle_is_rejected():
+    template = make_template(variables={"a": {"expr": "b + 1"}, "b": {"expr": "c"}, "c": {"expr": "a * 2"}})
+
+    with pytest.raises(TemplateCompileError, match="循环依赖: a -> b -> c -> a"):
+        compile_template(template)
+
+
+@pytest.mark.parametrize(
+    ("template", "message"),
+    [
+        (make_template(variables={"a": {"expr": "missing + 1"}}), "变量 'a' 引用了未定义的名称 'missing'"),
+        (make_template(to={"expr": "speed * 2"}), "第 1 个动作的 to 引用了未定义的名称: speed"),
+        (make_template(duration={"expr": "1 +"}), "表达式语法错误"),
+    ],
+)
+def test_invalid_expressions_are_rejected(template, message):
+    with pytest.raises(TemplateCompileError, match=message):
+        compile_template(template)
+
+
+def test_builtin_functions_are_not_undefined_names():
+    compiled = compile_template(make_template(to={"expr": "int(2.7)"}))
+
+    assert compiled.resolve()[0].target == 2.0
+
+
+@pytest.mark.parametrize(
+    ("template", "deterministic"),
+    [
+        (make_template(variables={"a": {"expr": "1 + 2"}}, to={"expr": "a"}), True),
+        (make_template(to={"random_float": [0.0, 1.0]}), False),
+        (make_template(variables={"a": {"random_int": [1, 3]}}), False),
+        (make_template(duration={"expr": "rand() + 0.5"}), False),
+        (make_template(to={"expr": "randint(3)"}), False),
+    ],
+)
+def test_deterministic_flag(template, deterministic):
+    assert compile_template(template).deterministic is deterministic
+
+
+def test_params_are_checked_against_their_declared_type():
+    compiled = compile_template(
+        make_template(
+            params=[{"name": "times", "type": "int", "default": 2}, {"name": "amplitude", "default": 1.0}],
+            to={"expr": "times * amplitude"},
+        ),
+    )
+
+    assert compiled.bind_params({"times": 3.0, "amplitude": "2.5"}) == {"times": 3, "amplitude": 2.5}
+    with pytest.raises(ValueError, match="应为整数"):
+        compiled.bind_params({"times": 1.5})
+    with pytest.raises(ValueError, match="应为数字"):
+        compiled.bind_params({"amplitude": "big"})
+    with pytest.raises(ValueError, match="应为数字"):
+        compiled.bind_params({"amplitude": True})
+
+
+def test_missing_required_param():
+    compiled = compile_template(make_template(params=[{"name": "amplitude"}], to={"expr": "amplitude"}))
+
+    with pytest.raises(ValueError, match="缺少必需的参数"):
+        compiled.resolve()
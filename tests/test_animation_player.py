@@ -0,0 +1,84 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from nekro_live_studio.services import animation_player as animation_player_module
+from nekro_live_studio.services.animation_player import AnimationPlayer
+
+
+def write_template(directory: Path, file_name: str, name: str, target: float, mtime_ns: int) -> Path:
+    path = directory / file_name
+    template = {
+        "name": name,
+        "type": "animation",
+        "data": {
+            "description": f"{file_name} 中的 {name}",
+            "params": [],
+            "actions": [{"parameter": "FaceAngleX", "to": target, "duration": 0.5}],
+        },
+    }
+    path.write_text(json.dumps(template), encoding="utf-8")
+    # 显式设置 mtime, 避免同一时钟刻度内的两次写入被视为未修改
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+@pytest.fixture
+def player(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[AnimationPlayer]:
+    monkeypatch.setattr(animation_player_module, "ANIMATIONS_DIR", tmp_path)
+    player = AnimationPlayer()
+    player.load_animations()
+    yield player
+    monkeypatch.undo()
+    player.load_animations()
+
+
+def descriptions(player: AnimationPlayer):
+    return {info.name: info.description for info in player.list_preformed_animations()}
+
+
+def test_incremental_refresh_picks_up_new_and_deleted_files(player: AnimationPlayer, tmp_path: Path):
+    first = write_template(tmp_path, "a.jsonc", "nod", 1.0, 1_000_000_000)
+    player.refresh(force=True)
+    assert descriptions(player) == {"nod": "a.jsonc 中的 nod"}
+
+    first.unlink()
+    player.refresh(force=True)
+    assert descriptions(player) == {}
+
+
+def test_duplicate_name_falls_back_to_remaining_definer(player: AnimationPlayer, tmp_path: Path):
+    write_template(tmp_path, "a.jsonc", "nod", 1.0, 1_000_000_000)
+    second = write_template(tmp_path, "b.jsonc", "nod", 2.0, 1_000_000_000)
+    player.refresh(force=True)
+    assert descriptions(player) == {"nod": "b.jsonc 中的 nod"}
+
+    # 生效的定义者改名后, 同名模板回退到另一个文件
+    write_template(tmp_path, "b.jsonc", "shake", 2.0, 2_000_000_000)
+    player.refresh(force=True)
+    assert descriptions(player) == {"nod": "a.jsonc 中的 nod", "shake": "b.jsonc 中的 shake"}
+
+    write_template(tmp_path, "b.jsonc", "nod", 2.0, 3_000_000_000)
+    player.refresh(force=True)
+    second.unlink()
+    player.refresh(force=True)
+    assert descriptions(player) == {"nod": "a.jsonc 中的 nod"}
+
+
+def test_resolution_cache_returns_independent_copies(player: AnimationPlayer, tmp_path: Path):
+    write_template(tmp_path, "a.jsonc", "nod", 1.0, 1_000_000_000)
+    player.refresh(force=True)
+    compiled = player._compiled["nod"]
+    before = player.get_resolution_cache_stats()
+
+    first = player._resolve(compiled, None, 0.0)
+    first[0].data.delay = 5.0
+    second = player._resolve(compiled, None, 0.0)
+
+    assert second[0].data.delay == 0.0
+    assert second[0] is not first[0]
+    after = player.get_resolution_cache_stats()
+    assert (after.hits - before.hits, after.misses - before.misses) == (1, 1)
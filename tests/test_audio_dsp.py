@@ -0,0 +1,69 @@
+import wave
+
+import numpy as np
+import pytest
+
+from nekro_live_studio.services.audio_dsp import match_channels, resample, time_stretch
+from nekro_live_studio.services.audio_player import AudioPlayer
+
+SAMPLE_RATE = 16000
+
+
+def tone(frequency: float, seconds: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    t = np.arange(round(seconds * sample_rate)) / sample_rate
+    return (0.5 * np.sin(2 * np.pi * frequency * t))[:, None].astype(np.float32)
+
+
+def dominant_frequency(samples: np.ndarray, sample_rate: int) -> float:
+    spectrum = np.abs(np.fft.rfft(samples[:, 0] * np.hanning(len(samples))))
+    return float(np.argmax(spectrum)) * sample_rate / len(samples)
+
+
+@pytest.mark.parametrize("speed", [0.5, 1.5, 2.0])
+def test_time_stretch_keeps_pitch(speed):
+    samples = tone(440, 1.0)
+
+    stretched = time_stretch(samples, speed, SAMPLE_RATE)
+
+    assert len(stretched) == round(len(samples) / speed)
+    assert stretched.dtype == samples.dtype
+    assert dominant_frequency(stretched, SAMPLE_RATE) == pytest.approx(440, abs=10)
+    # 叠加后幅度不应明显变化
+    middle = stretched[len(stretched) // 4 : -len(stretched) // 4]
+    assert np.abs(middle).max() == pytest.approx(0.5, abs=0.05)
+
+
+def test_time_stretch_identity():
+    samples = tone(440, 0.1)
+    assert time_stretch(samples, 1.0, SAMPLE_RATE) is samples
+
+
+@pytest.mark.parametrize("target_rate", [8000, 44100])
+def test_resample_keeps_frequency(target_rate):
+    samples = tone(1000, 0.5)
+
+    resampled = resample(samples, SAMPLE_RATE, target_rate)
+
+    assert len(resampled) == round(len(samples) * target_rate / SAMPLE_RATE)
+    assert dominant_frequency(resampled, target_rate) == pytest.approx(1000, abs=5)
+    assert np.abs(resampled).max() == pytest.approx(0.5, abs=0.02)
+
+
+def test_match_channels():
+    stereo = np.array([[0.2, 0.4], [0.6, 0.8]])
+    np.testing.assert_allclose(match_channels(stereo, 1), [[0.3], [0.7]])
+    assert match_channels(stereo[:, :1], 2).tolist() == [[0.2, 0.2], [0.6, 0.6]]
+
+
+def test_8bit_wav_decodes_without_dc_offset(tmp_path):
+    path = tmp_path / "silence8.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(bytes([128]) * 1600)
+
+    samples = AudioPlayer._decode_samples(path, 1.0, SAMPLE_RATE)
+
+    assert samples.shape == (1600, 1)
+    assert np.abs(samples).max() < 0.01
@@ -0,0 +1,74 @@
+import struct
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nekro_live_studio.services.audio_index import AudioIndex, read_audio_metadata
+from nekro_live_studio.services.audio_manager import AudioManager
+
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int = 8000, width: int = 2):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(width)
+        wav.setframerate(sample_rate)
+        if width == 1:
+            wav.writeframes((samples * 127 + 128).astype(np.uint8).tobytes())
+        else:
+            wav.writeframes((samples * 32767).astype("<i2").tobytes())
+
+
+def test_reads_duration_and_loudness(tmp_path):
+    path = tmp_path / "tone.wav"
+    write_wav(path, np.full(4000, 0.5))
+
+    metadata = read_audio_metadata(path)
+
+    assert metadata.duration == pytest.approx(0.5)
+    assert (metadata.sample_rate, metadata.channels, metadata.bits_per_sample) == (8000, 1, 16)
+    assert metadata.loudness == pytest.approx(20 * np.log10(0.5), abs=0.01)
+
+
+def test_unsigned_8bit_is_centered(tmp_path):
+    path = tmp_path / "silence.wav"
+    write_wav(path, np.zeros(800), width=1)
+
+    assert read_audio_metadata(path).loudness is None
+
+
+def test_skips_unknown_chunks_and_bad_data_size(tmp_path):
+    fmt = struct.pack("<HHIIHH", 1, 1, 8000, 16000, 2, 16)
+    data = b"\x00\x10" * 800
+    body = b"WAVE" + b"LIST" + struct.pack("<I", 3) + b"abc\x00" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    # data 块大小写为 0 时按文件剩余长度计
+    body += b"data" + struct.pack("<I", 0) + data
+    path = tmp_path / "odd.wav"
+    path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+    assert read_audio_metadata(path).duration == pytest.approx(0.1)
+
+
+def test_rejects_non_wave(tmp_path):
+    path = tmp_path / "fake.wav"
+    path.write_bytes(b"ID3" + b"\x00" * 32)
+    with pytest.raises(ValueError):
+        read_audio_metadata(path)
+
+
+def test_unparseable_file_keeps_its_description(tmp_path):
+    audio_dir = tmp_path / "audios"
+    audio_dir.mkdir()
+    write_wav(audio_dir / "ok.wav", np.zeros(800))
+    (audio_dir / "broken.wav").write_bytes(b"not a wave file")
+    descriptions = tmp_path / "descriptions.yaml"
+    descriptions.write_text("descriptions:\n  broken.wav: 坏掉的音效\n  ok.wav: 正常音效\n", encoding="utf-8")
+
+    manager = AudioManager(audio_dir, descriptions)
+    manager.index = AudioIndex(audio_dir, path=tmp_path / "index.json")
+    sounds = {sound["name"]: sound for sound in manager.get_sounds_with_descriptions()}
+
+    assert sounds["broken.wav"] == {"name": "broken.wav", "description": "坏掉的音效", "duration": None}
+    assert sounds["ok.wav"]["duration"] == pytest.approx(0.1)
+    assert "坏掉的音效" in descriptions.read_text(encoding="utf-8")
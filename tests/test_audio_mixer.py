@@ -0,0 +1,84 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from nekro_live_studio.services.audio_mixer import AudioMixer
+
+SAMPLE_RATE = 8000
+BLOCK_SIZE = 80
+
+
+def make_mixer() -> AudioMixer:
+    return AudioMixer(sample_rate=SAMPLE_RATE, channels=2, block_size=BLOCK_SIZE)
+
+
+def test_render_mixes_buses_and_clips():
+    async def run():
+        mixer = make_mixer()
+        mixer.set_bus_gain("music", 0.5)
+        mixer.play(np.full((100, 1), 0.7), bus="effects")
+        mixer.play(np.full((50, 2), 0.4), bus="music")
+        mixer.play(np.full((100, 1), 0.8), bus="speech", gain=0.25)
+
+        block = mixer.render(BLOCK_SIZE)
+        assert block.shape == (BLOCK_SIZE, 2)
+        np.testing.assert_allclose(block[0], [1.0, 1.0])
+        np.testing.assert_allclose(block[60], [0.9, 0.9])
+        assert mixer.active_voices() == 2
+
+        mixer.render(BLOCK_SIZE)
+        assert mixer.active_voices() == 0
+
+    asyncio.run(run())
+
+
+def test_null_backend_plays_to_completion():
+    async def run():
+        mixer = make_mixer()
+        assert mixer.start("null")
+        try:
+            voice = mixer.play(np.full((SAMPLE_RATE // 10, 1), 0.1))
+            limited = mixer.play(np.full((SAMPLE_RATE, 1), 0.1), max_frames=SAMPLE_RATE // 20)
+            await asyncio.wait_for(voice.wait_started(), 1.0)
+            await asyncio.wait_for(asyncio.gather(voice.wait_finished(), limited.wait_finished()), 2.0)
+            assert voice.frames_played == SAMPLE_RATE // 10
+            assert limited.frames_played == SAMPLE_RATE // 20
+            assert not voice.get_busy()
+        finally:
+            mixer.stop()
+
+    asyncio.run(run())
+
+
+def test_stream_finishes_after_close():
+    async def run():
+        mixer = make_mixer()
+        assert mixer.start("null")
+        try:
+            stream = mixer.open_stream()
+            stream.write(np.full((BLOCK_SIZE * 2, 1), 0.1))
+            await asyncio.wait_for(stream.wait_started(), 1.0)
+            # 未关闭的流在数据耗尽后仍在等待写入
+            await asyncio.sleep(BLOCK_SIZE * 4 / SAMPLE_RATE)
+            assert stream.get_busy()
+            stream.write(np.full((BLOCK_SIZE, 1), 0.1))
+            stream.close()
+            await asyncio.wait_for(stream.wait_finished(), 1.0)
+            assert stream.frames_played == BLOCK_SIZE * 3
+        finally:
+            mixer.stop()
+
+    asyncio.run(run())
+
+
+def test_stop_finishes_pending_voices():
+    async def run():
+        mixer = make_mixer()
+        assert mixer.start("null")
+        stream = mixer.open_stream()
+        mixer.stop()
+        await asyncio.wait_for(stream.wait_finished(), 1.0)
+        assert not mixer.running
+
+    asyncio.run(run())
@@ -0,0 +1,13 @@
+import asyncio
+
+from nekro_live_studio.services.audio_player import audio_player
+
+
+def test_preload_skips_when_cache_is_disabled(monkeypatch):
+    monkeypatch.setattr(audio_player._sound_cache, "max_weight", 0)
+
+    def fail(_name):
+        raise AssertionError("缓存上限为 0 时不应解析音效文件")
+
+    monkeypatch.setattr(audio_player, "_resolve_path", fail)
+    assert asyncio.run(audio_player.preload(["a.wav"], budget_bytes=1024)) == 0
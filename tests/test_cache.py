@@ -0,0 +1,49 @@
+from nekro_live_studio.utils.cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert list(cache) == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_weight_limit():
+    cache: LRUCache[str, bytes] = LRUCache(max_weight=10, weigher=len)
+    assert cache.put("a", b"12345")
+    assert cache.put("b", b"123456")
+    assert "a" not in cache
+    assert cache.weight == 6
+    # 单个值超过上限时不缓存, 也不淘汰已有条目
+    assert not cache.put("c", b"x" * 11)
+    assert "b" in cache
+    cache.put("b", b"1")
+    assert cache.weight == 1
+
+
+def test_peek_and_stats():
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.peek("a") == 1
+    cache.put("c", 3)
+    assert "a" not in cache
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 2)
+    assert stats.hit_rate == 0.5
+
+
+def test_iteration_allows_removal():
+    cache: LRUCache[int, int] = LRUCache()
+    for i in range(4):
+        cache.put(i, i)
+    for key in cache:
+        if key % 2:
+            cache.pop(key)
+    assert list(cache.keys()) == [0, 2]
@@ -0,0 +1,56 @@
+import pytest
+
+from nekro_live_studio.utils.easing import (
+    Easing,
+    EasingTable,
+    parse_easing,
+    resolve_easing,
+)
+
+
+def test_named_easing():
+    assert parse_easing("linear") is Easing.linear
+    with pytest.raises(ValueError, match="未找到"):
+        parse_easing("_private")
+
+
+def test_cubic_bezier_matches_endpoints_and_is_shared():
+    ease = parse_easing("cubic-bezier(0.25, 0.1, 0.25, 1)")
+    assert isinstance(ease, EasingTable)
+    assert ease(0.0) == 0.0
+    assert ease(1.0) == 1.0
+    assert 0.0 < ease(0.5) < 1.0
+    assert parse_easing("cubic-bezier(0.25,0.1,0.25,1)") is ease
+
+
+def test_linear_cubic_bezier_is_identity():
+    ease = parse_easing("cubic-bezier(0, 0, 1, 1)")
+    for t in (0.1, 0.33, 0.5, 0.9):
+        assert ease(t) == pytest.approx(t, abs=1e-3)
+
+
+def test_steps():
+    end = parse_easing("steps(4)")
+    assert end(0.1) == 0.0
+    assert end(0.3) == 0.25
+    start = parse_easing("steps(4, start)")
+    assert start(0.1) == 0.25
+    assert start(0.25) == 0.25
+
+
+def test_spring_settles_at_one():
+    ease = parse_easing("spring(100, 10)")
+    assert ease(0.0) == pytest.approx(0.0)
+    assert ease(1.0) == 1.0
+    # 欠阻尼弹簧会越过终点
+    assert max(ease(i / 100) for i in range(101)) > 1.0
+
+
+@pytest.mark.parametrize(
+    "spec",
+    ["cubic-bezier(1,2,3)", "cubic-bezier(a,0,1,1)", "cubic-bezier(2,0,1,1)", "steps(0)", "steps(2, middle)", "spring(0, 1)"],
+)
+def test_invalid_parametric_easing(spec):
+    with pytest.raises(ValueError):
+        parse_easing(spec)
+    assert resolve_easing(spec) is Easing.linear
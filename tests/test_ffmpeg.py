@@ -0,0 +1,39 @@
+import asyncio
+import sys
+from typing import AsyncIterator
+
+from nekro_live_studio.services import ffmpeg
+from nekro_live_studio.services.viseme import VisemeTimeline
+
+
+async def failing_source() -> AsyncIterator[bytes]:
+    raise OSError("断流")
+    yield b""
+
+
+def test_source_failing_before_first_chunk_still_finishes(monkeypatch):
+    # 用读取标准输入直到 EOF 的进程代替 ffplay
+    monkeypatch.setattr(ffmpeg, "_ffplay_args", lambda _volume: [sys.executable, "-c", "import sys; sys.stdin.read()"])
+
+    async def run():
+        finished = asyncio.Event()
+        loudness_queue: asyncio.Queue = asyncio.Queue()
+        timeline = VisemeTimeline()
+        played = await asyncio.wait_for(
+            ffmpeg.play_audio_stream_with_ffplay(
+                failing_source(),
+                finished_event=finished,
+                loudness_queue=loudness_queue,
+                viseme_timeline=timeline,
+            ),
+            timeout=5.0,
+        )
+        return played, finished.is_set(), loudness_queue.get_nowait(), timeline
+
+    played, finished, sentinel, timeline = asyncio.run(run())
+
+    assert played is False
+    assert finished
+    assert sentinel is None
+    assert timeline.analysis_done
+    assert timeline.closed
@@ -0,0 +1,31 @@
+from nekro_live_studio.controllers.config import ControllersConfig
+from nekro_live_studio.controllers.controllers import idle_loop_controller
+from nekro_live_studio.services.idle_loop import (
+    idle_loop_path,
+    load_idle_loop,
+    render_idle_loop,
+)
+
+
+def test_corrupt_cache_is_rerendered():
+    config = ControllersConfig()
+    path = idle_loop_path("corrupt")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"PK\x03\x04 truncated")
+
+    idle_loop = idle_loop_controller._load_or_render("corrupt", config)
+
+    assert idle_loop.frame_count > 0
+    reloaded = load_idle_loop(path)
+    assert reloaded is not None
+    assert reloaded.config_digest == idle_loop.config_digest
+
+
+def test_rendered_loop_has_no_mouth_open_channel():
+    config = ControllersConfig()
+    config.mouth_expression.ENABLED = True
+
+    idle_loop = render_idle_loop(config)
+
+    assert config.mouth_expression.SMILE_PARAMETER in idle_loop.parameters
+    assert config.mouth_expression.OPEN_PARAMETER not in idle_loop.parameters
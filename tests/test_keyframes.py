@@ -0,0 +1,27 @@
+import pytest
+from pydantic import ValidationError
+
+from nekro_live_studio.schemas.actions import AnimationKeyframesData, KeyframeData
+from nekro_live_studio.services.tweener import Keyframe, sample_keyframes
+
+
+def linear(t: float) -> float:
+    return t
+
+
+def test_keyframes_must_be_in_time_order():
+    with pytest.raises(ValidationError):
+        AnimationKeyframesData(
+            parameter="FaceAngleX",
+            keyframes=[KeyframeData(time=0.5, value=1.0), KeyframeData(time=0.2, value=0.0)],
+        )
+
+
+def test_sample_keyframes_interpolates_between_neighbours():
+    keyframes = [Keyframe(0.5, 1.0, linear), Keyframe(1.0, -1.0, linear)]
+    times = [keyframe.time for keyframe in keyframes]
+
+    # 第一个关键帧之前由起始值过渡
+    assert sample_keyframes(keyframes, times, start=0.0, t=0.25) == pytest.approx(0.5)
+    assert sample_keyframes(keyframes, times, start=0.0, t=0.75) == pytest.approx(0.0)
+    assert sample_keyframes(keyframes, times, start=0.0, t=2.0) == -1.0
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nekro_live_studio.cli import lint_animations
+from nekro_live_studio.services import parameter_index as parameter_index_module
+from nekro_live_studio.services.parameter_index import ParameterIndex
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def write_template(directory: Path, name: str, parameter: str = "FaceAngleX", to: Any = 10.0) -> Path:
+    path = directory / f"{name}.jsonc"
+    template = {
+        "name": name,
+        "type": "animation",
+        "data": {"actions": [{"parameter": parameter, "to": to, "duration": 0.5, "easing": "in_out_sine"}]},
+    }
+    path.write_text(json.dumps(template), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def animations_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    cache = tmp_path / "vts_parameters.json"
+    cache.write_text(
+        json.dumps({"source": "vts", "parameters": {"FaceAngleX": {"name": "FaceAngleX", "min": -30, "max": 30}}}),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(lint_animations, "parameter_index", ParameterIndex(cache))
+    directory = tmp_path / "animations"
+    directory.mkdir()
+    monkeypatch.setattr(lint_animations, "ANIMATIONS_DIR", directory)
+    # main 会移除日志输出, 测试中保留
+    monkeypatch.setattr(lint_animations.logger, "remove", lambda: None)
+    return directory
+
+
+def run_main(monkeypatch: pytest.MonkeyPatch, *args: str) -> int:
+    monkeypatch.setattr("sys.argv", ["lint_animations", *args])
+    return lint_animations.main()
+
+
+def test_valid_template(animations_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    report = lint_animations.lint_file(write_template(animations_dir, "nod"), samples=1)
+
+    assert (report.errors, report.warnings) == ([], [])
+    assert report.duration == 0.5
+    assert run_main(monkeypatch, "--strict") == 0
+
+
+def test_unknown_parameter_is_an_error(animations_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    report = lint_animations.lint_file(write_template(animations_dir, "nod", parameter="FaceAngleQ"), samples=1)
+
+    assert report.errors == ["第 1 个动作的参数 'FaceAngleQ' 不在 VTS 参数索引中"]
+    assert run_main(monkeypatch) == 1
+
+
+def test_out_of_range_value_is_a_warning(animations_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    report = lint_animations.lint_file(write_template(animations_dir, "nod", to=45.0), samples=1)
+
+    assert report.errors == []
+    assert report.warnings == ["参数 'FaceAngleX' 的取值 45 超出范围 [-30, 30]"]
+    assert run_main(monkeypatch) == 0
+    assert run_main(monkeypatch, "--strict") == 1
+
+
+def test_duplicate_names_are_errors(animations_dir: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    write_template(animations_dir, "nod")
+    (animations_dir / "nod.jsonc").rename(animations_dir / "a.jsonc")
+    write_template(animations_dir, "nod")
+
+    assert run_main(monkeypatch) == 1
+    assert "名称 'nod' 与 a.jsonc 重复" in capsys.readouterr().out
+
+
+def test_parameter_index_falls_back_to_default_list(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(parameter_index_module, "DEFAULT_PARAMETERS_PATH", REPO_ROOT / "vts默认参数.txt")
+
+    index = ParameterIndex(tmp_path / "missing.json")
+
+    assert index.source == "default"
+    face_angle = index.get("FaceAngleX")
+    assert face_angle is not None
+    assert (face_angle.min, face_angle.max) == (-30.0, 30.0)
+    assert not (tmp_path / "missing.json").exists()
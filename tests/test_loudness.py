@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from nekro_live_studio.services.loudness import SILENCE_FLOOR, LoudnessEnvelope
+
+SAMPLE_RATE = 48000
+HOP = 0.015
+
+
+def sine(frequency: float, seconds: float, amplitude: float = 1.0, channels: int = 1) -> np.ndarray:
+    t = np.arange(round(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    samples = amplitude * np.sin(2 * np.pi * frequency * t)
+    return np.repeat(samples[:, None], channels, axis=1)
+
+
+def test_k_weighted_reference_tone():
+    # BS.1770: 单声道 0 dBFS、997 Hz 正弦的响度为 -3.01 LUFS
+    levels = LoudnessEnvelope(SAMPLE_RATE, HOP).feed(sine(997, 0.3))
+    assert len(levels) == 20
+    assert np.median(levels) == pytest.approx(-3.01, abs=0.1)
+
+
+def test_k_weighting_sums_channels():
+    mono = LoudnessEnvelope(SAMPLE_RATE, HOP).feed(sine(997, 0.3))
+    stereo = LoudnessEnvelope(SAMPLE_RATE, HOP).feed(sine(997, 0.3, channels=2))
+    assert np.median(stereo) - np.median(mono) == pytest.approx(3.01, abs=0.05)
+
+
+def test_rms_level():
+    levels = LoudnessEnvelope(SAMPLE_RATE, HOP, weighting="rms").feed(sine(1000, 0.3, amplitude=0.5, channels=2))
+    assert np.median(levels) == pytest.approx(20 * np.log10(0.5 / np.sqrt(2)), abs=0.05)
+
+
+def test_silence_is_floored():
+    assert LoudnessEnvelope(SAMPLE_RATE, HOP).feed(np.zeros((SAMPLE_RATE // 10, 1))) == [SILENCE_FLOOR] * 6
+
+
+def test_feed_in_pieces_matches_single_feed():
+    samples = sine(440, 0.2) * np.linspace(0, 1, round(0.2 * SAMPLE_RATE))[:, None]
+    whole = LoudnessEnvelope(SAMPLE_RATE, HOP).feed(samples)
+
+    envelope = LoudnessEnvelope(SAMPLE_RATE, HOP)
+    pieces = []
+    for start in range(0, len(samples), 1000):
+        pieces.extend(envelope.feed(samples[start : start + 1000]))
+
+    assert pieces == pytest.approx(whole)
+    assert len(whole) == len(samples) // envelope.hop_frames
+
+
+def test_brightness_follows_spectral_centroid():
+    envelope = LoudnessEnvelope(SAMPLE_RATE, HOP)
+    _, dark = envelope.feed_with_brightness(sine(200, 0.06))
+    _, bright = envelope.feed_with_brightness(sine(2500, 0.06))
+    assert max(dark) < 0.1
+    assert min(bright) > 0.8
+    assert max(bright) <= 1.0
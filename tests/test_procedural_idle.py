@@ -0,0 +1,58 @@
+import numpy as np
+
+from nekro_live_studio.controllers.config import (
+    NoiseChannelConfig,
+    ProceduralIdleConfig,
+)
+from nekro_live_studio.services.procedural_idle import ProceduralIdleGenerator
+
+TIMES = np.arange(0.0, 60.0, 1 / 30)
+
+
+def sample(generator: ProceduralIdleGenerator):
+    return [generator.evaluate(float(t)) for t in TIMES]
+
+
+def test_fixed_seed_is_deterministic():
+    config = ProceduralIdleConfig()
+
+    first = sample(ProceduralIdleGenerator(config, seed=42))
+
+    assert sample(ProceduralIdleGenerator(config, seed=42)) == first
+    assert sample(ProceduralIdleGenerator(config, seed=43)) != first
+
+
+def test_values_stay_within_configured_ranges():
+    config = ProceduralIdleConfig(
+        CHANNELS=[
+            NoiseChannelConfig(PARAMETER="FaceAngleX", CENTER=2.5, NOISE_AMPLITUDE=12.5, NOISE_OCTAVES=4),
+            NoiseChannelConfig(PARAMETER="FaceAngleY", NOISE_AMPLITUDE=-2.0, WAVE_AMPLITUDE=3.0, WAVE_PERIOD=1.7),
+            NoiseChannelConfig(PARAMETER="MouthSmile", CENTER=0.4, NOISE_AMPLITUDE=0.8, MIN=0.0, MAX=1.0),
+        ],
+    )
+    bounds = {
+        channel.PARAMETER: (
+            channel.CENTER - abs(channel.NOISE_AMPLITUDE) - abs(channel.WAVE_AMPLITUDE),
+            channel.CENTER + abs(channel.NOISE_AMPLITUDE) + abs(channel.WAVE_AMPLITUDE),
+        )
+        for channel in config.CHANNELS
+    }
+    bounds["MouthSmile"] = (0.0, 1.0)
+    blink = config.BLINK
+
+    frames = sample(ProceduralIdleGenerator(config, seed=7))
+
+    for frame in frames:
+        for name, (low, high) in bounds.items():
+            assert low <= frame[name] <= high
+        assert blink.MIN_VALUE <= frame[blink.LEFT_PARAMETER] <= blink.MAX_VALUE
+        assert frame[blink.LEFT_PARAMETER] == frame[blink.RIGHT_PARAMETER]
+    assert min(frame["MouthSmile"] for frame in frames) == 0.0
+    assert min(frame[blink.LEFT_PARAMETER] for frame in frames) == blink.MIN_VALUE
+
+
+def test_default_channels_do_not_emit_mouth_open():
+    frames = sample(ProceduralIdleGenerator(ProceduralIdleConfig(), seed=1))
+
+    assert all("MouthOpen" not in frame for frame in frames)
+    assert all("MouthSmile" in frame for frame in frames)
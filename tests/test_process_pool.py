@@ -0,0 +1,130 @@
+import asyncio
+import sys
+
+from nekro_live_studio.services.process_pool import ProcessPool
+
+# 读取标准输入直到 EOF 后退出, 与 ffplay/ffmpeg 读取管道输入的行为一致
+WAIT_STDIN = (sys.executable, "-c", "import sys; sys.stdin.read()")
+OTHER = (sys.executable, "-c", "import sys; sys.stdin.read(); print('other')")
+
+
+async def settle(pool: ProcessPool):
+    while pool._background:
+        await asyncio.gather(*pool._background)
+
+
+async def finish(process: asyncio.subprocess.Process):
+    await process.communicate(b"")
+
+
+def test_acquire_returns_spare_for_matching_args_and_replenishes():
+    async def scenario():
+        pool = ProcessPool(size=1, max_idle=60.0, check_interval=60.0)
+        pool.start([WAIT_STDIN])
+        await settle(pool)
+        spare = pool._spares[WAIT_STDIN][0].process
+
+        process = await pool.acquire(WAIT_STDIN)
+        await settle(pool)
+        stats = pool.stats()
+        replacement = pool._spares[WAIT_STDIN][0].process
+        await finish(process)
+        await pool.stop()
+        return spare, process, replacement, stats
+
+    spare, process, replacement, stats = asyncio.run(scenario())
+
+    assert process is spare
+    assert replacement is not spare
+    assert (stats.warm_hits, stats.cold_spawns, stats.spares) == (1, 0, 1)
+
+
+def test_acquire_spawns_new_process_on_mismatch():
+    async def scenario():
+        pool = ProcessPool(size=1, max_idle=60.0, check_interval=60.0)
+        pool.start([WAIT_STDIN])
+        await settle(pool)
+        spare = pool._spares[WAIT_STDIN][0].process
+
+        process = await pool.acquire(OTHER)
+        stdout, _ = await process.communicate(b"")
+        await settle(pool)
+        stats = pool.stats()
+        await pool.stop()
+        return spare, process, stdout, stats
+
+    spare, process, stdout, stats = asyncio.run(scenario())
+
+    assert process is not spare
+    assert stdout.strip() == b"other"
+    assert (stats.warm_hits, stats.cold_spawns, stats.spares) == (0, 1, 2)
+
+
+def test_dead_spare_is_skipped():
+    async def scenario():
+        pool = ProcessPool(size=1, max_idle=60.0, check_interval=60.0)
+        pool.start([WAIT_STDIN])
+        await settle(pool)
+        dead = pool._spares[WAIT_STDIN][0].process
+        await finish(dead)
+
+        process = await pool.acquire(WAIT_STDIN)
+        stats = pool.stats()
+        await finish(process)
+        await pool.stop()
+        return dead, process, stats
+
+    dead, process, stats = asyncio.run(scenario())
+
+    assert process is not dead
+    assert (stats.warm_hits, stats.cold_spawns, stats.died) == (0, 1, 1)
+
+
+def test_stop_kills_idle_spares():
+    async def scenario():
+        pool = ProcessPool(size=2, max_idle=60.0, check_interval=60.0)
+        pool.start([WAIT_STDIN])
+        await settle(pool)
+        spares = [spare.process for spare in pool._spares[WAIT_STDIN]]
+        await pool.stop()
+        return spares, pool.stats()
+
+    spares, stats = asyncio.run(scenario())
+
+    assert len(spares) == 2
+    assert all(process.returncode is not None for process in spares)
+    assert stats.spares == 0
+
+
+def test_disabled_pool_spawns_on_demand():
+    async def scenario():
+        pool = ProcessPool(size=0, max_idle=60.0, check_interval=60.0)
+        pool.start([WAIT_STDIN])
+        process = await pool.acquire(WAIT_STDIN)
+        await finish(process)
+        return pool.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert (stats.warm_hits, stats.cold_spawns, stats.spares) == (0, 1, 0)
+
+
+def test_check_recycles_spares_idle_too_long():
+    async def scenario():
+        pool = ProcessPool(size=1, max_idle=0.0, check_interval=60.0)
+        pool.start([WAIT_STDIN])
+        await settle(pool)
+        old = pool._spares[WAIT_STDIN][0].process
+
+        await pool._check()
+        await settle(pool)
+        new = pool._spares[WAIT_STDIN][0].process
+        stats = pool.stats()
+        await pool.stop()
+        return old, new, stats
+
+    old, new, stats = asyncio.run(scenario())
+
+    assert old.returncode is not None
+    assert new is not old
+    assert (stats.recycled, stats.spares) == (1, 1)
@@ -0,0 +1,72 @@
+import numpy as np
+
+from nekro_live_studio.controllers.config import SpringConfig
+from nekro_live_studio.services.spring_physics import SpringSystem
+
+
+def simulate(system: SpringSystem, source: float, dt: float, steps: int) -> np.ndarray:
+    return np.array([system.step(np.array([source]), dt)[0] for _ in range(steps)])
+
+
+def test_first_frame_snaps_to_target():
+    system = SpringSystem([SpringConfig(SOURCE="a", TARGET="b", GAIN=0.5, OFFSET=1.0)])
+
+    assert system.step(np.array([4.0]), 1 / 60)[0] == 3.0
+
+
+def test_large_dt_stays_stable():
+    system = SpringSystem([SpringConfig(SOURCE="a", TARGET="b", FREQUENCY=10.0, DAMPING_RATIO=0.1)])
+    system.step(np.array([0.0]), 1 / 60)
+
+    trajectory = simulate(system, 10.0, dt=1.0, steps=200)
+
+    assert np.all(np.isfinite(trajectory))
+    error = np.abs(trajectory - 10.0)
+    assert np.all(error <= 10.0)
+    assert np.all(np.diff(error[:5]) < 0)
+    assert abs(trajectory[-1] - 10.0) < 1e-6
+
+
+def test_critical_damping_converges_without_overshoot():
+    system = SpringSystem([SpringConfig(SOURCE="a", TARGET="b", FREQUENCY=2.0, DAMPING_RATIO=1.0)])
+    system.step(np.array([0.0]), 1 / 60)
+
+    trajectory = simulate(system, 10.0, dt=1 / 60, steps=240)
+
+    assert np.all(trajectory <= 10.0 + 1e-9)
+    assert np.all(np.diff(trajectory) >= -1e-9)
+    assert abs(trajectory[-1] - 10.0) < 1e-3
+
+
+def test_underdamped_overshoots():
+    system = SpringSystem([SpringConfig(SOURCE="a", TARGET="b", FREQUENCY=2.0, DAMPING_RATIO=0.2)])
+    system.step(np.array([0.0]), 1 / 60)
+
+    trajectory = simulate(system, 10.0, dt=1 / 60, steps=240)
+
+    assert trajectory.max() > 10.0
+
+
+def test_step_params_maps_sources_to_targets():
+    system = SpringSystem(
+        [
+            SpringConfig(SOURCE="FaceAngleX", TARGET="FacePositionX", GAIN=0.2),
+            SpringConfig(SOURCE="Missing", TARGET="EyeLeftX", OFFSET=0.5),
+        ],
+    )
+
+    assert system.step_params({"FaceAngleX": 10.0}, 1 / 60) == {"FacePositionX": 2.0, "EyeLeftX": 0.5}
+    assert SpringSystem().step_params({"FaceAngleX": 10.0}, 1 / 60) == {}
+
+
+def test_configure_keeps_state_of_unchanged_targets():
+    kept = SpringConfig(SOURCE="a", TARGET="b", DAMPING_RATIO=1.0)
+    system = SpringSystem([kept])
+    system.step(np.array([0.0]), 1 / 60)
+    moving = system.step(np.array([10.0]), 1 / 60)[0]
+
+    system.configure([kept, SpringConfig(SOURCE="c", TARGET="d")])
+    positions = system.step(np.array([10.0, 3.0]), 1 / 60)
+
+    assert moving < positions[0] < 10.0
+    assert positions[1] == 3.0
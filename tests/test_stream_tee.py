@@ -0,0 +1,104 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+
+from nekro_live_studio.utils.stream_tee import StreamTee, TeeConsumer
+
+CHUNKS = [bytes([i]) * 100 for i in range(20)]
+PAYLOAD = b"".join(CHUNKS)
+
+
+async def source(chunks: List[bytes], error: Exception | None = None) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+        await asyncio.sleep(0)
+    if error is not None:
+        raise error
+
+
+async def collect(consumer: TeeConsumer, delay: float = 0.0) -> bytes:
+    data = bytearray()
+    async for view in consumer:
+        data += view
+        await asyncio.sleep(delay)
+    return bytes(data)
+
+
+def test_every_consumer_receives_the_whole_stream():
+    async def run():
+        tee = StreamTee(source(CHUNKS), capacity=256)
+        consumers = [tee.add_consumer("a"), tee.add_consumer("b")]
+        tee.start()
+        results = await asyncio.gather(collect(consumers[0]), collect(consumers[1], delay=0.001))
+        stats = tee.stats()
+        await tee.aclose()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    assert results == [PAYLOAD, PAYLOAD]
+    assert stats.forwarded_bytes == len(PAYLOAD)
+    assert stats.peak_buffered_bytes <= 256
+    assert stats.buffered_bytes == {"a": 0, "b": 0}
+
+
+def test_lagging_drop_consumer_is_disconnected():
+    async def run():
+        tee = StreamTee(source(CHUNKS), capacity=256)
+        player = tee.add_consumer("player", "block")
+        analysis = tee.add_consumer("analysis", "drop")
+        tee.start()
+        # 分析端一直不读取, 积压达到容量后被断开, 播放端不受影响
+        played = await collect(player)
+        partial = await collect(analysis)
+        await tee.aclose()
+        return played, partial, tee.stats()
+
+    played, partial, stats = asyncio.run(run())
+    assert played == PAYLOAD
+    assert partial == b""
+    assert stats.dropped == ["analysis"]
+
+
+def test_closed_consumer_no_longer_blocks_the_producer():
+    async def run():
+        tee = StreamTee(source(CHUNKS), capacity=256)
+        reader = tee.add_consumer("reader")
+        idle = tee.add_consumer("idle")
+        tee.start()
+        await idle.aclose()
+        data = await asyncio.wait_for(collect(reader), 1.0)
+        await tee.aclose()
+        return data, idle.buffered_bytes
+
+    data, idle_backlog = asyncio.run(run())
+    assert data == PAYLOAD
+    assert idle_backlog == 0
+
+
+def test_source_error_is_raised_after_buffered_data():
+    async def run():
+        tee = StreamTee(source(CHUNKS[:2], error=OSError("断流")), capacity=1024)
+        consumer = tee.add_consumer("a")
+        tee.start()
+        data = bytearray()
+        with pytest.raises(OSError, match="断流"):
+            async for view in consumer:
+                data += view
+        await tee.aclose()
+        return bytes(data)
+
+    assert asyncio.run(run()) == b"".join(CHUNKS[:2])
+
+
+def test_consumers_must_be_added_before_start():
+    async def run():
+        tee = StreamTee(source([]), capacity=16)
+        tee.start()
+        with pytest.raises(RuntimeError):
+            tee.add_consumer("late")
+        await tee.aclose()
+
+    asyncio.run(run())
+    with pytest.raises(ValueError):
+        StreamTee(source([]), capacity=0)
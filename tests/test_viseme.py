@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from nekro_live_studio.controllers.controllers import mouth_sync
+from nekro_live_studio.services.loudness import SILENCE_FLOOR
+from nekro_live_studio.services.viseme import VisemeTimeline
+
+
+def make_timeline() -> VisemeTimeline:
+    timeline = VisemeTimeline()
+    timeline.extend(0.01, [-40.0, -20.0, -30.0], [0.0, 1.0, 0.5])
+    return timeline
+
+
+def test_sample_interpolates_between_hop_centers():
+    timeline = make_timeline()
+    assert timeline.duration == pytest.approx(0.03)
+    assert timeline.sample(0.005) == pytest.approx((-40.0, 0.0))
+    assert timeline.sample(0.01) == pytest.approx((-30.0, 0.5))
+    assert timeline.sample(0.02) == pytest.approx((-25.0, 0.75))
+
+
+def test_sample_edges():
+    timeline = make_timeline()
+    # 第一个步长中心之前保持第一个值, 最后一个中心之后尚未分析
+    assert timeline.sample(0.0) == pytest.approx((-40.0, 0.0))
+    assert timeline.sample(0.025) == pytest.approx((-30.0, 0.5))
+    assert timeline.sample(0.026) is None
+    assert timeline.sample(-0.1) == (SILENCE_FLOOR, 0.0)
+    assert VisemeTimeline().sample(0.0) is None
+
+
+def test_timeline_mode_keeps_the_configured_frame_rate(monkeypatch):
+    durations = []
+
+    class FakeTweener:
+        async def tween(self, param, end, duration, easing_func, priority):  # noqa: ARG002
+            durations.append(duration)
+            await asyncio.sleep(duration)
+
+    monkeypatch.setattr(mouth_sync, "tweener", FakeTweener())
+    controller = mouth_sync.mouth_sync_controller
+    monkeypatch.setattr(controller.config, "LOOKAHEAD_FPS", 60)
+    monkeypatch.setattr(controller.config, "FORM_PARAMETER", "")
+
+    async def run():
+        timeline = make_timeline()
+        timeline.finish_analysis()
+        timeline.set_clock(lambda: 0.0)
+        asyncio.get_running_loop().call_later(0.5, timeline.close)
+        await controller.execute_timeline(timeline)
+
+    asyncio.run(run())
+    # 缓动本身占用一帧, 若在缓动之后才排期下一帧, 实际只有约一半的帧率
+    frames = len(durations) - 1
+    assert frames >= 24
+    assert max(durations[:-1]) <= 1 / 60 + 1e-6
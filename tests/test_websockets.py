@@ -0,0 +1,110 @@
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from nekro_live_studio.api.websockets import handle_control_message
+from nekro_live_studio.configs.config import config
+from nekro_live_studio.services.action_scheduler import action_scheduler
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+
+    async def send_json(self, data: Dict[str, Any]):
+        self.sent.append(data)
+
+
+def animation(parameter: str = "FaceAngleX") -> Dict[str, Any]:
+    return {"type": "animation", "data": {"parameter": parameter, "target": 1.0, "duration": 0.5}}
+
+
+def send(message: Any) -> List[Dict[str, Any]]:
+    websocket = FakeWebSocket()
+    raw_data = message if isinstance(message, str) else json.dumps(message)
+    asyncio.run(handle_control_message(websocket, raw_data))  # type: ignore[arg-type]
+    return websocket.sent
+
+
+@pytest.fixture(autouse=True)
+def empty_queue() -> Iterator[None]:
+    action_scheduler.clear_queue()
+    yield
+    action_scheduler.clear_queue()
+
+
+def test_valid_action_is_queued():
+    replies = send(animation())
+
+    assert replies == [
+        {"status": "success", "message": "动画动作已添加", "data": {"estimated_completion_time": pytest.approx(0.5)}},
+    ]
+    assert len(action_scheduler.action_queue) == 1
+
+
+@pytest.mark.parametrize(
+    ("message", "tag"),
+    [({"type": "dance", "data": {}}, "dance"), ({"data": {}}, None)],
+)
+def test_unknown_type_is_reported(message, tag):
+    replies = send(message)
+
+    assert len(replies) == 1
+    assert replies[0]["status"] == "error"
+    assert replies[0]["message"] == f"未知的 action 类型: {tag}"
+    assert not action_scheduler.action_queue
+
+
+def test_invalid_data_and_malformed_json_are_ignored():
+    # 已知类型但数据不合法, 以及无法解析的 JSON, 只记录日志不回复也不入队
+    assert send({"type": "animation", "data": {"parameter": "FaceAngleX"}}) == []
+    assert send('{"type": "animation", ') == []
+    assert not action_scheduler.action_queue
+
+
+def test_full_queue_is_reported(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.SCHEDULER, "MAX_QUEUE_LENGTH", 1)
+    monkeypatch.setattr(config.SCHEDULER, "OVERFLOW_POLICY", "reject")
+    send(animation())
+
+    replies = send(animation("FaceAngleY"))
+
+    assert replies == [
+        {
+            "status": "error",
+            "message": "动作队列已满 (当前 1 个, 新增 1 个), 已拒绝新动作",
+            "data": {"queue_length": 1},
+        },
+    ]
+    assert len(action_scheduler.action_queue) == 1
+
+
+def test_batch_queues_all_actions():
+    actions = [animation("FaceAngleX"), animation("FaceAngleY"), {**animation("FaceAngleZ"), "id": "z"}]
+
+    replies = send({"type": "batch", "data": {"actions": actions}})
+
+    assert replies[0]["status"] == "success"
+    assert replies[0]["data"]["count"] == 3
+    assert [action.data.parameter for action in action_scheduler.action_queue] == ["FaceAngleX", "FaceAngleY", "FaceAngleZ"]
+
+
+def test_batch_is_rejected_as_a_whole(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.SCHEDULER, "MAX_QUEUE_LENGTH", 3)
+    monkeypatch.setattr(config.SCHEDULER, "OVERFLOW_POLICY", "reject")
+    send(animation())
+
+    replies = send({"type": "batch", "data": {"actions": [animation(f"Param{index}") for index in range(3)]}})
+
+    assert replies[0]["status"] == "error"
+    assert replies[0]["data"] == {"queue_length": 1}
+    assert [action.data.parameter for action in action_scheduler.action_queue] == ["FaceAngleX"]
+
+
+def test_batch_with_an_invalid_action_queues_nothing():
+    replies = send({"type": "batch", "data": {"actions": [animation(), {"type": "animation", "data": {}}]}})
+
+    assert replies == []
+    assert not action_scheduler.action_queue